@@ -1,20 +1,29 @@
 # authentication/admin.py
+import json
+
+from django.conf import settings
 from django.contrib import admin
+from django.core.files.storage import default_storage
 from django.utils.html import format_html
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Count
 from django.urls import path
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.shortcuts import render, redirect 
 from django.contrib import messages 
+from .caching import bump_group_version
+from .derivatives import build_derivative_url
 from .email_service import InquiryEmailService
+from .querysets import annotate_image_count, annotate_primary_image
 from .models import (
     Manufacturer,
     VehicleModel,
     PartCategory,
     PartsInquiry,
     ContactSubmission,
+    EmailJob,
     PartInventory,
     PartImage,
     PartImageGallery,
@@ -25,6 +34,31 @@ from .models import (
 )
 
 
+def update_and_invalidate(queryset, group, **changes):
+    """
+    QuerySet.update() for bulk admin actions: skips save() and signals, so
+    set updated_at (ETag validators, incremental exports) and bump the
+    API cache group by hand, once the update has committed
+    """
+    updated = queryset.update(updated_at=timezone.now(), **changes)
+    transaction.on_commit(lambda: bump_group_version(group))
+    return updated
+
+
+class VehicleModelListFilter(admin.RelatedFieldListFilter):
+    """
+    Related filter for a VehicleModel foreign key. VehicleModel.__str__
+    reads the manufacturer, so the default choices cost a query per model
+    """
+
+    def field_choices(self, field, request, model_admin):
+        ordering = self.field_admin_ordering(field, request, model_admin)
+        choices = VehicleModel.objects.select_related("manufacturer")
+        if ordering:
+            choices = choices.order_by(*ordering)
+        return [(vehicle_model.pk, str(vehicle_model)) for vehicle_model in choices]
+
+
 # ============================================================================
 # VEHICLE & PARTS REFERENCE MODELS ADMIN
 # ============================================================================
@@ -41,6 +75,7 @@ class ManufacturerAdmin(admin.ModelAdmin):
 @admin.register(VehicleModel)
 class VehicleModelAdmin(admin.ModelAdmin):
     list_display = ["name", "manufacturer", "code", "is_active", "created_at"]
+    list_select_related = ["manufacturer"]
     list_filter = ["manufacturer", "is_active"]
     search_fields = ["name", "code", "manufacturer__name"]
     ordering = ["manufacturer__name", "name"]
@@ -71,6 +106,7 @@ class PartsInquiryAdmin(admin.ModelAdmin):
         "created_at",
         "send_email_button",
     ]
+    list_select_related = ["manufacturer", "model__manufacturer"]
     
     list_filter = [
         "status",
@@ -385,6 +421,44 @@ class ContactSubmissionAdmin(admin.ModelAdmin):
     mark_as_resolved.short_description = "Mark selected as resolved"
 
 
+@admin.register(EmailJob)
+class EmailJobAdmin(admin.ModelAdmin):
+
+    list_display = ["kind", "subject", "status", "attempts", "next_attempt_at", "created_at", "sent_at"]
+    list_filter = ["status", "kind", "created_at"]
+    search_fields = ["subject", "last_error"]
+    readonly_fields = [
+        "id",
+        "kind",
+        "to",
+        "subject",
+        "html_body",
+        "text_body",
+        "reply_to",
+        "from_email",
+        "attempts",
+        "locked_at",
+        "last_error",
+        "created_at",
+        "updated_at",
+        "sent_at",
+    ]
+    ordering = ["-created_at"]
+
+    actions = ["retry_now"]
+
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=EmailJob.STATUS_SENT).update(
+            status=EmailJob.STATUS_PENDING,
+            attempts=0,
+            locked_at=None,
+            next_attempt_at=timezone.now(),
+        )
+        self.message_user(request, f"{updated} email jobs queued for retry.")
+
+    retry_now.short_description = "Retry selected emails now"
+
+
 # ============================================================================
 # INVENTORY MANAGEMENT ADMIN (For Selling Parts)
 # ============================================================================
@@ -423,6 +497,8 @@ class PartInventoryAdmin(admin.ModelAdmin):
         "is_published",
         "created_at",
     ]
+    # vehicle_display reads both names
+    list_select_related = ["manufacturer", "model"]
 
     list_filter = [
         "status",
@@ -583,17 +659,17 @@ class PartInventoryAdmin(admin.ModelAdmin):
 
     # Admin Actions
     def mark_as_available(self, request, queryset):
-        queryset.update(status="available")
+        update_and_invalidate(queryset, "parts", status="available")
 
     mark_as_available.short_description = "✅ Mark as Available"
 
     def mark_as_out_of_stock(self, request, queryset):
-        queryset.update(status="out_of_stock")
+        update_and_invalidate(queryset, "parts", status="out_of_stock")
 
     mark_as_out_of_stock.short_description = "❌ Mark as Out of Stock"
 
     def publish_items(self, request, queryset):
-        queryset.update(is_published=True)
+        update_and_invalidate(queryset, "parts", is_published=True)
 
     publish_items.short_description = "🌐 Publish Selected Items"
 
@@ -601,6 +677,7 @@ class PartInventoryAdmin(admin.ModelAdmin):
 @admin.register(PartImage)
 class PartImageAdmin(admin.ModelAdmin):
     list_display = ["image_preview", "part", "caption", "order", "created_at"]
+    list_select_related = ["part__manufacturer", "part__model"]
     list_filter = ["created_at"]
     search_fields = ["caption", "part__part_name"]
     readonly_fields = ["image_preview_large"]
@@ -745,6 +822,7 @@ class PartImageGalleryAdmin(admin.ModelAdmin):
         "uploaded_by",
         "created_at",
     ]
+    list_select_related = ["manufacturer", "model", "part_category", "uploaded_by"]
 
     list_filter = [
         "is_published",
@@ -897,16 +975,20 @@ class PartImageGalleryAdmin(admin.ModelAdmin):
 
 
 
+    def get_queryset(self, request):
+        # Primary image and image count as subqueries, not two queries per row
+        return annotate_image_count(annotate_primary_image(super().get_queryset(request)))
+
     def thumbnail_preview(self, obj):
         """Show thumbnail in list view"""
-        primary_image = obj.images.filter(is_primary=True).first()
-        if not primary_image:
-            primary_image = obj.images.first()
-
-        if primary_image and primary_image.image:
+        image_file = getattr(obj, "primary_image_file", None)
+        if image_file:
+            derivatives = obj.primary_image_derivatives
+            if isinstance(derivatives, str):
+                derivatives = json.loads(derivatives)
             return format_html(
                 '<img src="{}" width="60" height="60" style="object-fit: cover; border-radius: 4px;" />',
-                primary_image.image.url,
+                build_derivative_url(derivatives, settings.THUMBNAIL_SIZE) or default_storage.url(image_file),
             )
         return format_html(
             '<div style="width: 60px; height: 60px; background: #ddd; '
@@ -956,7 +1038,7 @@ class PartImageGalleryAdmin(admin.ModelAdmin):
 
     def image_count_display(self, obj):
         """Show image count"""
-        count = obj.images.count()
+        count = obj.image_count
         color = "#28a745" if count > 0 else "#dc3545"
         return format_html(
             '<span style="background: {}; color: white; padding: 3px 8px; '
@@ -966,6 +1048,7 @@ class PartImageGalleryAdmin(admin.ModelAdmin):
         )
 
     image_count_display.short_description = "Images"
+    image_count_display.admin_order_field = "images_count"
 
     def r2_folder_path(self, obj):
         """Show R2 storage path"""
@@ -975,19 +1058,19 @@ class PartImageGalleryAdmin(admin.ModelAdmin):
 
     # Admin Actions
     def publish_galleries(self, request, queryset):
-        queryset.update(is_published=True)
+        update_and_invalidate(queryset, "galleries", is_published=True)
         self.message_user(request, f"{queryset.count()} galleries published.")
 
     publish_galleries.short_description = "✅ Publish selected galleries"
 
     def unpublish_galleries(self, request, queryset):
-        queryset.update(is_published=False)
+        update_and_invalidate(queryset, "galleries", is_published=False)
         self.message_user(request, f"{queryset.count()} galleries unpublished.")
 
     unpublish_galleries.short_description = "❌ Unpublish selected galleries"
 
     def feature_galleries(self, request, queryset):
-        queryset.update(is_featured=True)
+        update_and_invalidate(queryset, "galleries", is_featured=True)
         self.message_user(request, f"{queryset.count()} galleries featured.")
 
     feature_galleries.short_description = "⭐ Feature selected galleries"
@@ -1009,6 +1092,7 @@ class PartImageUploadAdmin(admin.ModelAdmin):
         "uploaded_by",
         "uploaded_at",
     ]
+    list_select_related = ["gallery__manufacturer", "gallery__model", "uploaded_by"]
 
     list_filter = [
         "is_primary",
@@ -1103,11 +1187,14 @@ class PartImageTagAdmin(admin.ModelAdmin):
     prepopulated_fields = {"slug": ("name",)}
     filter_horizontal = ["galleries"]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(gallery_total=Count("galleries"))
+
     def gallery_count(self, obj):
-        count = obj.galleries.count()
-        return f"{count} galleries"
+        return f"{obj.gallery_total} galleries"
 
     gallery_count.short_description = "Used in"
+    gallery_count.admin_order_field = "gallery_total"
 
 
 # ============================================================================
@@ -1133,6 +1220,8 @@ class PartPriceAdmin(admin.ModelAdmin):
         "in_stock",
         "created_at",
     ]
+    # vehicle_info / part_name_display read these names
+    list_select_related = ["manufacturer", "model", "part_category"]
 
     list_filter = [
         "is_active",
@@ -1368,31 +1457,31 @@ class PartPriceAdmin(admin.ModelAdmin):
 
     # Admin Actions
     def activate_prices(self, request, queryset):
-        queryset.update(is_active=True)
+        update_and_invalidate(queryset, "galleries", is_active=True)
         self.message_user(request, f"{queryset.count()} prices activated.")
 
     activate_prices.short_description = "✅ Activate selected prices"
 
     def deactivate_prices(self, request, queryset):
-        queryset.update(is_active=False)
+        update_and_invalidate(queryset, "galleries", is_active=False)
         self.message_user(request, f"{queryset.count()} prices deactivated.")
 
     deactivate_prices.short_description = "❌ Deactivate selected prices"
 
     def mark_in_stock(self, request, queryset):
-        queryset.update(in_stock=True)
+        update_and_invalidate(queryset, "galleries", in_stock=True)
         self.message_user(request, f"{queryset.count()} marked as in stock.")
 
     mark_in_stock.short_description = "📦 Mark as In Stock"
 
     def mark_out_of_stock(self, request, queryset):
-        queryset.update(in_stock=False, quantity_available=0)
+        update_and_invalidate(queryset, "galleries", in_stock=False, quantity_available=0)
         self.message_user(request, f"{queryset.count()} marked as out of stock.")
 
     mark_out_of_stock.short_description = "🚫 Mark as Out of Stock"
 
     def feature_prices(self, request, queryset):
-        queryset.update(is_featured=True)
+        update_and_invalidate(queryset, "galleries", is_featured=True)
         self.message_user(request, f"{queryset.count()} prices featured.")
 
     feature_prices.short_description = "⭐ Feature selected prices"
@@ -1413,10 +1502,11 @@ class ProductImageAdmin(admin.ModelAdmin):
         'specification_number',
         'uploaded_at'
     ]
+    list_select_related = ['manufacturer', 'model', 'part_category']
     
     list_filter = [
         'manufacturer',
-        'model',
+        ('model', VehicleModelListFilter),
         'year',
         'part_category',
         'is_active',
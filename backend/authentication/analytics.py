@@ -301,15 +301,60 @@
 #
 #
 # authentication/analytics.py
+import asyncio
+import httpx
 import requests
 import json
 from django.conf import settings
 import logging
 import hashlib
 import uuid
+import atexit
+import os
+import threading
+from asgiref.sync import sync_to_async
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from .metrics import observe_outbound
 
 logger = logging.getLogger(__name__)
 
+# GA4 Measurement Protocol accepts at most 25 events per request
+MP_MAX_EVENTS_PER_REQUEST = 25
+
+
+# ============================================================================
+# SHARED ASYNC HTTP CLIENT
+# ============================================================================
+
+_async_client = None
+_async_client_loop = None
+
+
+def get_async_client():
+    """
+    httpx.AsyncClient shared by every async view in this worker.
+
+    Connections are pooled per event loop (one per uvicorn worker), so
+    concurrent requests reuse keep-alive connections to GA instead of
+    opening one each. Call from inside a running loop.
+    """
+    global _async_client, _async_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            timeout=getattr(settings, 'GA_HTTP_TIMEOUT', 5),
+            limits=httpx.Limits(
+                max_connections=getattr(settings, 'GA_HTTP_MAX_CONNECTIONS', 50),
+                max_keepalive_connections=getattr(settings, 'GA_HTTP_MAX_KEEPALIVE', 10),
+            ),
+        )
+        _async_client_loop = loop
+    return _async_client
+
+
 class GoogleAnalytics:
     """
     Google Analytics 4 Measurement Protocol
@@ -342,14 +387,46 @@ class GoogleAnalytics:
             logger.warning("google analytics not configured - skipping event tracking")
             return False
 
-        # add debug_mode to params if debugging
-        if event_params is None:
-            event_params = {}
+        try:
+            with observe_outbound('ga'):
+                response = requests.post(
+                    self.debug_endpoint if debug else self.endpoint,
+                    json=self._event_payload(client_id, event_name, event_params),
+                    headers={'content-type': 'application/json'},
+                    timeout=5
+                )
+            return self._event_result(response, event_name, debug)
+
+        except Exception as e:
+            logger.error(f"ga event error: {str(e)}")
+            return False
+
+    async def asend_event(self, client_id, event_name, event_params=None, debug=False):
+        """send_event() for async views, over the shared httpx.AsyncClient"""
+        if not self.endpoint:
+            logger.warning("google analytics not configured - skipping event tracking")
+            return False
+
+        try:
+            with observe_outbound('ga'):
+                response = await get_async_client().post(
+                    self.debug_endpoint if debug else self.endpoint,
+                    json=self._event_payload(client_id, event_name, event_params),
+                    headers={'content-type': 'application/json'},
+                )
+            return self._event_result(response, event_name, debug)
 
+        except Exception as e:
+            logger.error(f"ga event error: {str(e)}")
+            return False
+
+    def _event_payload(self, client_id, event_name, event_params):
         # always add debug_mode for better visibility in ga4
+        if event_params is None:
+            event_params = {}
         event_params['debug_mode'] = 1
 
-        payload = {
+        return {
             "client_id": str(client_id),
             "events": [{
                 "name": event_name,
@@ -357,45 +434,315 @@ class GoogleAnalytics:
             }]
         }
 
-        # choose endpoint
-        endpoint = self.debug_endpoint if debug else self.endpoint
+    def _event_result(self, response, event_name, debug):
+        """interpret a requests or httpx response the same way"""
+        # debug endpoint returns validation messages
+        if debug:
+            if response.status_code == 200:
+                validation_result = response.json()
+                logger.info(f"ga debug response: {json.dumps(validation_result, indent=2)}")
+
+                # check for validation errors
+                if 'validationmessages' in validation_result:
+                    for msg in validation_result['validationmessages']:
+                        logger.warning(f"ga validation: {msg}")
+
+                return validation_result
+            else:
+                logger.error(f"ga debug failed: {response.status_code} - {response.text}")
+                return {"error": response.text}
+
+        # regular endpoint returns 204 no content on success
+        if response.status_code == 204:
+            logger.info(f"ga event sent: {event_name}")
+            return True
+        else:
+            logger.error(f"ga event failed: {response.status_code}")
+            return False
+
+    def send_events(self, client_id, events, session=None):
+        """
+        send several events for one client in a single measurement protocol payload
+
+        args:
+            client_id: unique identifier for the user
+            events: list of {'name': ..., 'params': {...}} dicts (max 25)
+            session: optional requests.Session to reuse pooled connections
+
+        returns:
+            bool: True if GA accepted the payload
+        """
+        if not self.endpoint:
+            logger.warning("google analytics not configured - skipping event tracking")
+            return False
+
+        payload = self._batch_payload(client_id, events)
 
         try:
-            response = requests.post(
-                endpoint,
-                json=payload,
-                headers={'content-type': 'application/json'},
-                timeout=5
-            )
+            with observe_outbound('ga'):
+                response = (session or requests).post(
+                    self.endpoint,
+                    json=payload,
+                    headers={'content-type': 'application/json'},
+                    timeout=5
+                )
+            return self._batch_result(response, payload)
 
-            # debug endpoint returns validation messages
-            if debug:
-                if response.status_code == 200:
-                    validation_result = response.json()
-                    logger.info(f"ga debug response: {json.dumps(validation_result, indent=2)}")
+        except Exception as e:
+            logger.error(f"ga batch error: {str(e)}")
+            return False
 
-                    # check for validation errors
-                    if 'validationmessages' in validation_result:
-                        for msg in validation_result['validationmessages']:
-                            logger.warning(f"ga validation: {msg}")
+    async def asend_events(self, client_id, events):
+        """send_events() for async views, over the shared httpx.AsyncClient"""
+        if not self.endpoint:
+            logger.warning("google analytics not configured - skipping event tracking")
+            return False
 
-                    return validation_result
-                else:
-                    logger.error(f"ga debug failed: {response.status_code} - {response.text}")
-                    return {"error": response.text}
+        payload = self._batch_payload(client_id, events)
 
-            # regular endpoint returns 204 no content on success
-            if response.status_code == 204:
-                logger.info(f"ga event sent: {event_name}")
-                return True
-            else:
-                logger.error(f"ga event failed: {response.status_code}")
-                return False
+        try:
+            with observe_outbound('ga'):
+                response = await get_async_client().post(
+                    self.endpoint,
+                    json=payload,
+                    headers={'content-type': 'application/json'},
+                )
+            return self._batch_result(response, payload)
 
         except Exception as e:
-            logger.error(f"ga event error: {str(e)}")
+            logger.error(f"ga batch error: {str(e)}")
             return False
 
+    def _batch_payload(self, client_id, events):
+        return {
+            "client_id": str(client_id),
+            "events": [
+                {"name": event['name'], "params": dict(event.get('params') or {}, debug_mode=1)}
+                for event in events[:MP_MAX_EVENTS_PER_REQUEST]
+            ]
+        }
+
+    def _batch_result(self, response, payload):
+        if response.status_code == 204:
+            logger.info(f"ga batch sent: {len(payload['events'])} events")
+            return True
+        logger.error(f"ga batch failed: {response.status_code}")
+        return False
+
+
+# ============================================================================
+# ASYNC DISPATCHER
+# ============================================================================
+
+def ga_configured():
+    """True when both the measurement id and the api secret are set"""
+    return bool(
+        getattr(settings, 'GOOGLE_ANALYTICS_ID', '')
+        and getattr(settings, 'GOOGLE_ANALYTICS_API_SECRET', '')
+    )
+
+
+class AnalyticsDispatcher:
+    """
+    In-process, non-blocking dispatcher for GA4 events.
+
+    - bounded queue; when full the oldest event is dropped (drop-oldest backpressure)
+    - background worker threads, each with a pooled requests.Session
+    - events for the same client are coalesced into one payload (up to 25)
+    - pending events are flushed when the process shuts down
+    - nothing is queued while GA is not configured
+
+    Workers are started lazily in each process, so gunicorn workers forked
+    after import get their own threads.
+    """
+
+    def __init__(self, max_queue_size=None, num_workers=None, drain_size=None):
+        self.max_queue_size = max_queue_size or getattr(settings, 'GA_QUEUE_MAX_SIZE', 10000)
+        self.num_workers = num_workers or getattr(settings, 'GA_DISPATCH_WORKERS', 2)
+        # how many queued events a worker takes per wake-up before grouping by client
+        self.drain_size = drain_size or getattr(settings, 'GA_DISPATCH_DRAIN_SIZE', 250)
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._pid = None
+        self._stopping = False
+        self._in_flight = 0
+
+        self._stats_lock = threading.Lock()
+        self._stats = {'queued': 0, 'sent': 0, 'dropped': 0, 'failed': 0}
+
+    # ---------------------------------------------------------------- public
+
+    def enqueue(self, client_id, event_name, event_params=None):
+        """
+        queue one event and return immediately
+
+        returns:
+            bool: True if the event was accepted
+        """
+        if not ga_configured():
+            logger.warning("google analytics not configured - skipping event tracking")
+            return False
+        self._ensure_started()
+
+        event = {'name': event_name, 'params': event_params or {}}
+        dropped = 0
+        with self._cond:
+            if self._stopping:
+                return False
+            while len(self._queue) >= self.max_queue_size:
+                self._queue.popleft()
+                dropped += 1
+            self._queue.append((str(client_id), event))
+            self._cond.notify()
+
+        self._incr('queued')
+        if dropped:
+            self._incr('dropped', dropped)
+            logger.warning(f"ga queue full - dropped {dropped} oldest event(s)")
+        return True
+
+    def enqueue_many(self, client_id, events):
+        """
+        queue several {'name', 'params'} events for one client under a single lock
+
+        returns:
+            list: one bool per event (True if accepted)
+        """
+        if not ga_configured():
+            logger.warning("google analytics not configured - skipping event tracking")
+            return [False] * len(events)
+        self._ensure_started()
+
+        client_id = str(client_id)
+        dropped = 0
+        with self._cond:
+            if self._stopping:
+                return [False] * len(events)
+            for event in events:
+                if len(self._queue) >= self.max_queue_size:
+                    self._queue.popleft()
+                    dropped += 1
+                self._queue.append((client_id, event))
+            self._cond.notify_all()
+
+        self._incr('queued', len(events))
+        if dropped:
+            self._incr('dropped', dropped)
+            logger.warning(f"ga queue full - dropped {dropped} oldest event(s)")
+        return [True] * len(events)
+
+    def flush(self, timeout=5.0):
+        """block until the queue is empty and no batch is in flight"""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._queue and not self._in_flight, timeout=timeout
+            )
+
+    def shutdown(self, timeout=5.0):
+        """stop accepting events, drain what is queued and join the workers"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+        self._threads = []
+
+    def get_stats(self):
+        """counters for queued, sent, dropped and failed events"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats['pending'] = len(self._queue)
+        stats['workers'] = sum(1 for t in self._threads if t.is_alive())
+        return stats
+
+    # -------------------------------------------------------------- internals
+
+    def _incr(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._cond:
+            if self._pid == pid:
+                return
+            # fresh process (first use or after fork) - threads were not inherited
+            self._pid = pid
+            self._stopping = False
+            self._threads = []
+            for index in range(self.num_workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f"ga-dispatcher-{index}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+            atexit.register(self.shutdown)
+
+    def _take_batch(self):
+        """pop up to drain_size events; returns [] only when stopping with an empty queue"""
+        with self._cond:
+            while not self._queue and not self._stopping:
+                self._cond.wait()
+            batch = []
+            while self._queue and len(batch) < self.drain_size:
+                batch.append(self._queue.popleft())
+            self._in_flight += len(batch)
+            return batch
+
+    def _worker(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        session.mount('https://', adapter)
+        ga = GoogleAnalytics()
+
+        try:
+            while True:
+                batch = self._take_batch()
+                if not batch:
+                    return
+                try:
+                    self._send_batch(ga, session, batch)
+                finally:
+                    with self._cond:
+                        self._in_flight -= len(batch)
+                        self._cond.notify_all()
+        finally:
+            session.close()
+
+    def _send_batch(self, ga, session, batch):
+        # coalesce by client, preserving arrival order within each client
+        by_client = {}
+        for client_id, event in batch:
+            by_client.setdefault(client_id, []).append(event)
+
+        for client_id, events in by_client.items():
+            for start in range(0, len(events), MP_MAX_EVENTS_PER_REQUEST):
+                chunk = events[start:start + MP_MAX_EVENTS_PER_REQUEST]
+                if ga.send_events(client_id, chunk, session=session):
+                    self._incr('sent', len(chunk))
+                else:
+                    self._incr('failed', len(chunk))
+
+
+dispatcher = AnalyticsDispatcher()
+
+
+def get_dispatcher_stats():
+    """
+    get counters from the async dispatcher
+
+    returns:
+        dict: queued, sent, dropped, failed, pending, workers
+    """
+    return dispatcher.get_stats()
+
+
 def get_client_ip(request):
     """extract client ip address from request"""
     x_forwarded_for = request.META.get("HTTP_X_FORWARDED_FOR")
@@ -442,6 +789,13 @@ def get_client_id(request):
     return f"{hash_hex[:8]}-{hash_hex[8:12]}-{hash_hex[12:16]}-{hash_hex[16:20]}-{hash_hex[20:32]}"
 
 
+def _clean_params(event_params):
+    """remove potentially problematic data (ip addresses, long user agents)"""
+    if not event_params:
+        return event_params
+    return {k: v for k, v in event_params.items() if k not in ['ip_address', 'user_agent']}
+
+
 def track_event(request, event_name, event_params=None):
     """
     helper function to track events easily
@@ -452,20 +806,48 @@ def track_event(request, event_name, event_params=None):
         event_params: optional dictionary of event parameters
 
     returns:
-        bool: True if successful, False otherwise
+        bool: True if queued (async mode) or sent (sync mode), False otherwise
     """
     try:
-        ga = GoogleAnalytics()
         client_id = get_client_id(request)
+        event_params = _clean_params(event_params)
 
-        # clean event params - remove potentially problematic data
-        if event_params:
-            # remove ip addresses and long user agents from params
-            cleaned_params = {k: v for k, v in event_params.items() 
-                            if k not in ['ip_address', 'user_agent']}
-            event_params = cleaned_params
+        # async mode: hand off to the background dispatcher and return immediately
+        if getattr(settings, 'GA_ASYNC_ENABLED', True):
+            return dispatcher.enqueue(client_id, event_name, event_params)
 
-        return ga.send_event(client_id, event_name, event_params)
+        return GoogleAnalytics().send_event(client_id, event_name, event_params)
+    except Exception as e:
+        logger.error(f"error tracking event {event_name}: {str(e)}")
+        return False
+
+
+async def aget_client_id(request):
+    """
+    get_client_id() for async views: the frontend header is read directly,
+    the fallbacks run in a thread since request.user may query the session
+    """
+    client_id_header = request.headers.get('x-ga-client-id')
+    if client_id_header:
+        return client_id_header
+    return await sync_to_async(get_client_id)(request)
+
+
+async def atrack_event(client_id, event_name, event_params=None):
+    """
+    track_event() for async views; the client id is resolved by the caller
+    (see aget_client_id) so this never touches the database
+
+    returns:
+        bool: True if queued (async mode) or sent (sync mode), False otherwise
+    """
+    try:
+        event_params = _clean_params(event_params)
+
+        if getattr(settings, 'GA_ASYNC_ENABLED', True):
+            return dispatcher.enqueue(client_id, event_name, event_params)
+
+        return await GoogleAnalytics().asend_event(client_id, event_name, event_params)
     except Exception as e:
         logger.error(f"error tracking event {event_name}: {str(e)}")
         return False
@@ -490,16 +872,7 @@ def track_product_page_view(request, product_id, product_name, price, category=N
         bool: True if successful
     """
     try:
-        event_params = {
-            'product_id': str(product_id),
-            'product_name': product_name[:100],  # limit length
-            'price': float(price) if price else 0.0,
-            'page_url': request.build_absolute_uri(),
-        }
-
-        if category:
-            event_params['category'] = category[:50]
-
+        event_params = product_view_params(request, product_id, product_name, price, category)
         return track_event(request, 'product_page_view', event_params)
 
     except Exception as e:
@@ -507,6 +880,21 @@ def track_product_page_view(request, product_id, product_name, price, category=N
         return False
 
 
+def product_view_params(request, product_id, product_name, price, category=None):
+    """GA params for a product_page_view event"""
+    event_params = {
+        'product_id': str(product_id),
+        'product_name': product_name[:100],  # limit length
+        'price': float(price) if price else 0.0,
+        'page_url': request.build_absolute_uri(),
+    }
+
+    if category:
+        event_params['category'] = category[:50]
+
+    return event_params
+
+
 def track_add_to_wishlist(request, product_id, product_name, price):
     """
     track when user adds product to wishlist
@@ -621,16 +1009,12 @@ def track_button_click(request, button_name, location='unknown', total_clicks=No
         bool: True if successful
     """
     try:
-        event_params = {
-            'button_name': button_name[:100],
-            'click_location': location[:100],
-        }
-        
-        if total_clicks is not None:
-            event_params['total_clicks'] = int(total_clicks)
-        
-        return track_event(request, 'button_click', event_params)
-    
+        return track_registered_event(request, 'button_click', {
+            'button_name': button_name,
+            'click_location': location,
+            'total_clicks': total_clicks,
+        })
+
     except Exception as e:
         logger.error(f"error tracking button click: {str(e)}")
         return False
@@ -649,13 +1033,11 @@ def track_link_click(request, link_text, link_url):
         bool: True if successful
     """
     try:
-        event_params = {
-            'link_text': link_text[:200],
-            'link_url': link_url[:500],
-        }
-        
-        return track_event(request, 'link_click', event_params)
-    
+        return track_registered_event(request, 'link_click', {
+            'link_text': link_text,
+            'link_url': link_url,
+        })
+
     except Exception as e:
         logger.error(f"error tracking link click: {str(e)}")
         return False
@@ -676,13 +1058,11 @@ def track_search(request, search_term, results_count=0):
         bool: True if successful
     """
     try:
-        event_params = {
-            'search_term': search_term[:200],
-            'results_count': int(results_count),
-        }
-        
-        return track_event(request, 'search', event_params)
-    
+        return track_registered_event(request, 'search', {
+            'search_term': search_term,
+            'results_count': results_count,
+        })
+
     except Exception as e:
         logger.error(f"error tracking search: {str(e)}")
         return False
@@ -702,14 +1082,12 @@ def track_filter_change(request, filter_type, filter_value, location='unknown'):
         bool: True if successful
     """
     try:
-        event_params = {
-            'filter_type': filter_type[:100],
-            'filter_value': str(filter_value)[:200],
-            'page_location': location[:100],
-        }
-        
-        return track_event(request, 'search_filter_change', event_params)
-    
+        return track_registered_event(request, 'search_filter_change', {
+            'filter_type': filter_type,
+            'filter_value': filter_value,
+            'page_location': location,
+        })
+
     except Exception as e:
         logger.error(f"error tracking filter change: {str(e)}")
         return False
@@ -729,12 +1107,10 @@ def track_form_start(request, form_name):
         bool: True if successful
     """
     try:
-        event_params = {
-            'form_name': form_name[:100],
-        }
-        
-        return track_event(request, 'form_start', event_params)
-    
+        return track_registered_event(request, 'form_start', {
+            'form_name': form_name,
+        })
+
     except Exception as e:
         logger.error(f"error tracking form start: {str(e)}")
         return False
@@ -753,13 +1129,11 @@ def track_form_submit(request, form_name, success=True):
         bool: True if successful
     """
     try:
-        event_params = {
-            'form_name': form_name[:100],
-            'success': bool(success),
-        }
-        
-        return track_event(request, 'form_submit', event_params)
-    
+        return track_registered_event(request, 'form_submit', {
+            'form_name': form_name,
+            'success': success,
+        })
+
     except Exception as e:
         logger.error(f"error tracking form submit: {str(e)}")
         return False
@@ -808,16 +1182,12 @@ def track_carousel_interaction(request, carousel_name, action, direction=None):
         bool: True if successful
     """
     try:
-        event_params = {
-            'carousel_name': carousel_name[:100],
-            'action': action[:50],
-        }
-        
-        if direction:
-            event_params['direction'] = direction[:20]
-        
-        return track_event(request, 'carousel_interaction', event_params)
-    
+        return track_registered_event(request, 'carousel_interaction', {
+            'carousel_name': carousel_name,
+            'action': action,
+            'direction': direction,
+        })
+
     except Exception as e:
         logger.error(f"error tracking carousel interaction: {str(e)}")
         return False
@@ -837,14 +1207,12 @@ def track_brand_click(request, brand_name, brand_slug, location='unknown'):
         bool: True if successful
     """
     try:
-        event_params = {
-            'brand_name': brand_name[:100],
-            'brand_slug': brand_slug[:100],
-            'click_location': location[:100],
-        }
-        
-        return track_event(request, 'brand_click', event_params)
-    
+        return track_registered_event(request, 'brand_click', {
+            'brand_name': brand_name,
+            'brand_slug': brand_slug,
+            'click_location': location,
+        })
+
     except Exception as e:
         logger.error(f"error tracking brand click: {str(e)}")
         return False
@@ -889,14 +1257,12 @@ def track_cta_click(request, cta_name, cta_location, cta_type='button'):
         bool: True if successful
     """
     try:
-        event_params = {
-            'cta_name': cta_name[:100],
-            'cta_location': cta_location[:100],
-            'cta_type': cta_type[:50],
-        }
-        
-        return track_event(request, 'cta_click', event_params)
-    
+        return track_registered_event(request, 'cta_click', {
+            'cta_name': cta_name,
+            'cta_location': cta_location,
+            'cta_type': cta_type,
+        })
+
     except Exception as e:
         logger.error(f"error tracking cta click: {str(e)}")
         return False
@@ -918,14 +1284,12 @@ def track_error(request, error_type, error_message, error_location):
         bool: True if successful
     """
     try:
-        event_params = {
-            'error_type': error_type[:100],
-            'error_message': error_message[:500],
-            'error_location': error_location[:200],
-        }
-        
-        return track_event(request, 'error', event_params)
-    
+        return track_registered_event(request, 'error', {
+            'error_type': error_type,
+            'error_message': error_message,
+            'error_location': error_location,
+        })
+
     except Exception as e:
         logger.error(f"error tracking error event: {str(e)}")
         return False
@@ -973,16 +1337,11 @@ def track_page_view(request, page_path, page_title=None):
         bool: True if successful
     """
     try:
-        event_params = {
-            'page_path': page_path[:500],
-            'page_location': request.build_absolute_uri()[:500],
-        }
-        
-        if page_title:
-            event_params['page_title'] = page_title[:200]
-        
-        return track_event(request, 'page_view', event_params)
-    
+        return track_registered_event(request, 'page_view', {
+            'page_path': page_path,
+            'page_title': page_title,
+        })
+
     except Exception as e:
         logger.error(f"error tracking page view: {str(e)}")
         return False
@@ -1017,6 +1376,236 @@ def track_page_exit(request, page_path, time_spent_seconds, total_clicks=0, enga
         return False
 
 
+# ============================================================================
+# EVENT REGISTRY (frontend event_type -> GA4 event)
+# ============================================================================
+# Each entry maps the event_type posted by the frontend to the GA4 event name
+# and a builder that normalizes event_data into GA params. The track_* helpers
+# for these events go through the same builders, so defaults and length limits
+# live here only.
+
+def _text(data, key, default, limit):
+    value = data.get(key)
+    if value is None:
+        value = default
+    return str(value)[:limit]
+
+
+def _build_button_click(request, data):
+    params = {
+        'button_name': _text(data, 'button_name', 'unknown', 100),
+        'click_location': _text(data, 'click_location', 'unknown', 100),
+    }
+    if data.get('total_clicks') is not None:
+        params['total_clicks'] = int(data['total_clicks'])
+    return params
+
+
+def _build_page_view(request, data):
+    params = {
+        'page_path': _text(data, 'page_path', request.path, 500),
+        'page_location': request.build_absolute_uri()[:500],
+    }
+    if data.get('page_title'):
+        params['page_title'] = _text(data, 'page_title', '', 200)
+    return params
+
+
+def _build_carousel_interaction(request, data):
+    params = {
+        'carousel_name': _text(data, 'carousel_name', 'unknown', 100),
+        'action': _text(data, 'action', 'unknown', 50),
+    }
+    if data.get('direction'):
+        params['direction'] = _text(data, 'direction', '', 20)
+    return params
+
+
+EVENT_REGISTRY = {
+    'button_click': ('button_click', _build_button_click),
+    'link_click': ('link_click', lambda request, data: {
+        'link_text': _text(data, 'link_text', '', 200),
+        'link_url': _text(data, 'link_url', '', 500),
+    }),
+    'search': ('search', lambda request, data: {
+        'search_term': _text(data, 'search_term', '', 200),
+        'results_count': int(data.get('results_count') or 0),
+    }),
+    'page_view': ('page_view', _build_page_view),
+    'carousel_interaction': ('carousel_interaction', _build_carousel_interaction),
+    'brand_click': ('brand_click', lambda request, data: {
+        'brand_name': _text(data, 'brand_name', 'unknown', 100),
+        'brand_slug': _text(data, 'brand_slug', 'unknown', 100),
+        'click_location': _text(data, 'click_location', 'unknown', 100),
+    }),
+    'cta_click': ('cta_click', lambda request, data: {
+        'cta_name': _text(data, 'cta_name', 'unknown', 100),
+        'cta_location': _text(data, 'cta_location', 'unknown', 100),
+        'cta_type': _text(data, 'cta_type', 'button', 50),
+    }),
+    'error': ('error', lambda request, data: {
+        'error_type': _text(data, 'error_type', 'unknown', 100),
+        'error_message': _text(data, 'error_message', '', 500),
+        'error_location': _text(data, 'error_location', 'unknown', 200),
+    }),
+    'form_start': ('form_start', lambda request, data: {
+        'form_name': _text(data, 'form_name', 'unknown', 100),
+    }),
+    'form_submit': ('form_submit', lambda request, data: {
+        'form_name': _text(data, 'form_name', 'unknown', 100),
+        'success': bool(data.get('success', True)),
+    }),
+    'search_filter_change': ('search_filter_change', lambda request, data: {
+        'filter_type': _text(data, 'filter_type', 'unknown', 100),
+        'filter_value': _text(data, 'filter_value', '', 200),
+        'page_location': _text(data, 'page_location', 'unknown', 100),
+    }),
+}
+
+
+def build_registered_event(request, event_type, event_data):
+    """
+    validate and normalize one frontend event through the registry
+
+    returns:
+        dict: {'name': ga_event_name, 'params': {...}}
+
+    raises:
+        ValueError: non-string or unknown event_type, or malformed event_data
+    """
+    if not isinstance(event_type, str):
+        raise ValueError('event_type must be a string')
+    entry = EVENT_REGISTRY.get(event_type)
+    if entry is None:
+        raise ValueError(f'Unknown event_type: {event_type}')
+    if not isinstance(event_data, dict):
+        raise ValueError('event_data must be an object')
+
+    ga_name, builder = entry
+    try:
+        params = builder(request, event_data)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f'Invalid event_data for {event_type}: {e}')
+    return {'name': ga_name, 'params': params}
+
+
+def track_registered_event(request, event_type, event_data):
+    """
+    track one frontend event_type through the registry
+
+    returns:
+        bool: True if queued/sent
+
+    raises:
+        ValueError: unknown event_type or malformed event_data
+    """
+    event = build_registered_event(request, event_type, event_data)
+    return track_event(request, event['name'], event['params'])
+
+
+def track_events_batch(request, events):
+    """
+    validate a list of frontend events in one pass and ship them as
+    multi-event measurement protocol payloads for the request's client id
+
+    in async mode the events are queued and this returns without touching
+    the network; otherwise the payloads (25 events each) are sent concurrently
+
+    args:
+        request: django request object
+        events: list of {'event_type', 'event_data'}
+
+    returns:
+        list: per-event {'event_type', 'success', optional 'error'}
+    """
+    client_id = get_client_id(request)
+    results, items = _build_registered_events(request, events)
+    if not items or getattr(settings, 'GA_ASYNC_ENABLED', True):
+        return _enqueue_events(results, client_id, items)
+
+    # sync mode: one payload per 25 events, sent concurrently
+    ga = GoogleAnalytics()
+    chunks = _chunk_events(items)
+
+    with requests.Session() as session, ThreadPoolExecutor(
+        max_workers=min(len(chunks), getattr(settings, 'GA_BATCH_CONCURRENCY', 4))
+    ) as pool:
+        futures = {
+            pool.submit(ga.send_events, client_id, [event for _, event in chunk], session): chunk
+            for chunk in chunks
+        }
+        for future, chunk in futures.items():
+            ok = future.result()
+            for index, _ in chunk:
+                results[index]['success'] = ok
+
+    return results
+
+
+async def atrack_events_batch(request, events, client_id):
+    """
+    track_events_batch() for async views: in sync mode the payloads are
+    sent concurrently on the shared httpx.AsyncClient instead of a thread pool
+
+    args:
+        request: django request object
+        events: list of {'event_type', 'event_data'}
+        client_id: the request's client id (see aget_client_id)
+    """
+    results, items = _build_registered_events(request, events)
+    if not items or getattr(settings, 'GA_ASYNC_ENABLED', True):
+        return _enqueue_events(results, client_id, items)
+
+    ga = GoogleAnalytics()
+    chunks = _chunk_events(items)
+    outcomes = await asyncio.gather(*(
+        ga.asend_events(client_id, [event for _, event in chunk]) for chunk in chunks
+    ))
+    for chunk, ok in zip(chunks, outcomes):
+        for index, _ in chunk:
+            results[index]['success'] = ok
+
+    return results
+
+
+def _build_registered_events(request, events):
+    """
+    per-event results plus [(result_index, ga_event)] for the valid ones;
+    a per-event client_id is ignored, events always belong to the requester
+    """
+    results = []
+    items = []
+
+    for raw in events:
+        event_type = raw.get('event_type') if isinstance(raw, dict) else None
+        result = {'event_type': event_type, 'success': False}
+        results.append(result)
+        try:
+            if not isinstance(raw, dict):
+                raise ValueError('event must be an object')
+            event = build_registered_event(request, event_type, raw.get('event_data') or {})
+        except ValueError as e:
+            result['error'] = str(e)
+            continue
+        items.append((len(results) - 1, event))
+
+    return results, items
+
+
+def _enqueue_events(results, client_id, items):
+    accepted = dispatcher.enqueue_many(client_id, [event for _, event in items]) if items else []
+    for (index, _), ok in zip(items, accepted):
+        results[index]['success'] = ok
+    return results
+
+
+def _chunk_events(items):
+    return [
+        items[start:start + MP_MAX_EVENTS_PER_REQUEST]
+        for start in range(0, len(items), MP_MAX_EVENTS_PER_REQUEST)
+    ]
+
+
 # ============================================================================
 # TESTING & DEBUG UTILITIES
 # ============================================================================
@@ -1086,6 +1675,8 @@ def get_analytics_status():
         'configured': bool(ga.endpoint),
         'measurement_id': ga.measurement_id if ga.measurement_id else 'Not set',
         'api_secret': 'Set' if ga.api_secret else 'Not set',
-        'endpoint': ga.endpoint if ga.endpoint else 'Not configured'
+        'endpoint': ga.endpoint if ga.endpoint else 'Not configured',
+        'async_enabled': getattr(settings, 'GA_ASYNC_ENABLED', True),
+        'dispatcher': get_dispatcher_stats(),
     }
 
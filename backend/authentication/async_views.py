@@ -0,0 +1,336 @@
+# authentication/async_views.py
+"""
+Native async versions of endpoints that spend their time waiting on I/O.
+
+urls.py routes these in place of the sync views when ASYNC_VIEWS_ENABLED is
+set, i.e. when the app runs under ASGI (gunicorn.conf.py with DJANGO_ASGI=True
+and uvicorn workers). Under WSGI the sync views stay in charge, since every
+async view would otherwise get its own event loop and HTTP client.
+
+- Analytics: outbound GA calls go through the worker's shared
+  httpx.AsyncClient, so a slow Google response parks a coroutine instead of
+  a whole worker; verify-ga4 sends its three test events concurrently.
+- Reference data: Django's async ORM, with the same cache entries, ETags and
+  replica routing as the sync views.
+
+Analytics endpoints share the sync views' rate-limit buckets (ratelimit.py).
+
+Response bodies match the sync views. These are plain Django views (DRF 3.14
+has no async support), so they parse JSON themselves; DRF's JWT-only
+authentication never enforced CSRF on the originals, hence csrf_exempt.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+
+from django.http import HttpResponseNotAllowed, JsonResponse
+
+from .analytics import (
+    GoogleAnalytics,
+    aget_client_id,
+    atrack_event,
+    atrack_events_batch,
+    build_registered_event,
+    product_view_params,
+)
+from .caching import cached_response, conditional_response
+from .models import Manufacturer, PartCategory, VehicleModel
+from .ratelimit import rate_limited
+from .replicas import use_replica
+from .serializers import ManufacturerSerializer, PartCategorySerializer, VehicleModelSerializer
+from .views import (
+    backend_test_event_params,
+    test_analytics_payload,
+    verification_tests,
+    verify_ga4_payload,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def async_endpoint(*methods):
+    """
+    require_http_methods() + csrf_exempt for async views (Django 4.2's
+    versions wrap views in sync functions, which would push them to a thread)
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            return await view(request, *args, **kwargs)
+
+        wrapper.csrf_exempt = True
+        return wrapper
+
+    return decorator
+
+
+def _request_data(request):
+    """JSON or form body, like DRF's request.data for these endpoints"""
+    if request.content_type == "application/json":
+        return json.loads(request.body or b"{}")
+    return request.POST
+
+
+# ============================================================================
+# REFERENCE DATA
+# ============================================================================
+
+@use_replica
+@async_endpoint("GET", "HEAD")
+@conditional_response("reference")
+@cached_response("manufacturers", group="reference")
+async def get_manufacturers(request):
+    """
+    Get list of all active manufacturers
+
+    GET /api/manufacturers/
+    """
+    manufacturers = [m async for m in Manufacturer.objects.filter(is_active=True).order_by("name")]
+    serializer = ManufacturerSerializer(manufacturers, many=True)
+    return JsonResponse({"success": True, "data": serializer.data})
+
+
+@use_replica
+@async_endpoint("GET", "HEAD")
+@conditional_response("reference")
+@cached_response("models_by_manufacturer", group="reference")
+async def get_models_by_manufacturer(request, manufacturer_id):
+    """
+    Get all models for a specific manufacturer
+
+    GET /api/manufacturers/{manufacturer_id}/models/
+    """
+    try:
+        manufacturer = await Manufacturer.objects.aget(id=manufacturer_id, is_active=True)
+    except Manufacturer.DoesNotExist:
+        return JsonResponse({"success": False, "error": "Manufacturer not found"}, status=404)
+
+    models = [
+        model async for model in VehicleModel.objects.filter(
+            manufacturer=manufacturer, is_active=True
+        ).select_related("manufacturer").order_by("name")
+    ]
+    serializer = VehicleModelSerializer(models, many=True)
+    return JsonResponse({
+        "success": True,
+        "manufacturer": manufacturer.name,
+        "data": serializer.data,
+    })
+
+
+@use_replica
+@async_endpoint("GET", "HEAD")
+@conditional_response("reference")
+@cached_response("models", group="reference")
+async def get_all_models(request):
+    """
+    Get all active vehicle models (with manufacturer info)
+
+    GET /api/models/
+
+    Optional query params:
+    - manufacturer_id: filter by manufacturer
+    """
+    manufacturer_id = request.GET.get("manufacturer_id")
+
+    models = VehicleModel.objects.filter(is_active=True).select_related("manufacturer")
+    if manufacturer_id:
+        models = models.filter(manufacturer_id=manufacturer_id)
+
+    models = [model async for model in models.order_by("manufacturer__name", "name")]
+    serializer = VehicleModelSerializer(models, many=True)
+    return JsonResponse({"success": True, "data": serializer.data})
+
+
+@use_replica
+@async_endpoint("GET", "HEAD")
+@conditional_response("reference")
+@cached_response("part_categories", group="reference")
+async def get_part_categories(request):
+    """
+    Get list of all active part categories
+
+    GET /api/part-categories/
+    """
+    categories = [c async for c in PartCategory.objects.filter(is_active=True).order_by("name")]
+    serializer = PartCategorySerializer(categories, many=True)
+    return JsonResponse({"success": True, "data": serializer.data})
+
+
+# ============================================================================
+# ANALYTICS
+# ============================================================================
+
+@async_endpoint("POST")
+@rate_limited("tracking")
+async def track_product_view_api(request):
+    """
+    Track product page view
+    POST /api/track-product-view/
+    """
+    try:
+        data = _request_data(request)
+        product_id = data.get("product_id")
+        product_name = data.get("product_name")
+
+        if not product_id or not product_name:
+            return JsonResponse({
+                "success": False,
+                "error": "product_id and product_name are required"
+            }, status=400)
+
+        params = product_view_params(
+            request, product_id, product_name, data.get("price"), data.get("category")
+        )
+        success = await atrack_event(await aget_client_id(request), "product_page_view", params)
+
+        logger.info(f"Product view tracked: {product_name} (ID: {product_id})")
+
+        return JsonResponse({
+            "success": success,
+            "message": "Product view tracked"
+        })
+
+    except Exception as e:
+        logger.error(f"Error in track_product_view_api: {str(e)}", exc_info=True)
+        return JsonResponse({
+            "success": False,
+            "error": str(e)
+        }, status=500)
+
+
+@async_endpoint("POST")
+@rate_limited("tracking")
+async def track_analytics_event(request):
+    """
+    POST /api/analytics/track
+    Generic endpoint to track any analytics event from frontend
+    """
+    try:
+        data = json.loads(request.body)
+        event_type = data.get("event_type")
+        event_data = data.get("event_data", {})
+
+        if not event_type:
+            return JsonResponse({
+                "success": False,
+                "error": "event_type is required"
+            }, status=400)
+
+        try:
+            event = build_registered_event(request, event_type, event_data)
+        except ValueError as e:
+            return JsonResponse({
+                "success": False,
+                "error": str(e)
+            }, status=400)
+
+        result = await atrack_event(await aget_client_id(request), event["name"], event["params"])
+
+        return JsonResponse({
+            "success": result,
+            "event_type": event_type,
+            "message": "Event tracked successfully" if result else "Event tracking failed"
+        })
+
+    except json.JSONDecodeError:
+        return JsonResponse({
+            "success": False,
+            "error": "Invalid JSON in request body"
+        }, status=400)
+
+    except Exception as e:
+        logger.error(f"Error tracking analytics event: {str(e)}")
+        return JsonResponse({
+            "success": False,
+            "error": str(e)
+        }, status=500)
+
+
+@async_endpoint("POST")
+@rate_limited("tracking")
+async def batch_track_events(request):
+    """
+    POST /api/analytics/batch-track
+    Track multiple events in a single request
+    """
+    try:
+        data = json.loads(request.body)
+        events = data.get("events", [])
+
+        if not events:
+            return JsonResponse({
+                "success": False,
+                "error": "events array is required"
+            }, status=400)
+
+        if not isinstance(events, list):
+            return JsonResponse({
+                "success": False,
+                "error": "events must be an array"
+            }, status=400)
+
+        results = await atrack_events_batch(request, events, await aget_client_id(request))
+
+        total_events = len(results)
+        successful_events = sum(1 for r in results if r["success"])
+
+        return JsonResponse({
+            "success": True,
+            "total_events": total_events,
+            "successful_events": successful_events,
+            "failed_events": total_events - successful_events,
+            "results": results
+        })
+
+    except json.JSONDecodeError:
+        return JsonResponse({
+            "success": False,
+            "error": "Invalid JSON in request body"
+        }, status=400)
+
+    except Exception as e:
+        logger.error(f"Error in batch tracking: {str(e)}")
+        return JsonResponse({
+            "success": False,
+            "error": str(e)
+        }, status=500)
+
+
+@async_endpoint("GET", "HEAD")
+@rate_limited("analytics_test")
+async def test_analytics(request):
+    """
+    Test endpoint to verify Google Analytics is working
+    GET /api/test-analytics/
+    """
+    ga = GoogleAnalytics()
+    client_id = await aget_client_id(request)
+
+    success = await ga.asend_event(
+        client_id=client_id,
+        event_name="backend_test_event",
+        event_params=backend_test_event_params(request)
+    )
+    return JsonResponse(test_analytics_payload(ga, client_id, success))
+
+
+@async_endpoint("GET", "HEAD")
+@rate_limited("analytics_test")
+async def verify_ga4_connection(request):
+    """
+    Send multiple test events and verify GA4 configuration
+    GET /api/verify-ga4/
+    """
+    ga = GoogleAnalytics()
+    client_id = await aget_client_id(request)
+
+    outcomes = await asyncio.gather(*(
+        ga.asend_event(client_id=client_id, **test) for test in verification_tests()
+    ))
+    return JsonResponse(verify_ga4_payload(ga, client_id, outcomes))
@@ -0,0 +1,446 @@
+# authentication/autocomplete.py
+"""
+In-process typeahead index for the catalog search box.
+
+    suggest("brak")  -> [{"type": "part", "label": "Brake Pad", ...}, ...]
+
+Suggestions come from active manufacturers, vehicle models and part
+categories, and from the part names and part numbers of published
+galleries. Each suggestion is an entry with a popularity weight: for
+manufacturers, models and categories it is the number of published
+galleries that use them; for part names and numbers, the number of
+galleries that carry them.
+
+Entries are found through one sorted list of search keys (lower-cased,
+punctuation collapsed). A label is indexed from each of its first few word
+starts, so "pad" finds "Brake Pad". Part numbers are indexed in their
+normalized form behind NUMBER_PREFIX, so "12-345" and "12345" both match.
+A prefix lookup is two bisects plus a scan of the matching range; prefixes
+that match more than SCAN_LIMIT keys keep their ranked result until an
+entry under them changes.
+
+Like the fitment index, it is built on first use in each worker (gunicorn's
+post_worker_init does this at start) and updated incrementally by
+signals.py for saves in this process once their transaction commits. When
+another process bumps the shared version, or after AUTOCOMPLETE_MAX_AGE
+seconds, a new index is built in a background thread while requests keep
+reading the old one, then swapped in.
+"""
+
+import heapq
+import logging
+import os
+import re
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from .fitment import bump_shared_version, get_shared_version
+from .models import Manufacturer, PartCategory, PartImageGallery, VehicleModel
+from .search import normalize_part_number
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "autocomplete:version"
+
+KINDS = ("manufacturer", "model", "category", "part", "part_number")
+REFERENCE_KINDS = ("manufacturer", "model", "category")
+
+NUMBER_PREFIX = "#"
+MAX_WORD_KEYS = 4
+SCAN_LIMIT = 256
+MAX_LIMIT = 25
+MAX_HOT_PREFIXES = 20000
+
+GALLERY_FIELDS = ("pk", "part_name", "part_number", "manufacturer_id", "model_id", "part_category_id")
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def normalize_text(value):
+    """Lower-case, punctuation and runs of whitespace collapsed to one space"""
+    if not value:
+        return ""
+    return _NON_WORD_RE.sub(" ", str(value).lower()).strip()
+
+
+def search_keys(kind, identity, label):
+    if kind == "part_number":
+        return [NUMBER_PREFIX + identity.lower()]
+    words = normalize_text(label).split()
+    return list(dict.fromkeys(" ".join(words[i:]) for i in range(min(len(words), MAX_WORD_KEYS))))
+
+
+class AutocompleteIndex:
+    """
+    Sorted search keys pointing into parallel entry arrays
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        self._keys = []                 # sorted search keys
+        self._key_entries = array("l")  # entry id for each key
+        self._kinds = array("b")        # entry id -> index into KINDS (-1 when free)
+        self._object_ids = array("l")   # entry id -> row id (0 for part names / numbers)
+        self._weights = array("l")
+        self._labels = []
+        self._details = []
+        self._entries = {}              # (kind, identity) -> entry id
+        self._free = []                 # entry ids to reuse
+        self._counts = {}               # (kind, identity) -> galleries using it
+        self._rows = {}                 # gallery pk -> (part name, part number, make, model, category)
+        self._hot = {}                  # prefix -> {kinds: ranked entry ids}
+        self._pending = None            # (key, entry) pairs while building
+        self.version = None
+        self.built_at = None
+
+    # ------------------------------------------------------------------ build
+
+    def build(self):
+        """Load active reference data and published galleries"""
+        references = [
+            ("manufacturer", pk, name, None)
+            for pk, name in Manufacturer.objects.filter(is_active=True).values_list("id", "name")
+        ]
+        references.extend(
+            ("model", pk, name, manufacturer)
+            for pk, name, manufacturer in VehicleModel.objects.filter(is_active=True).values_list(
+                "id", "name", "manufacturer__name"
+            )
+        )
+        references.extend(
+            ("category", pk, name, None)
+            for pk, name in PartCategory.objects.filter(is_active=True).values_list("id", "name")
+        )
+        rows = (
+            PartImageGallery.objects.filter(is_published=True)
+            .values_list(*GALLERY_FIELDS)
+            .iterator(chunk_size=5000)
+        )
+        self.load(references, rows, version=get_shared_version(VERSION_KEY))
+
+    def load(self, references, rows, version=None):
+        """
+        Fill a new index with references ((kind, id, name, detail)) and
+        gallery rows ((pk, part name, part number, make, model, category)).
+        Runs without the lock: the index isn't shared until it is swapped in.
+        """
+        started = time.perf_counter()
+        self._clear()
+        self.version = version
+        self._pending = []
+        for kind, pk, name, detail in references:
+            self._add_entry(kind, pk, name, detail, pk)
+        for pk, *row in rows:
+            self._add_row(pk, tuple(row))
+        self._pending.sort()
+        self._keys = [key for key, _ in self._pending]
+        self._key_entries = array("l", (entry for _, entry in self._pending))
+        self._pending = None
+        self.built_at = time.time()
+
+        logger.info(
+            f"Autocomplete index built: {len(self._entries)} entries, {len(self._keys)} keys "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    # ---------------------------------------------------------- maintenance
+
+    def _add_entry(self, kind, identity, label, detail, object_id=0):
+        if self._free:
+            entry = self._free.pop()
+            self._kinds[entry] = KINDS.index(kind)
+            self._object_ids[entry] = object_id
+            self._weights[entry] = self._counts.get((kind, identity), 0)
+            self._labels[entry] = label
+            self._details[entry] = detail
+        else:
+            entry = len(self._labels)
+            self._kinds.append(KINDS.index(kind))
+            self._object_ids.append(object_id)
+            self._weights.append(self._counts.get((kind, identity), 0))
+            self._labels.append(label)
+            self._details.append(detail)
+        self._entries[(kind, identity)] = entry
+
+        for key in search_keys(kind, identity, label):
+            if self._pending is not None:
+                self._pending.append((key, entry))
+                continue
+            i = bisect_left(self._keys, key)
+            self._keys.insert(i, key)
+            self._key_entries.insert(i, entry)
+            self._forget_prefixes(key)
+
+    def _remove_entry(self, kind, identity):
+        entry = self._entries.pop((kind, identity), None)
+        if entry is None:
+            return
+        for key in search_keys(kind, identity, self._labels[entry]):
+            i = bisect_left(self._keys, key)
+            while i < len(self._keys) and self._keys[i] == key:
+                if self._key_entries[i] == entry:
+                    del self._keys[i]
+                    del self._key_entries[i]
+                    break
+                i += 1
+            self._forget_prefixes(key)
+        self._kinds[entry] = -1
+        self._labels[entry] = self._details[entry] = None
+        self._free.append(entry)
+
+    def _forget_prefixes(self, key):
+        if self._hot:
+            for end in range(1, len(key) + 1):
+                self._hot.pop(key[:end], None)
+
+    def _count(self, kind, identity, delta, label=None, detail=None):
+        counter = (kind, identity)
+        count = self._counts.get(counter, 0) + delta
+        if count > 0:
+            self._counts[counter] = count
+        else:
+            self._counts.pop(counter, None)
+
+        entry = self._entries.get(counter)
+        if entry is None:
+            if count > 0 and kind not in REFERENCE_KINDS:
+                self._add_entry(kind, identity, label, detail)
+        elif count <= 0 and kind not in REFERENCE_KINDS:
+            self._remove_entry(kind, identity)
+        else:
+            self._weights[entry] = max(count, 0)
+            if self._hot:
+                for key in search_keys(kind, identity, self._labels[entry]):
+                    self._forget_prefixes(key)
+
+    def _add_row(self, pk, row):
+        self._rows[pk] = row
+        self._adjust_row(row, 1)
+
+    def _remove_row(self, pk):
+        row = self._rows.pop(pk, None)
+        if row is not None:
+            self._adjust_row(row, -1)
+
+    def _adjust_row(self, row, delta):
+        part_name, part_number, make, vehicle_model, category = row
+        for kind, pk in (("manufacturer", make), ("model", vehicle_model), ("category", category)):
+            if pk is not None:
+                self._count(kind, pk, delta)
+        name = normalize_text(part_name)
+        if name:
+            self._count("part", name, delta, part_name)
+        number = normalize_part_number(part_number)
+        if number:
+            self._count("part_number", number, delta, part_number, part_name)
+
+    def update_gallery(self, pk, row, visible):
+        """Apply one saved or deleted gallery (visible=False removes it)"""
+        with self._lock:
+            if self._rows.get(pk) == row and visible:
+                return
+            self._remove_row(pk)
+            if visible:
+                self._add_row(pk, row)
+
+    def update_reference(self, kind, pk, name, detail, visible):
+        """Apply one saved or deleted manufacturer, model or category"""
+        with self._lock:
+            entry = self._entries.get((kind, pk))
+            if (
+                visible
+                and entry is not None
+                and self._labels[entry] == name
+                and self._details[entry] == detail
+            ):
+                return
+            self._remove_entry(kind, pk)
+            if visible:
+                self._add_entry(kind, pk, name, detail, pk)
+
+    # ---------------------------------------------------------------- reads
+
+    def suggest(self, query, limit=10, kinds=None):
+        """
+        Up to limit suggestions for query, most popular first. kinds
+        optionally restricts the result to a subset of KINDS.
+        """
+        limit = max(1, min(limit, MAX_LIMIT))
+        kinds = frozenset(kinds) if kinds else None
+        prefixes = []
+        text = normalize_text(query)
+        if text:
+            prefixes.append(text)
+        number = normalize_part_number(query).lower()
+        if number and (kinds is None or "part_number" in kinds):
+            prefixes.append(NUMBER_PREFIX + number)
+
+        with self._lock:
+            candidates = set()
+            for prefix in prefixes:
+                candidates.update(self._top(prefix, kinds))
+            return [self._suggestion(entry) for entry in self._rank(candidates, kinds)[:limit]]
+
+    def _top(self, prefix, kinds):
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff", lo)
+        if hi - lo <= SCAN_LIMIT:
+            return self._rank(set(self._key_entries[lo:hi]), kinds)
+
+        cached = self._hot.setdefault(prefix, {})
+        if kinds not in cached:
+            if len(self._hot) > MAX_HOT_PREFIXES:
+                self._hot = {prefix: cached}
+            cached[kinds] = self._rank(set(self._key_entries[lo:hi]), kinds)
+        return cached[kinds]
+
+    def _rank(self, entries, kinds):
+        allowed = None if kinds is None else {KINDS.index(kind) for kind in kinds}
+        if allowed is not None:
+            entries = [entry for entry in entries if self._kinds[entry] in allowed]
+        weights, labels = self._weights, self._labels
+        return heapq.nsmallest(
+            MAX_LIMIT,
+            entries,
+            key=lambda entry: (-weights[entry], len(labels[entry]), labels[entry]),
+        )
+
+    def _suggestion(self, entry):
+        kind = KINDS[self._kinds[entry]]
+        return {
+            "type": kind,
+            "id": self._object_ids[entry] if kind in REFERENCE_KINDS else None,
+            "label": self._labels[entry],
+            "detail": self._details[entry],
+            "count": self._weights[entry],
+        }
+
+    def get_stats(self):
+        with self._lock:
+            by_kind = dict.fromkeys(KINDS, 0)
+            for kind, _ in self._entries:
+                by_kind[kind] += 1
+            return {
+                "entries": len(self._entries),
+                "keys": len(self._keys),
+                "by_kind": by_kind,
+                "galleries": len(self._rows),
+                "hot_prefixes": len(self._hot),
+                "version": self.version,
+                "built_at": self.built_at,
+                "pid": os.getpid(),
+            }
+
+
+# ============================================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================================
+
+_index = None
+_index_pid = None
+_index_lock = threading.Lock()
+_last_version_check = 0.0
+_rebuilding = False
+
+
+def bump_autocomplete_version():
+    """For bulk writes that skip signals (imports, generate_catalog)"""
+    return bump_shared_version(VERSION_KEY)
+
+
+def get_autocomplete_index():
+    """
+    Return this process's index, building it on first use (or after fork)
+    and rebuilding when another process has changed the data
+    """
+    global _index, _index_pid, _last_version_check, _rebuilding
+
+    pid = os.getpid()
+    if _index is None or _index_pid != pid:
+        with _index_lock:
+            if _index is None or _index_pid != pid:
+                index = AutocompleteIndex()
+                index.build()
+                _index, _index_pid = index, pid
+                _last_version_check = time.monotonic()
+                _rebuilding = False  # a rebuild thread doesn't survive fork
+        return _index
+
+    interval = getattr(settings, "AUTOCOMPLETE_VERSION_CHECK_INTERVAL", 5)
+    max_age = getattr(settings, "AUTOCOMPLETE_MAX_AGE", 600)
+    now = time.monotonic()
+    if now - _last_version_check >= interval:
+        _last_version_check = now
+        stale = time.time() - (_index.built_at or 0) > max_age
+        if stale or get_shared_version(VERSION_KEY) != _index.version:
+            _start_rebuild()
+    return _index
+
+
+def _start_rebuild():
+    global _rebuilding
+    with _index_lock:
+        if _rebuilding:
+            return
+        _rebuilding = True
+    threading.Thread(target=_rebuild, name="autocomplete-rebuild", daemon=True).start()
+
+
+def _rebuild():
+    """Build a fresh index off the request path and swap it in"""
+    global _index, _rebuilding
+    try:
+        index = AutocompleteIndex()
+        index.build()
+        _index = index
+    except Exception as e:
+        logger.error(f"Autocomplete index rebuild failed: {e}", exc_info=True)
+    finally:
+        _rebuilding = False
+        connections.close_all()
+
+
+def _apply_locally(change):
+    """Bump the shared version and run change() on this process's index"""
+    version = bump_autocomplete_version()
+    index = _index
+    if index is None or _index_pid != os.getpid():
+        return
+    with index._lock:
+        in_sync = index.version is not None and version == index.version + 1
+        change(index)
+        if in_sync:
+            index.version = version
+
+
+def apply_gallery_change(instance, visible):
+    """Signal hook for saved/deleted galleries"""
+    pk = instance.pk
+    row = (
+        instance.part_name,
+        instance.part_number,
+        instance.manufacturer_id,
+        instance.model_id,
+        instance.part_category_id,
+    )
+    # After commit, so a rolled-back save never reaches the index
+    transaction.on_commit(
+        lambda: _apply_locally(lambda index: index.update_gallery(pk, row, visible))
+    )
+
+
+def apply_reference_change(kind, instance, visible):
+    """Signal hook for Manufacturer / VehicleModel / PartCategory changes"""
+    pk, name = instance.pk, instance.name
+    detail = instance.manufacturer.name if visible and kind == "model" else None
+    transaction.on_commit(
+        lambda: _apply_locally(lambda index: index.update_reference(kind, pk, name, detail, visible))
+    )
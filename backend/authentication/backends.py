@@ -0,0 +1,35 @@
+# authentication/backends.py
+"""
+Email + password login in one query.
+
+    authenticate(request, email="user@example.com", password="...")
+
+Looks the user up by auth_user.email (indexed in migration 0013) and loads
+the profile in the same query, so the login response can serialize it
+without another round trip. Calls without email= (the admin's username
+login) fall through to ModelBackend.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class EmailBackend(ModelBackend):
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+        user = (
+            UserModel._default_manager.select_related("profile")
+            .filter(email=email.lower())
+            .order_by("pk")
+            .first()
+        )
+        if user is None:
+            # Hash anyway so unknown emails take as long as wrong passwords
+            UserModel().set_password(password)
+            return None
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+        return None
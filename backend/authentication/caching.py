@@ -0,0 +1,443 @@
+# authentication/caching.py
+"""
+Cache-aside helpers for API responses.
+
+    @api_view(["GET"])
+    @permission_classes([AllowAny])
+    @cached_response("manufacturers", group="reference")
+    def get_manufacturers(request): ...
+
+Works on function views and ViewSet actions alike. The key is built from
+the view namespace, the URL kwargs and the normalized query string, plus a
+per-group version number; bumping the version (see signals.py) invalidates
+every entry in the group without having to know the keys.
+
+Each entry is stored with a soft expiry. Once it passes, the first request to
+take the per-key lock recomputes while concurrent requests keep serving the
+stale copy, so an expiring entry never sends a burst of identical queries to
+the database. A cold miss waits briefly on the same lock for the same reason.
+
+Uses whatever backend settings.CACHES["default"] points at (LocMemCache by
+default, Redis in production).
+
+Both decorators also accept async function views (returning JsonResponse),
+sharing entries and versions with the sync ones through the async cache API.
+
+conditional_response() adds HTTP validators on top: a weak ETag built from
+the same group versions (plus, for ViewSets, MAX(updated_at)/COUNT(*) of the
+filtered queryset) answers If-None-Match with 304 before the view runs, and
+Cache-Control lets nginx and browsers reuse responses while revalidating.
+
+With read replicas, whatever is stored for every client comes from the
+primary: cache recomputes always, and ETag validators and the bodies they
+describe while a group was bumped less than DATABASE_REPLICA_STICKY_SECONDS
+ago (a replica may not have the change yet).
+"""
+
+import asyncio
+import functools
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .replicas import primary_reads, replica_aliases
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "apicache"
+DEFAULT_TIMEOUT = getattr(settings, "API_CACHE_TIMEOUT", 60 * 15)
+STALE_GRACE = getattr(settings, "API_CACHE_STALE_GRACE", 60)
+LOCK_TIMEOUT = getattr(settings, "API_CACHE_LOCK_TIMEOUT", 10)
+LOCK_WAIT = 0.05
+LOCK_MAX_WAIT = 2.0
+HTTP_MAX_AGE = getattr(settings, "API_HTTP_MAX_AGE", 60)
+HTTP_STALE_WHILE_REVALIDATE = getattr(settings, "API_HTTP_STALE_WHILE_REVALIDATE", 600)
+
+
+# ============================================================================
+# STATS
+# ============================================================================
+
+_stats_lock = threading.Lock()
+_stats = defaultdict(lambda: {"hits": 0, "stale_hits": 0, "misses": 0, "recomputes": 0})
+
+
+def _count(namespace, field):
+    with _stats_lock:
+        _stats[namespace][field] += 1
+
+
+def get_cache_stats():
+    """Per-namespace hit/miss counters for this process"""
+    with _stats_lock:
+        stats = {}
+        for namespace, counters in _stats.items():
+            lookups = counters["hits"] + counters["stale_hits"] + counters["misses"]
+            stats[namespace] = dict(
+                counters,
+                hit_rate=round((counters["hits"] + counters["stale_hits"]) / lookups, 4) if lookups else None,
+            )
+        return stats
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+# ============================================================================
+# VERSIONING
+# ============================================================================
+
+def _version_key(group):
+    return f"{KEY_PREFIX}:version:{group}"
+
+
+def _bumped_key(group):
+    return f"{KEY_PREFIX}:bumped:{group}"
+
+
+def _lag_window():
+    return getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 5)
+
+
+def get_group_version(group):
+    version = cache.get(_version_key(group))
+    if version is None:
+        cache.add(_version_key(group), 1, None)
+        version = cache.get(_version_key(group), 1)
+    return version
+
+
+async def aget_group_version(group):
+    version = await cache.aget(_version_key(group))
+    if version is None:
+        await cache.aadd(_version_key(group), 1, None)
+        version = await cache.aget(_version_key(group), 1)
+    return version
+
+
+def bump_group_version(group):
+    """Invalidate every cached response in group"""
+    try:
+        cache.incr(_version_key(group))
+    except ValueError:
+        cache.set(_version_key(group), get_group_version(group) + 1, None)
+    if replica_aliases():
+        # Marks the replica lag window (see fresh_reads)
+        cache.set(_bumped_key(group), 1, _lag_window())
+
+
+def fresh_reads(groups):
+    """primary_reads() while any of groups was bumped within the replica lag window"""
+    if replica_aliases() and groups and cache.get_many([_bumped_key(group) for group in groups]):
+        return primary_reads()
+    return nullcontext()
+
+
+async def afresh_reads(groups):
+    if replica_aliases() and groups and await cache.aget_many([_bumped_key(group) for group in groups]):
+        return primary_reads()
+    return nullcontext()
+
+
+# ============================================================================
+# KEYS
+# ============================================================================
+
+def normalize_query_params(query_params):
+    """
+    Stable representation of a QueryDict: keys sorted, values sorted,
+    blank values dropped (?a=&b=1 and ?b=1 hit the same entry)
+    """
+    items = []
+    for key in sorted(query_params.keys()):
+        values = sorted(v for v in query_params.getlist(key) if v != "")
+        if values:
+            items.append(f"{key}={','.join(values)}")
+    return "&".join(items)
+
+
+def _query_params(request):
+    # DRF Request or plain HttpRequest (async views)
+    return getattr(request, "query_params", None) or request.GET
+
+
+def build_cache_key(namespace, group, request, view_kwargs, version=None):
+    raw = "|".join([
+        namespace,
+        ",".join(f"{k}={view_kwargs[k]}" for k in sorted(view_kwargs)),
+        normalize_query_params(_query_params(request)),
+    ])
+    digest = hashlib.md5(raw.encode("utf-8")).hexdigest()
+    if version is None:
+        version = get_group_version(group)
+    return f"{KEY_PREFIX}:{group}:v{version}:{namespace}:{digest}"
+
+
+# ============================================================================
+# DECORATOR
+# ============================================================================
+
+def _find_request(args):
+    # function view: (request, ...) / ViewSet action: (self, request, ...)
+    if args and hasattr(args[0], "META"):
+        return args[0]
+    return args[1]
+
+
+def cached_response(namespace, group="default", timeout=None):
+    """
+    Cache successful GET responses of a DRF view or action
+
+    Args:
+        namespace: name used in the key and in get_cache_stats()
+        group: invalidation group (bump_group_version(group) clears it)
+        timeout: seconds before an entry is recomputed (defaults to API_CACHE_TIMEOUT)
+    """
+    soft_timeout = timeout or DEFAULT_TIMEOUT
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            return _async_cached_view(view, namespace, group, soft_timeout)
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            if request.method != "GET" or not getattr(settings, "API_CACHE_ENABLED", True):
+                return view(*args, **kwargs)
+
+            key = build_cache_key(namespace, group, request, kwargs)
+            lock_key = f"{key}:lock"
+            entry = cache.get(key)
+
+            if entry is not None:
+                if entry["expires"] > time.time():
+                    _count(namespace, "hits")
+                    return Response(entry["data"], status=entry["status"])
+                # Stale: one request refreshes, the rest keep serving this copy
+                if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+                    _count(namespace, "stale_hits")
+                    return Response(entry["data"], status=entry["status"])
+            else:
+                _count(namespace, "misses")
+                if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+                    # Someone else is computing it - wait a little for their result
+                    deadline = time.monotonic() + LOCK_MAX_WAIT
+                    while time.monotonic() < deadline:
+                        time.sleep(LOCK_WAIT)
+                        entry = cache.get(key)
+                        if entry is not None:
+                            return Response(entry["data"], status=entry["status"])
+                    return view(*args, **kwargs)
+
+            try:
+                _count(namespace, "recomputes")
+                # Stored for every client, so not from a replica that may lag
+                with primary_reads():
+                    response = view(*args, **kwargs)
+                if getattr(response, "status_code", None) == 200 and hasattr(response, "data"):
+                    cache.set(
+                        key,
+                        {
+                            "data": response.data,
+                            "status": response.status_code,
+                            "expires": time.time() + soft_timeout,
+                        },
+                        soft_timeout + STALE_GRACE,
+                    )
+                return response
+            finally:
+                cache.delete(lock_key)
+
+        return wrapper
+
+    return decorator
+
+
+def _json_response(entry):
+    return JsonResponse(entry["data"], status=entry["status"], safe=False)
+
+
+def _async_cached_view(view, namespace, group, soft_timeout):
+    """cached_response() for an async function view returning JsonResponse"""
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "GET" or not getattr(settings, "API_CACHE_ENABLED", True):
+            return await view(request, *args, **kwargs)
+
+        key = build_cache_key(namespace, group, request, kwargs, await aget_group_version(group))
+        lock_key = f"{key}:lock"
+        entry = await cache.aget(key)
+
+        if entry is not None:
+            if entry["expires"] > time.time():
+                _count(namespace, "hits")
+                return _json_response(entry)
+            if not await cache.aadd(lock_key, 1, LOCK_TIMEOUT):
+                _count(namespace, "stale_hits")
+                return _json_response(entry)
+        else:
+            _count(namespace, "misses")
+            if not await cache.aadd(lock_key, 1, LOCK_TIMEOUT):
+                deadline = time.monotonic() + LOCK_MAX_WAIT
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(LOCK_WAIT)
+                    entry = await cache.aget(key)
+                    if entry is not None:
+                        return _json_response(entry)
+                return await view(request, *args, **kwargs)
+
+        try:
+            _count(namespace, "recomputes")
+            with primary_reads():
+                response = await view(request, *args, **kwargs)
+            if response.status_code == 200:
+                # Stored as data (not bytes) so the sync views can serve it too
+                await cache.aset(
+                    key,
+                    {
+                        "data": json.loads(response.content),
+                        "status": response.status_code,
+                        "expires": time.time() + soft_timeout,
+                    },
+                    soft_timeout + STALE_GRACE,
+                )
+            return response
+        finally:
+            await cache.adelete(lock_key)
+
+    return wrapper
+
+
+# ============================================================================
+# CONDITIONAL GET
+# ============================================================================
+
+def filtered_queryset_validator(view, request, view_kwargs):
+    """
+    MAX(updated_at) and COUNT(*) of the rows a ViewSet list/retrieve would
+    read, after its filter backends (filters, ?search=) have been applied.
+    Uses view.queryset rather than get_queryset() so list-only annotations
+    and prefetches don't make the validator query expensive.
+
+    When a filter backend reads current prices (uses_current_prices(), see
+    pricing.BestPriceFilter), today's date is added as well: a price becoming
+    valid or expiring changes those results without touching updated_at.
+    """
+    queryset = view.filter_queryset(view.queryset.all())
+    lookup = view.lookup_url_kwarg or view.lookup_field
+    if lookup in view_kwargs:
+        queryset = queryset.filter(**{view.lookup_field: view_kwargs[lookup]})
+    stats = queryset.order_by().aggregate(last=Max("updated_at"), total=Count("pk"))
+    last = stats["last"].isoformat() if stats["last"] else ""
+    validator = f"{last}:{stats['total']}"
+    if any(
+        getattr(backend, "uses_current_prices", None) and backend.uses_current_prices(request)
+        for backend in view.filter_backends
+    ):
+        # same "today" as PartPriceQuerySet.current()
+        validator = f"{validator}:{timezone.now().date().isoformat()}"
+    return validator
+
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against etag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional_response(*groups, validator=None):
+    """
+    ETag / If-None-Match and Cache-Control for a DRF GET view or action
+
+    Place it above @cached_response so a matching validator skips the cache
+    lookup as well as the view.
+
+    Args:
+        groups: invalidation groups whose versions go into the ETag
+        validator: optional callable(view, request, view_kwargs) -> str for
+            data that group versions don't track (see filtered_queryset_validator)
+    """
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            if validator is not None:
+                raise TypeError("conditional_response(validator=...) is not supported on async views")
+            return _async_conditional_view(view, groups)
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            request = _find_request(args)
+            if request.method not in ("GET", "HEAD") or not getattr(settings, "API_CONDITIONAL_ENABLED", True):
+                return view(*args, **kwargs)
+
+            parts = [f"{group}={get_group_version(group)}" for group in groups]
+            with fresh_reads(groups):
+                if validator is not None:
+                    parts.append(validator(args[0] if args[0] is not request else None, request, kwargs))
+                etag = _build_etag(request, parts)
+
+                if etag_matches(request.META.get("HTTP_IF_NONE_MATCH"), etag):
+                    response = Response(status=304)
+                else:
+                    response = view(*args, **kwargs)
+                    if getattr(response, "status_code", None) != 200:
+                        return response
+
+            return _add_validators(response, etag)
+
+        return wrapper
+
+    return decorator
+
+
+def _async_conditional_view(view, groups):
+    """conditional_response() for an async function view"""
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD") or not getattr(settings, "API_CONDITIONAL_ENABLED", True):
+            return await view(request, *args, **kwargs)
+
+        etag = _build_etag(request, [f"{group}={await aget_group_version(group)}" for group in groups])
+        if etag_matches(request.META.get("HTTP_IF_NONE_MATCH"), etag):
+            response = HttpResponse(status=304)
+        else:
+            with await afresh_reads(groups):
+                response = await view(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        return _add_validators(response, etag)
+
+    return wrapper
+
+
+def _build_etag(request, parts):
+    raw = "|".join([request.path, normalize_query_params(_query_params(request)), *parts])
+    return f'W/"{hashlib.md5(raw.encode("utf-8")).hexdigest()}"'
+
+
+def _add_validators(response, etag):
+    response["ETag"] = etag
+    response["Cache-Control"] = (
+        f"public, max-age={HTTP_MAX_AGE}, stale-while-revalidate={HTTP_STALE_WHILE_REVALIDATE}"
+    )
+    return response
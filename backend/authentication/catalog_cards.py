@@ -0,0 +1,231 @@
+# authentication/catalog_cards.py
+"""
+Pre-serialized list rows ("catalog cards") for the gallery and parts lists.
+
+A card stores exactly what PartImageGalleryListSerializer or
+PartInventoryListSerializer returns for one published row. The list
+endpoints then read each page with one query, a primary-key join to the
+card table:
+
+    SELECT g.id, g.created_at, g.updated_at, c.payload, c.source_updated_at
+    FROM part_image_galleries g LEFT JOIN part_image_gallery_cards c ON ...
+    WHERE <filters, ?search=> ORDER BY g.created_at DESC LIMIT n
+
+This replaces the FK joins, primary-image subqueries, image count and price
+prefetch that each page used to need. Filtering, search, ordering and
+pagination still run on the source table, so they behave as before.
+
+signals.py schedules a rebuild whenever a row changes, or something it
+displays does (images, prices, manufacturer/model/category names). Rebuilds
+requested during one transaction are collected and run together once it
+commits, in a transaction of their own. Listing never writes: a row
+without a card, or whose card was built from an older updated_at (rows
+written without signals, by import_inventory or generate_catalog), is
+serialized the regular way for that response. rebuild_catalog_cards
+backfills everything, or with --stale only those rows.
+"""
+
+import json
+import logging
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import DatabaseError, transaction
+from django.db.models import Prefetch, Q
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import GalleryCard, PartCard, PartImageGallery, PartInventory, PartPrice
+from .querysets import annotate_image_count, annotate_primary_image
+from .serializers import PartImageGalleryListSerializer, PartInventoryListSerializer, absolute_url
+
+logger = logging.getLogger(__name__)
+
+REBUILD_CHUNK_SIZE = 500
+
+
+def gallery_list_queryset():
+    return (
+        annotate_image_count(annotate_primary_image(PartImageGallery.objects.filter(is_published=True)))
+        .select_related("manufacturer", "model", "part_category")
+        .prefetch_related(
+            Prefetch(
+                "prices",
+                queryset=PartPrice.objects.select_related("manufacturer", "model", "part_category"),
+            )
+        )
+    )
+
+
+def part_list_queryset():
+    return PartInventory.objects.filter(is_published=True).select_related(
+        "manufacturer", "model", "part_category"
+    )
+
+
+# kind -> (card model, source model, published rows ready to serialize, list serializer)
+CARD_SOURCES = {
+    "galleries": (GalleryCard, PartImageGallery, gallery_list_queryset, PartImageGalleryListSerializer),
+    "parts": (PartCard, PartInventory, part_list_queryset, PartInventoryListSerializer),
+}
+
+
+def cards_enabled():
+    return getattr(settings, "CATALOG_CARDS_ENABLED", True)
+
+
+# ============================================================================
+# BUILDING
+# ============================================================================
+
+def serialize_rows(kind, pks):
+    """{pk: (updated_at, list payload)} for the published rows among pks"""
+    _, _, rows, serializer_class = CARD_SOURCES[kind]
+    instances = list(rows().filter(pk__in=pks))
+    data = serializer_class(instances, many=True).data
+    return {
+        instance.pk: (instance.updated_at, json.loads(json.dumps(payload, cls=JSONEncoder)))
+        for instance, payload in zip(instances, data)
+    }
+
+
+def _build_chunk(kind, pks):
+    card_model, source_model, _, _ = CARD_SOURCES[kind]
+    with transaction.atomic():
+        # Row locks make concurrent rebuilds of the same rows wait their turn
+        list(source_model.objects.select_for_update().filter(pk__in=pks).values_list("pk", flat=True))
+        cards = {
+            pk: card_model(pk=pk, payload=payload, source_updated_at=updated_at)
+            for pk, (updated_at, payload) in serialize_rows(kind, pks).items()
+        }
+        # Unpublished or deleted rows simply lose their card
+        card_model.objects.filter(pk__in=pks).delete()
+        card_model.objects.bulk_create(cards.values())
+    return cards
+
+
+def rebuild_cards(kind, pks):
+    """Rebuild the cards of the given rows; returns {pk: card} for published ones"""
+    pks = list(dict.fromkeys(pk for pk in pks if pk is not None))
+    cards = {}
+    for start in range(0, len(pks), REBUILD_CHUNK_SIZE):
+        cards.update(_build_chunk(kind, pks[start:start + REBUILD_CHUNK_SIZE]))
+    return cards
+
+
+class _PendingRebuild:
+    """on_commit callback collecting the rows changed in one transaction"""
+
+    def __init__(self):
+        self.pks = {kind: set() for kind in CARD_SOURCES}
+
+    def __call__(self):
+        for kind, pks in self.pks.items():
+            if not pks:
+                continue
+            try:
+                rebuild_cards(kind, pks)
+            except Exception as e:
+                logger.error(f"Catalog card rebuild failed for {len(pks)} {kind}: {e}", exc_info=True)
+                # A missing card falls back to the serializer; a stale one would be served
+                try:
+                    CARD_SOURCES[kind][0].objects.filter(pk__in=pks).delete()
+                except DatabaseError:
+                    pass
+
+
+def schedule_card_rebuild(kind, pks):
+    """Rebuild these rows' cards after the current transaction commits (now, outside one)"""
+    if not cards_enabled():
+        return
+    pks = {pk for pk in pks if pk is not None}
+    if not pks:
+        return
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        # Join the callback already registered for this transaction, if any
+        for _, callback, *_ in connection.run_on_commit:
+            if isinstance(callback, _PendingRebuild):
+                callback.pks[kind].update(pks)
+                return
+    pending = _PendingRebuild()
+    pending.pks[kind].update(pks)
+    transaction.on_commit(pending)
+
+
+def schedule_reference_rebuild(field, pk):
+    """A manufacturer, model or category changed: rebuild every card that shows it"""
+    if not cards_enabled():
+        return
+    for kind, (_, source_model, _, _) in CARD_SOURCES.items():
+        shown = Q(**{f"{field}_id": pk})
+        if kind == "galleries":
+            shown |= Q(**{f"prices__{field}_id": pk})
+        rows = source_model.objects.filter(shown, card__isnull=False).values_list("pk", flat=True)
+        schedule_card_rebuild(kind, rows.distinct())
+
+
+# ============================================================================
+# SERVING
+# ============================================================================
+
+def card_list_queryset(kind):
+    """Published rows with their card, loading nothing the list doesn't need"""
+    source_model = CARD_SOURCES[kind][1]
+    return (
+        source_model.objects.filter(is_published=True)
+        .select_related("card")
+        .only("id", "created_at", "updated_at", "card__payload", "card__source_updated_at")
+    )
+
+
+def _card(row):
+    try:
+        return row.card
+    except ObjectDoesNotExist:
+        return None
+
+
+def card_payloads(kind, rows, request=None):
+    """List payloads for rows from card_list_queryset(), serializing missing or stale cards"""
+    stale = set()
+    for row in rows:
+        card = _card(row)
+        if card is None or card.source_updated_at != row.updated_at:
+            stale.add(row.pk)
+    fallback = serialize_rows(kind, stale) if stale else {}
+
+    payloads = []
+    for row in rows:
+        if row.pk in stale:
+            if row.pk not in fallback:
+                continue  # unpublished since the page was read
+            payload = fallback[row.pk][1]
+        else:
+            payload = _card(row).payload
+        if kind == "parts" and payload.get("primary_image"):
+            # ImageField output is made absolute per request, as the serializer does
+            payload = {**payload, "primary_image": absolute_url(request, payload["primary_image"])}
+        payloads.append(payload)
+    return payloads
+
+
+class CatalogCardListMixin:
+    """
+    ViewSet list() served from catalog cards (set card_kind). Falls back to
+    the regular serializer path when CATALOG_CARDS_ENABLED is off.
+    """
+
+    card_kind = None
+
+    def list(self, request, *args, **kwargs):
+        if not cards_enabled():
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(card_list_queryset(self.card_kind))
+        page = self.paginate_queryset(queryset)
+        rows = list(queryset) if page is None else page
+        data = card_payloads(self.card_kind, rows, request)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
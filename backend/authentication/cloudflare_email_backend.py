@@ -6,7 +6,13 @@ from django.conf import settings
 logger = logging.getLogger(__name__)
 
 
-def send_email_via_cloudflare(to, subject, html_body, text_body, reply_to=None):
+FROM_ADDRESSES = {
+    "noreply": "Nexxa Auto <noreply@nexxaauto.com>",
+    "info": "Nexxa Auto <info@nexxaauto.com>",
+}
+
+
+def send_email_via_cloudflare(to, subject, html_body, text_body, reply_to=None, from_email="noreply"):
     """
     Send email via Cloudflare Workers
     
@@ -16,40 +22,42 @@ def send_email_via_cloudflare(to, subject, html_body, text_body, reply_to=None):
         html_body: HTML content
         text_body: Plain text content
         reply_to: Optional reply-to address
+        from_email: Either "noreply" or "info" (default: "noreply")
     
     Returns:
         bool: True if successful, False otherwise
     """
     try:
-        # Ensure 'to' is a single email address (Cloudflare Worker expects string)
-        if isinstance(to, list):
-            to = to[0]  # Take first email
+        # The Worker takes one address per request
+        recipients = [to] if isinstance(to, str) else list(to)
         
         # Prepare request data
         data = {
-            'to': to,
+            'from': FROM_ADDRESSES.get(from_email, FROM_ADDRESSES["noreply"]),
             'subject': subject,
             'html': html_body,
             'text': text_body,
         }
+        if reply_to:
+            data['reply_to'] = reply_to
         
-        # Send request to Cloudflare Worker
-        response = requests.post(
-            settings.CLOUDFLARE_WORKER_URL,
-            json=data,
-            headers={
-                'Authorization': f'Bearer {settings.CLOUDFLARE_WORKER_TOKEN}',
-                'Content-Type': 'application/json',
-            },
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            logger.info(f"Email sent successfully to {to} via Cloudflare")
-            return True
-        else:
-            logger.error(f"Cloudflare Worker error: {response.text}")
-            return False
+        for recipient in recipients:
+            # Send request to Cloudflare Worker
+            response = requests.post(
+                settings.CLOUDFLARE_WORKER_URL,
+                json={**data, 'to': recipient},
+                headers={
+                    'Authorization': f'Bearer {settings.CLOUDFLARE_WORKER_TOKEN}',
+                    'Content-Type': 'application/json',
+                },
+                timeout=30
+            )
+            
+            if response.status_code != 200:
+                logger.error(f"Cloudflare Worker error: {response.text}")
+                return False
+            logger.info(f"Email sent successfully to {recipient} via Cloudflare")
+        return True
     
     except Exception as e:
         logger.error(f"Failed to send email via Cloudflare: {str(e)}", exc_info=True)
@@ -0,0 +1,212 @@
+# authentication/derivatives.py
+"""
+Image derivative pipeline for PartImageUpload, ProductImage and PartImage.
+
+When a row is saved with a new image file, schedule_derivatives() queues it
+(after the transaction commits) on a small thread pool. That thread reads
+the original from default storage and hands the bytes to a process pool
+running imaging.render_derivatives(), so decoding and encoding never hold
+the GIL of a request-serving process. Results are written back through
+default storage, and the row gets width, height, file_size and:
+
+    derivatives = {
+        "source": "<image name they were made from>",
+        "formats": {"webp": [[300, "<name>"], [600, "<name>"]], "avif": [...]},
+    }
+
+Rows are updated with QuerySet.update(), so post_save does not fire again.
+Work queued in a process that exits is lost; the generate_image_derivatives
+command picks up anything that was missed.
+"""
+
+import logging
+import multiprocessing
+import os
+import posixpath
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connection, transaction
+
+from .caching import bump_group_version
+from .imaging import render_derivatives, supported_formats
+
+logger = logging.getLogger(__name__)
+
+DERIVATIVE_DIR = "derivatives"
+
+
+def derivative_widths():
+    widths = getattr(settings, "IMAGE_DERIVATIVE_WIDTHS", None) or [600, 1200]
+    return sorted({getattr(settings, "THUMBNAIL_SIZE", 300), *widths})
+
+
+def derivative_formats():
+    return supported_formats(getattr(settings, "IMAGE_DERIVATIVE_FORMATS", ["webp", "avif"]))
+
+
+def derivatives_enabled():
+    return getattr(settings, "IMAGE_DERIVATIVES_ENABLED", True)
+
+
+# ============================================================================
+# URLS
+# ============================================================================
+
+def build_srcset(derivatives, make_url=None):
+    """
+    {"webp": "<url> 300w, <url> 600w", ...} for the stored derivatives;
+    make_url can post-process each storage URL (e.g. make it absolute)
+    """
+    make_url = make_url or (lambda url: url)
+    return {
+        fmt: ", ".join(f"{make_url(default_storage.url(name))} {width}w" for width, name in entries)
+        for fmt, entries in (derivatives or {}).get("formats", {}).items()
+    }
+
+
+def build_derivative_url(derivatives, min_width=0, fmt="webp"):
+    """URL of the smallest derivative at least min_width wide (or the largest one)"""
+    entries = (derivatives or {}).get("formats", {}).get(fmt)
+    if not entries:
+        return None
+    for width, name in entries:
+        if width >= min_width:
+            return default_storage.url(name)
+    return default_storage.url(entries[-1][1])
+
+
+# ============================================================================
+# POOLS
+# ============================================================================
+
+_pools = None
+_pools_pid = None
+_pools_lock = threading.Lock()
+
+
+def get_pools():
+    """
+    (thread pool, process pool) for this process, created on first use.
+
+    Worker processes are spawned rather than forked so they never inherit
+    a gunicorn worker's threads, sockets or database connections.
+    """
+    global _pools, _pools_pid
+
+    pid = os.getpid()
+    if _pools is None or _pools_pid != pid:
+        with _pools_lock:
+            if _pools is None or _pools_pid != pid:
+                processes = getattr(settings, "IMAGE_WORKER_PROCESSES", 2)
+                _pools = (
+                    ThreadPoolExecutor(max_workers=processes, thread_name_prefix="image-derivatives"),
+                    ProcessPoolExecutor(
+                        max_workers=processes, mp_context=multiprocessing.get_context("spawn")
+                    ),
+                )
+                _pools_pid = pid
+    return _pools
+
+
+# ============================================================================
+# PROCESSING
+# ============================================================================
+
+def needs_derivatives(instance):
+    image = instance.image
+    return bool(image and image.name) and (instance.derivatives or {}).get("source") != image.name
+
+
+def derivative_name(source_name, width, fmt):
+    directory, filename = posixpath.split(source_name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, DERIVATIVE_DIR, f"{stem}-{width}w.{fmt}")
+
+
+def delete_derivatives(derivatives):
+    for entries in (derivatives or {}).get("formats", {}).values():
+        for _, name in entries:
+            try:
+                default_storage.delete(name)
+            except Exception as e:
+                logger.warning(f"Could not delete image derivative {name}: {e}")
+
+
+def process_instance(instance, executor=None):
+    """
+    Build and store the derivatives of one row, blocking until done.
+
+    Args:
+        instance: a PartImageUpload, ProductImage or PartImage
+        executor: process pool to render in (defaults to this process's pool)
+    """
+    source_name = instance.image.name
+    with default_storage.open(source_name, "rb") as handle:
+        data = handle.read()
+
+    if executor is None:
+        executor = get_pools()[1]
+    quality = getattr(settings, "IMAGE_COMPRESSION_QUALITY", 85)
+    width, height, outputs = executor.submit(
+        render_derivatives, data, derivative_widths(), derivative_formats(), quality
+    ).result()
+
+    formats = {}
+    for fmt, target, encoded in outputs:
+        name = derivative_name(source_name, target, fmt)
+        if default_storage.exists(name):
+            default_storage.delete(name)
+        formats.setdefault(fmt, []).append([target, default_storage.save(name, ContentFile(encoded))])
+
+    previous = instance.derivatives
+    derivatives = {"source": source_name, "formats": formats}
+    updated = type(instance).objects.filter(pk=instance.pk, image=source_name).update(
+        width=width, height=height, file_size=len(data), derivatives=derivatives
+    )
+    if not updated:
+        # The image was replaced while we worked; its own job will follow
+        delete_derivatives(derivatives)
+        return None
+
+    if previous and previous.get("source") != source_name:
+        delete_derivatives(previous)
+    instance.width, instance.height, instance.file_size = width, height, len(data)
+    instance.derivatives = derivatives
+    on_derivatives_stored(instance)
+    return derivatives
+
+
+def on_derivatives_stored(instance):
+    """Cached gallery responses and gallery cards embed image URLs"""
+    if instance._meta.model_name == "partimageupload":
+        from .catalog_cards import schedule_card_rebuild
+
+        transaction.on_commit(lambda: bump_group_version("galleries"))
+        schedule_card_rebuild("galleries", [instance.gallery_id])
+
+
+def _run_job(model_label, pk):
+    close_old_connections()
+    try:
+        instance = apps.get_model(model_label).objects.filter(pk=pk).first()
+        if instance is not None and needs_derivatives(instance):
+            process_instance(instance)
+    except Exception as e:
+        logger.error(f"Image derivatives failed for {model_label} {pk}: {e}", exc_info=True)
+    finally:
+        # Pool threads outlive requests, so don't keep their connections open
+        connection.close()
+
+
+def schedule_derivatives(instance):
+    """Queue derivative generation for a saved row (runs after commit)"""
+    if not derivatives_enabled() or not needs_derivatives(instance):
+        return
+    label = instance._meta.label
+    pk = instance.pk
+    transaction.on_commit(lambda: get_pools()[0].submit(_run_job, label, pk))
@@ -0,0 +1,180 @@
+# authentication/email_outbox.py
+"""
+DB-backed email outbox.
+
+Request handlers call deliver_email(), which only inserts an EmailJob row
+(or sends inline when EMAIL_OUTBOX_ENABLED is False). The run_email_worker
+management command claims due jobs with SELECT ... FOR UPDATE SKIP LOCKED,
+sends them with bounded concurrency and reschedules failures with
+exponential backoff.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .email_transports import get_transport
+from .models import EmailJob
+
+logger = logging.getLogger(__name__)
+
+
+def deliver_email(to, subject, html_body, text_body, reply_to=None, from_email="noreply", kind=""):
+    """
+    Queue an email for delivery (or send it now when the outbox is disabled)
+
+    Returns:
+        bool: True if queued/sent, False otherwise
+    """
+    if isinstance(to, str):
+        to = [to]
+
+    if from_email not in dict(EmailJob.FROM_CHOICES):
+        # Transports only know these senders; don't queue a job that would go out from another
+        logger.error(f"Refusing to queue {kind or 'email'} for {to}: unknown sender {from_email!r}")
+        return False
+
+    if not getattr(settings, "EMAIL_OUTBOX_ENABLED", True):
+        return get_transport().send(
+            to=to,
+            subject=subject,
+            html_body=html_body,
+            text_body=text_body,
+            reply_to=reply_to,
+            from_email=from_email,
+        )
+
+    try:
+        job = EmailJob.objects.create(
+            kind=kind,
+            to=to,
+            subject=subject[:255],
+            html_body=html_body,
+            text_body=text_body,
+            reply_to=reply_to or "",
+            from_email=from_email,
+            max_attempts=getattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 6),
+        )
+        logger.info(f"Queued {kind or 'email'} job {job.id} for {to}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to queue email for {to}: {str(e)}", exc_info=True)
+        return False
+
+
+def backoff_delay(attempts):
+    """Seconds to wait before the next attempt: base * 2^(attempts-1), capped"""
+    base = getattr(settings, "EMAIL_OUTBOX_BACKOFF_BASE", 30)
+    cap = getattr(settings, "EMAIL_OUTBOX_BACKOFF_MAX", 3600)
+    return min(cap, base * (2 ** max(attempts - 1, 0)))
+
+
+def claim_jobs(batch_size):
+    """
+    Claim up to batch_size due jobs for this worker.
+
+    Rows locked by another worker are skipped, so several workers can run
+    side by side. Jobs stuck in "sending" longer than the lease (crashed
+    worker) become claimable again.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=getattr(settings, "EMAIL_OUTBOX_LEASE_SECONDS", 300))
+
+    with transaction.atomic():
+        jobs = list(
+            EmailJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=EmailJob.STATUS_PENDING, next_attempt_at__lte=now)
+                | Q(status=EmailJob.STATUS_SENDING, locked_at__lt=now - lease)
+            )
+            .order_by("next_attempt_at")[:batch_size]
+        )
+        if not jobs:
+            return []
+
+        EmailJob.objects.filter(pk__in=[job.pk for job in jobs]).update(
+            status=EmailJob.STATUS_SENDING,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+
+    for job in jobs:
+        job.status = EmailJob.STATUS_SENDING
+        job.locked_at = now
+        job.attempts += 1
+    return jobs
+
+
+def send_job(job, transport):
+    """Send one claimed job and record the outcome"""
+    error = ""
+    try:
+        ok = transport.send(
+            to=job.to,
+            subject=job.subject,
+            html_body=job.html_body,
+            text_body=job.text_body,
+            reply_to=job.reply_to or None,
+            from_email=job.from_email,
+        )
+        if not ok:
+            error = f"{transport.name} transport reported failure"
+    except Exception as e:
+        ok = False
+        error = str(e)
+
+    now = timezone.now()
+    if ok:
+        EmailJob.objects.filter(pk=job.pk).update(
+            status=EmailJob.STATUS_SENT, sent_at=now, locked_at=None, last_error="", updated_at=now
+        )
+        logger.info(f"Email job {job.id} sent to {job.to}")
+        return True
+
+    if job.attempts >= job.max_attempts:
+        EmailJob.objects.filter(pk=job.pk).update(
+            status=EmailJob.STATUS_FAILED, locked_at=None, last_error=error, updated_at=now
+        )
+        logger.error(f"Email job {job.id} failed permanently after {job.attempts} attempts: {error}")
+    else:
+        delay = backoff_delay(job.attempts)
+        EmailJob.objects.filter(pk=job.pk).update(
+            status=EmailJob.STATUS_PENDING,
+            locked_at=None,
+            last_error=error,
+            next_attempt_at=now + timedelta(seconds=delay),
+            updated_at=now,
+        )
+        logger.warning(f"Email job {job.id} attempt {job.attempts} failed, retrying in {delay}s: {error}")
+    return False
+
+
+def process_batch(batch_size=20, concurrency=4, transport=None):
+    """
+    Claim and send one batch of jobs
+
+    Returns:
+        tuple: (claimed, sent)
+    """
+    jobs = claim_jobs(batch_size)
+    if not jobs:
+        return 0, 0
+
+    transport = transport or get_transport()
+
+    def send_and_release(job):
+        try:
+            return send_job(job, transport)
+        finally:
+            # pool threads get their own DB connection - don't leak it
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(jobs)))) as pool:
+        results = list(pool.map(send_and_release, jobs))
+    return len(jobs), sum(results)
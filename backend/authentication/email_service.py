@@ -331,8 +331,9 @@ import logging
 import base64
 import resend
 from django.conf import settings
-from django.template.loader import render_to_string
 from django.utils import timezone
+from .email_templates import get_cached_django_template, html_to_text
+from .metrics import observe_outbound
 
 logger = logging.getLogger(__name__)
 
@@ -381,11 +382,10 @@ class InquiryEmailService:
                 'company_name': InquiryEmailService.COMPANY_NAME,
             }
             
-            # Render HTML email template
-            html_content = render_to_string(
-                'emails/inquiry_response.html',
-                context
-            )
+            # Render HTML email template (compiled once per process)
+            html_content = get_cached_django_template(
+                'emails/inquiry_response.html'
+            ).render(context)
             
             # Prepare email parameters for Resend (NO attachments - only inline images)
             params = {
@@ -393,11 +393,13 @@ class InquiryEmailService:
                 "to": [inquiry.email],
                 "subject": subject,
                 "html": html_content,
+                "text": html_to_text(html_content),
                 "reply_to": InquiryEmailService.FROM_EMAIL,
             }
             
             # Send via Resend API
-            email_response = resend.Emails.send(params)
+            with observe_outbound('resend'):
+                email_response = resend.Emails.send(params)
             
             # Check if email was sent successfully
             if email_response and email_response.get('id'):
@@ -592,7 +594,8 @@ class InquiryEmailService:
             }
             
             # Send via Resend
-            email_response = resend.Emails.send(params)
+            with observe_outbound('resend'):
+                email_response = resend.Emails.send(params)
             
             if email_response and email_response.get('id'):
                 logger.info(f"Test email sent successfully to {to_email}")
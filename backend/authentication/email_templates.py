@@ -0,0 +1,383 @@
+# authentication/email_templates.py
+"""
+Precompiled email templates.
+
+Each template is compiled once per process into a list of static chunks
+with empty slots for its placeholders, for the HTML part and for the
+plain-text part. A render copies the two lists, fills the slots and joins
+them; the CSS/header/footer fragments are part of the static chunks and are
+never rebuilt or re-parsed. The plain-text source is derived from the HTML
+once, at compile time.
+
+Placeholders use str.format syntax ({name}). String values are HTML-escaped
+in the HTML part when they contain markup characters; other values (ids,
+numbers) are inserted as str(). Placeholders ending in "_html" take an
+EmailFragment, which carries its own markup and plain text, so nothing is
+parsed per render.
+"""
+
+import html
+import re
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from html.parser import HTMLParser
+from string import Formatter
+
+from django.template.loader import get_template
+
+RAW_SUFFIX = "_html"
+
+# Pre-rendered markup for an "_html" placeholder and its plain-text equivalent
+EmailFragment = namedtuple("EmailFragment", ["html", "text"])
+EMPTY_FRAGMENT = EmailFragment("", "")
+
+
+# ============================================================================
+# HTML -> TEXT
+# ============================================================================
+
+class _TextExtractor(HTMLParser):
+    """Collects visible text, breaking lines on block-level elements"""
+
+    # tag -> newlines it forces around itself (the larger pending break wins)
+    BREAKS = {"br": 1, "div": 1, "li": 1, "tr": 1, "ul": 1, "ol": 1, "table": 1,
+              "p": 2, "h1": 2, "h2": 2, "h3": 2, "h4": 2, "hr": 2}
+    SKIP_TAGS = {"style", "script", "head", "title"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skip = 0
+        self._pending = 0
+
+    def _break(self, count):
+        if self.parts:
+            self._pending = max(self._pending, count)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag == "br":
+            # explicit line breaks accumulate instead of merging
+            self.parts.append("\n" * (self._pending + 1))
+            self._pending = 0
+        elif tag in self.BREAKS:
+            self._break(self.BREAKS[tag])
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self._skip = max(self._skip - 1, 0)
+        elif tag in self.BREAKS:
+            self._break(self.BREAKS[tag])
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        # source newlines are just whitespace in HTML
+        data = data.replace("\n", " ")
+        if not data.strip():
+            if not self._pending and self.parts:
+                self.parts.append(" ")
+            return
+        if self._pending:
+            self.parts.append("\n" * self._pending)
+            self._pending = 0
+        self.parts.append(data)
+
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+
+
+def html_to_text(markup):
+    """Convert an HTML fragment or document to readable plain text"""
+    parser = _TextExtractor()
+    parser.feed(markup)
+    parser.close()
+    lines = [_SPACES.sub(" ", line).strip() for line in "".join(parser.parts).split("\n")]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip() + "\n"
+
+
+# ============================================================================
+# COMPILED TEMPLATE
+# ============================================================================
+
+def _compile(source):
+    """
+    Split a str.format-style source into (literal, field) pairs.
+
+    Literal text keeps its escaped braces resolved; field is None for the
+    trailing literal.
+    """
+    return tuple(
+        (literal, field or None)
+        for literal, field, _spec, _conv in Formatter().parse(source)
+    )
+
+
+def _slotted(source):
+    """(chunks with an empty slot per placeholder, ((slot index, field), ...))"""
+    chunks = []
+    slots = []
+    for literal, field in _compile(source):
+        if literal:
+            chunks.append(literal)
+        if field:
+            slots.append((len(chunks), field))
+            chunks.append("")
+    return chunks, tuple(slots)
+
+
+def _escape(value):
+    """html.escape(quote=False), skipped for the common value without markup characters"""
+    if "&" in value or "<" in value or ">" in value:
+        return html.escape(value, quote=False)
+    return value
+
+
+class EmailTemplate:
+    """
+    An email compiled into static chunks + placeholder slots for HTML and text
+    """
+
+    def __init__(self, name, css, header, body, footer, wrapper_class="container"):
+        self.name = name
+
+        # Static head/header/footer are concatenated once here
+        document = (
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"UTF-8\">\n"
+            "<style>\n" + css.replace("{", "{{").replace("}", "}}") + "\n</style>\n"
+            "</head>\n<body>\n"
+            f'<div class="{wrapper_class}">\n'
+            f'<div class="header">\n{header}\n</div>\n'
+            f'<div class="content">\n{body}\n</div>\n'
+            f'<div class="footer">\n{footer}\n</div>\n'
+            "</div>\n</body>\n</html>\n"
+        )
+        self._html, self._html_slots = _slotted(document)
+
+        # Plain-text alternative: convert the markup with placeholders intact
+        self._text, self._text_slots = _slotted(html_to_text(f"{header}\n{body}\n<hr>\n{footer}"))
+
+        fields = {field for _, field in self._html_slots}
+        self.fields = frozenset(fields)
+        self._value_fields = tuple(sorted(f for f in fields if not f.endswith(RAW_SUFFIX)))
+        self._fragment_fields = tuple(sorted(f for f in fields if f.endswith(RAW_SUFFIX)))
+
+    def render(self, context):
+        """
+        Render the HTML and text parts
+
+        Returns:
+            tuple: (html_body, text_body)
+        """
+        escaped = {}
+        plain = {}
+        for key in self._value_fields:
+            value = context.get(key)
+            if value is None:
+                escaped[key] = plain[key] = ""
+            elif isinstance(value, str):
+                plain[key] = value
+                escaped[key] = _escape(value)
+            else:
+                escaped[key] = plain[key] = str(value)
+        for key in self._fragment_fields:
+            fragment = context.get(key) or EMPTY_FRAGMENT
+            if isinstance(fragment, str):
+                # Bare markup: convert it (slow path, nothing in this app passes one)
+                fragment = EmailFragment(fragment, html_to_text(fragment).strip())
+            escaped[key], plain[key] = fragment
+
+        html_chunks = self._html[:]
+        for index, key in self._html_slots:
+            html_chunks[index] = escaped[key]
+        text_chunks = self._text[:]
+        for index, key in self._text_slots:
+            text_chunks[index] = plain[key]
+        return "".join(html_chunks), "".join(text_chunks)
+
+
+# ============================================================================
+# SHARED FRAGMENTS
+# ============================================================================
+
+SIMPLE_CSS = """
+body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+.container { max-width: 600px; margin: 0 auto; padding: 20px; }
+.header { background-color: #dc2626; color: white; padding: 20px; text-align: center; }
+.content { background-color: #f9f9f9; padding: 20px; border: 1px solid #ddd; }
+.footer { text-align: center; padding: 20px; color: #777; font-size: 12px; }
+"""
+
+GRADIENT_CSS = """
+body { font-family: 'Helvetica Neue', Arial, sans-serif; line-height: 1.6; color: #2c3e50; background-color: #f4f6f9; margin: 0; padding: 0; }
+.email-wrapper { max-width: 650px; margin: 30px auto; background: #ffffff; border-radius: 12px; overflow: hidden; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }
+.header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 40px 30px; text-align: center; }
+.header h1 { margin: 0 0 10px 0; font-size: 28px; font-weight: 600; }
+.content { padding: 35px 30px; }
+.footer { background: #f8f9fa; text-align: center; padding: 25px; border-top: 1px solid #e9ecef; }
+"""
+
+AUTOMATED_FOOTER = """
+<p>This is an automated confirmation email.</p>
+<p>&copy; 2024 Nexxa Auto Parts. All rights reserved.</p>
+"""
+
+
+# ============================================================================
+# TEMPLATE DEFINITIONS
+# ============================================================================
+
+TEMPLATE_SOURCES = {
+    "contact_notification": {
+        "css": SIMPLE_CSS + """
+.field { margin-bottom: 15px; }
+.label { font-weight: bold; color: #555; }
+.value { margin-top: 5px; padding: 10px; background-color: white; border-left: 3px solid #dc2626; }
+.message-box { background-color: white; padding: 15px; border: 1px solid #ddd; min-height: 100px; white-space: pre-wrap; }
+""",
+        "header": "<h1>New Contact Form Submission</h1>\n<p>Nexxa Auto Parts</p>",
+        "body": """
+<div class="field"><div class="label">📧 Email:</div><div class="value">{email}</div></div>
+<div class="field"><div class="label">👤 Name:</div><div class="value">{name}</div></div>
+<div class="field"><div class="label">📋 Subject:</div><div class="value">{subject}</div></div>
+<div class="field"><div class="label">📱 Phone:</div><div class="value">{phone}</div></div>
+<div class="field"><div class="label">💬 Message:</div><div class="message-box">{message}</div></div>
+<div class="field"><div class="label">🕐 Submitted:</div><div class="value">{submitted}</div></div>
+<div class="field"><div class="label">🌐 IP Address:</div><div class="value">{ip_address}</div></div>
+<div class="field"><div class="label">🆔 Submission ID:</div><div class="value">{submission_id}</div></div>
+""",
+        "footer": """
+<p>This is an automated notification from your Nexxa Auto Parts contact form.</p>
+<p>Please respond to: {email}</p>
+""",
+    },
+    "contact_auto_reply": {
+        "css": SIMPLE_CSS + """
+.header { padding: 30px; }
+.content { padding: 30px; }
+.highlight { background-color: #fff; padding: 15px; border-left: 4px solid #dc2626; margin: 20px 0; }
+""",
+        "header": "<h1>Thank You for Contacting Us!</h1>\n<p>Nexxa Auto Parts</p>",
+        "body": """
+<p>Hi {name},</p>
+<p>Thank you for reaching out to <strong>Nexxa Auto Parts</strong>!</p>
+<p>We have received your message and our team will review it shortly. We typically respond within 2-45 mins during business days.</p>
+<div class="highlight">
+<strong>Your Message Summary:</strong><br>
+<strong>Subject:</strong> {subject}<br>
+<strong>Reference ID:</strong> {reference}
+</div>
+<p>If you have any urgent concerns, please feel free to call us or send another message.</p>
+<p>Best regards,<br><strong>Nexxa Auto Parts Team</strong></p>
+""",
+        "footer": AUTOMATED_FOOTER,
+    },
+    "parts_inquiry_notification": {
+        "css": GRADIENT_CSS + """
+.vehicle-banner { background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%); padding: 25px; border-radius: 10px; margin-bottom: 30px; border-left: 5px solid #667eea; }
+.vehicle-banner h2 { margin: 0 0 15px 0; color: #667eea; font-size: 24px; }
+.info-card { background: #f8f9fa; padding: 15px 20px; border-radius: 8px; margin-bottom: 12px; border: 1px solid #e9ecef; }
+""",
+        "wrapper_class": "email-wrapper",
+        "header": "<h1>🚗 New Parts Request</h1>\n<p>Nexxa Auto Parts</p>",
+        "body": """
+<div class="vehicle-banner">
+<h2>Vehicle Information</h2>
+<p><strong>Year:</strong> {year}</p>
+<p><strong>Manufacturer:</strong> {manufacturer}</p>
+<p><strong>Model:</strong> {model}</p>
+<p><strong>Part Category:</strong> {part_category}</p>
+</div>
+<h3>Customer Information</h3>
+<div class="info-card">
+<p><strong>👤 Name:</strong> {name}</p>
+<p><strong>📧 Email:</strong> {email}</p>
+<p><strong>📱 Phone:</strong> {phone}</p>
+</div>
+{parts_needed_html}
+<div class="info-card">
+<p><strong>🕐 Submitted:</strong> {submitted}</p>
+<p><strong>🆔 Request ID:</strong> {inquiry_id}</p>
+</div>
+""",
+        "footer": """
+<p><strong>Reply to:</strong> {email}</p>
+<p>REF: {reference}</p>
+""",
+    },
+    "parts_inquiry_auto_reply": {
+        "css": GRADIENT_CSS + """
+.header { padding: 50px 30px; }
+.header h1 { margin: 0 0 15px 0; font-size: 32px; }
+.content { padding: 40px 35px; }
+.highlight-box { background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%); padding: 25px; border-radius: 10px; margin: 30px 0; border-left: 5px solid #667eea; }
+.reference-box { background: #fff3cd; border: 2px dashed #ffc107; padding: 20px; border-radius: 10px; text-align: center; margin: 25px 0; }
+.reference-box strong { font-size: 18px; color: #856404; font-family: monospace; }
+.footer { padding: 30px; }
+""",
+        "wrapper_class": "email-wrapper",
+        "header": "<h1>✅ Request Received!</h1>\n<p>We're finding the best parts for your vehicle</p>",
+        "body": """
+<p>Hi <strong>{name}</strong>,</p>
+<p>Thank you for choosing <strong>Nexxa Auto Parts</strong>! We've received your parts request and our team is already working on finding the perfect match for your vehicle.</p>
+<div class="highlight-box">
+<h3>📋 Your Request Summary</h3>
+<p><strong>Vehicle:</strong> {vehicle}</p>
+<p><strong>Part Category:</strong> {part_category}</p>
+<p><strong>Submitted:</strong> {submitted}</p>
+</div>
+<div class="reference-box">
+<p style="margin: 0 0 10px 0; color: #856404;">Your Reference Number</p>
+<strong>{reference}</strong>
+<p style="margin: 10px 0 0 0; font-size: 12px; color: #856404;">Please save this for future reference</p>
+</div>
+<p><strong>What happens next?</strong></p>
+<p>Our parts specialists will check availability and pricing for your {vehicle}. We'll send you a detailed quote within 2-45 mins.</p>
+<p>Need to add something or have questions? Just reply to this email!</p>
+<p style="margin-top: 30px;">Best regards,<br><strong>The Nexxa Auto Parts Team</strong></p>
+""",
+        "footer": AUTOMATED_FOOTER,
+    },
+}
+
+
+_compiled = {}
+_compile_lock = threading.Lock()
+
+
+def get_email_template(name):
+    """
+    Return the compiled template for name, compiling it on first use
+
+    Raises:
+        KeyError: unknown template name
+    """
+    template = _compiled.get(name)
+    if template is None:
+        with _compile_lock:
+            template = _compiled.get(name)
+            if template is None:
+                template = EmailTemplate(name, **TEMPLATE_SOURCES[name])
+                _compiled[name] = template
+    return template
+
+
+def render_email(name, context):
+    """
+    Render a registered email template
+
+    Returns:
+        tuple: (html_body, text_body)
+    """
+    return get_email_template(name).render(context)
+
+
+@lru_cache(maxsize=None)
+def get_cached_django_template(template_name):
+    """
+    Load a Django template once per process (skips loader lookup on each send)
+    """
+    return get_template(template_name)
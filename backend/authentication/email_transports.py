@@ -0,0 +1,129 @@
+# authentication/email_transports.py
+"""
+Pluggable email transports.
+
+Every transport exposes the same interface:
+
+    transport.send(to, subject, html_body, text_body, reply_to=None, from_email="noreply") -> bool
+
+Select one with settings.EMAIL_TRANSPORT ("resend", "cloudflare", "console", "file").
+"""
+
+import json
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class EmailTransport:
+    """Base class - subclasses implement send()"""
+
+    name = "base"
+
+    def send(self, to, subject, html_body, text_body, reply_to=None, from_email="noreply"):
+        raise NotImplementedError
+
+
+class ResendTransport(EmailTransport):
+    """Deliver through the Resend API"""
+
+    name = "resend"
+
+    def send(self, to, subject, html_body, text_body, reply_to=None, from_email="noreply"):
+        from .resend_email_backend import send_email_via_resend
+
+        return send_email_via_resend(
+            to=to,
+            subject=subject,
+            html_body=html_body,
+            text_body=text_body,
+            reply_to=reply_to,
+            from_email=from_email,
+        )
+
+
+class CloudflareTransport(EmailTransport):
+    """Deliver through the Cloudflare email worker"""
+
+    name = "cloudflare"
+
+    def send(self, to, subject, html_body, text_body, reply_to=None, from_email="noreply"):
+        from .cloudflare_email_backend import send_email_via_cloudflare
+
+        return send_email_via_cloudflare(
+            to=to,
+            subject=subject,
+            html_body=html_body,
+            text_body=text_body,
+            reply_to=reply_to,
+            from_email=from_email,
+        )
+
+
+class ConsoleTransport(EmailTransport):
+    """Log the message instead of sending it (development)"""
+
+    name = "console"
+
+    def send(self, to, subject, html_body, text_body, reply_to=None, from_email="noreply"):
+        logger.info(
+            f"[console email] from={from_email} to={to} reply_to={reply_to} subject={subject}\n{text_body}"
+        )
+        return True
+
+
+class FileTransport(EmailTransport):
+    """Append each message as one JSON line to EMAIL_FILE_PATH (tests)"""
+
+    name = "file"
+    _lock = threading.Lock()
+
+    def __init__(self, path=None):
+        self.path = path or getattr(
+            settings, "EMAIL_FILE_PATH", os.path.join(settings.BASE_DIR, "sent_emails.jsonl")
+        )
+
+    def send(self, to, subject, html_body, text_body, reply_to=None, from_email="noreply"):
+        record = {
+            "to": [to] if isinstance(to, str) else list(to),
+            "subject": subject,
+            "html": html_body,
+            "text": text_body,
+            "reply_to": reply_to,
+            "from": from_email,
+            "written_at": timezone.now().isoformat(),
+        }
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record) + "\n")
+            return True
+        except OSError as e:
+            logger.error(f"Failed to write email to {self.path}: {str(e)}")
+            return False
+
+
+TRANSPORTS = {
+    ResendTransport.name: ResendTransport,
+    CloudflareTransport.name: CloudflareTransport,
+    ConsoleTransport.name: ConsoleTransport,
+    FileTransport.name: FileTransport,
+}
+
+
+def get_transport(name=None):
+    """
+    Return a transport instance by name (defaults to settings.EMAIL_TRANSPORT)
+
+    Raises:
+        ValueError: unknown transport name
+    """
+    name = name or getattr(settings, "EMAIL_TRANSPORT", "resend")
+    try:
+        return TRANSPORTS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown email transport: {name}")
@@ -0,0 +1,373 @@
+# authentication/exports.py
+"""
+Streaming catalog export for marketplace feeds.
+
+    for chunk in iter_export("galleries", "merchant", base_url, updated_since):
+        ...
+
+Rows are read as values_list() tuples in keyset pages of EXPORT_CHUNK_SIZE
+(WHERE id > last id ORDER BY id LIMIT n), so neither model instances nor
+the full result set are held in memory; MySQL drivers buffer a whole result
+set, which rules out .iterator(). Output is yielded in chunks of
+EXPORT_FLUSH_ROWS rows, so memory use is the same for ten rows or ten
+million. gzip_chunks() compresses the stream as it goes.
+
+Sources:
+    galleries   published PartImageGallery rows (the product pages), priced
+                from their lowest current PartPrice total (active and
+                valid today, price + core charge + shipping)
+    parts       published PartInventory rows with their own price and stock
+
+Formats: csv, ndjson, merchant (Google Merchant RSS 2.0 feed).
+"""
+
+import csv
+import json
+import zlib
+from datetime import datetime, time
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db.models import Exists, F, OuterRef, Subquery
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import PartImageGallery, PartImageUpload, PartInventory, PartPrice
+
+EXPORT_CHUNK_SIZE = getattr(settings, "CATALOG_EXPORT_CHUNK_SIZE", 2000)
+EXPORT_FLUSH_ROWS = 500
+GZIP_LEVEL = 6
+
+COLUMNS = [
+    "id",
+    "title",
+    "description",
+    "link",
+    "image_link",
+    "price",
+    "currency",
+    "availability",
+    "condition",
+    "brand",
+    "model",
+    "year",
+    "product_type",
+    "mpn",
+    "updated_at",
+]
+
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+    "merchant": "application/xml",
+}
+
+FILE_EXTENSIONS = {"csv": "csv", "ndjson": "ndjson", "merchant": "xml"}
+
+# Google Merchant only knows new / used / refurbished
+MERCHANT_CONDITIONS = {"new": "new", "refurbished": "refurbished", "oem": "new"}
+
+MERCHANT_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<rss version="2.0" xmlns:g="http://base.google.com/ns/1.0">\n'
+    "<channel>\n"
+    "<title>Nexxa Auto Parts</title>\n"
+    "<link>{base_url}</link>\n"
+    "<description>Used OEM auto parts catalog</description>\n"
+)
+MERCHANT_FOOTER = "</channel>\n</rss>\n"
+
+
+# ============================================================================
+# SOURCES
+# ============================================================================
+
+def _primary_image(galleries_field):
+    """Subqueries for the primary upload (URL and stored file) of a gallery"""
+    uploads = PartImageUpload.objects.filter(gallery=OuterRef(galleries_field)).order_by(
+        "-is_primary", "display_order", "uploaded_at"
+    )
+    return Subquery(uploads.values("image_url")[:1]), Subquery(uploads.values("image")[:1])
+
+
+def _gallery_rows(updated_since):
+    # Current prices only, ranked by total the way the API's best_price is
+    prices = PartPrice.objects.current().with_totals().filter(gallery_reference=OuterRef("pk"))
+    image_url, image_file = _primary_image("pk")
+    galleries = (
+        PartImageGallery.objects.filter(is_published=True)
+        .exclude(slug="")
+        .with_best_price()
+        .annotate(
+            best_condition=Subquery(prices.order_by("annotated_total").values("condition")[:1]),
+            in_stock=Exists(prices.filter(in_stock=True)),
+            image_url=image_url,
+            image_file=image_file,
+        )
+    )
+    if updated_since:
+        galleries = galleries.filter(updated_at__gte=updated_since)
+    return galleries.order_by("pk").values_list(
+        "id",
+        "slug",
+        "part_name",
+        "description",
+        "year",
+        "manufacturer__name",
+        "model__name",
+        "part_category__name",
+        "part_number",
+        "best_price",
+        "best_condition",
+        "in_stock",
+        "image_url",
+        "image_file",
+        "updated_at",
+    )
+
+
+def _part_rows(updated_since):
+    image_url, image_file = _primary_image("gallery_reference")
+    parts = (
+        PartInventory.objects.filter(is_published=True)
+        .annotate(
+            image_url=image_url,
+            image_file=image_file,
+            gallery_slug=F("gallery_reference__slug"),
+        )
+    )
+    if updated_since:
+        parts = parts.filter(updated_at__gte=updated_since)
+    return parts.order_by("pk").values_list(
+        "id",
+        "gallery_slug",
+        "gallery_reference_id",
+        "part_name",
+        "description",
+        "year",
+        "manufacturer__name",
+        "model__name",
+        "part_category__name",
+        "part_number",
+        "price",
+        "condition",
+        "stock_quantity",
+        "primary_image",
+        "image_url",
+        "image_file",
+        "updated_at",
+    )
+
+
+def _keyset_pages(rows):
+    """Iterate a pk-ordered values_list() (pk first) one EXPORT_CHUNK_SIZE page at a time"""
+    last_pk = None
+    while True:
+        page = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+        batch = list(page[:EXPORT_CHUNK_SIZE])
+        yield from batch
+        if len(batch) < EXPORT_CHUNK_SIZE:
+            return
+        last_pk = batch[-1][0]
+
+
+def _image_link(base_url, *candidates):
+    for value in candidates:
+        if not value:
+            continue
+        if str(value).startswith(("http://", "https://")):
+            return value
+        url = default_storage.url(value)
+        return url if url.startswith("http") else f"{base_url}{url}"
+    return ""
+
+
+def iter_gallery_records(base_url, updated_since=None):
+    rows = _keyset_pages(_gallery_rows(updated_since))
+    for (pk, slug, name, description, year, make, model, category, part_number,
+         price, condition, in_stock, image_url, image_file, updated_at) in rows:
+        yield {
+            "id": str(pk),
+            "title": f"{year} {make} {model} {name}",
+            "description": description or f"Used {name} for {year} {make} {model}",
+            "link": f"{base_url}/product/{slug}/{pk}",
+            "image_link": _image_link(base_url, image_url, image_file),
+            "price": price,
+            "currency": "USD",
+            "availability": "in_stock" if in_stock else "out_of_stock",
+            "condition": MERCHANT_CONDITIONS.get(condition, "used"),
+            "brand": make,
+            "model": model,
+            "year": year,
+            "product_type": category,
+            "mpn": part_number or "",
+            "updated_at": updated_at,
+        }
+
+
+def iter_part_records(base_url, updated_since=None):
+    rows = _keyset_pages(_part_rows(updated_since))
+    for (pk, gallery_slug, gallery_id, name, description, year, make, model, category,
+         part_number, price, condition, stock, primary_image, image_url, image_file, updated_at) in rows:
+        yield {
+            "id": f"part-{pk}",
+            "title": f"{year} {make} {model} {name}",
+            "description": description or f"Used {name} for {year} {make} {model}",
+            "link": f"{base_url}/product/{gallery_slug}/{gallery_id}" if gallery_id else "",
+            "image_link": _image_link(base_url, primary_image, image_url, image_file),
+            "price": price,
+            "currency": "USD",
+            "availability": "in_stock" if stock > 0 else "out_of_stock",
+            "condition": MERCHANT_CONDITIONS.get(condition, "used"),
+            "brand": make,
+            "model": model,
+            "year": year,
+            "product_type": category,
+            "mpn": part_number or "",
+            "updated_at": updated_at,
+        }
+
+
+EXPORT_SOURCES = {
+    "galleries": iter_gallery_records,
+    "parts": iter_part_records,
+}
+
+
+# ============================================================================
+# FORMATS
+# ============================================================================
+
+class _Echo:
+    """File-like object whose write() hands the line back to csv.writer's caller"""
+
+    def write(self, value):
+        return value
+
+
+def _plain(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def _csv_lines(records):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(COLUMNS)
+    for record in records:
+        yield writer.writerow([_plain(record[column]) for column in COLUMNS])
+
+
+def _ndjson_lines(records):
+    for record in records:
+        yield json.dumps({column: record[column] for column in COLUMNS}, default=_plain) + "\n"
+
+
+def _merchant_item(record):
+    fields = [
+        ("g:id", record["id"]),
+        ("title", record["title"][:150]),
+        ("description", record["description"][:5000]),
+        ("link", record["link"]),
+        ("g:image_link", record["image_link"]),
+        ("g:availability", record["availability"].replace("_", " ")),
+        ("g:condition", record["condition"]),
+        ("g:brand", record["brand"]),
+        ("g:mpn", record["mpn"]),
+        ("g:product_type", record["product_type"]),
+    ]
+    if record["price"] is not None:
+        fields.append(("g:price", f"{record['price']} {record['currency']}"))
+    body = "".join(f"<{tag}>{escape(_plain(value))}</{tag}>" for tag, value in fields if value not in (None, ""))
+    return f"<item>{body}</item>\n"
+
+
+def _merchant_lines(records, base_url):
+    yield MERCHANT_HEADER.format(base_url=escape(base_url))
+    for record in records:
+        # Merchant Center rejects items without a landing page or price
+        if record["link"] and record["price"] is not None:
+            yield _merchant_item(record)
+    yield MERCHANT_FOOTER
+
+
+def iter_export(source, fmt, base_url, updated_since=None):
+    """Yield the export as text chunks of about EXPORT_FLUSH_ROWS rows each"""
+    records = EXPORT_SOURCES[source](base_url, updated_since)
+    if fmt == "csv":
+        lines = _csv_lines(records)
+    elif fmt == "ndjson":
+        lines = _ndjson_lines(records)
+    else:
+        lines = _merchant_lines(records, base_url)
+
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= EXPORT_FLUSH_ROWS:
+            yield "".join(buffer)
+            buffer = []
+    if buffer:
+        yield "".join(buffer)
+
+
+def encode_chunks(chunks):
+    for chunk in chunks:
+        yield chunk.encode("utf-8")
+
+
+def accepts_gzip(accept_encoding):
+    """
+    Whether an Accept-Encoding header allows gzip: listed (or matched by *)
+    with a non-zero q-value. An explicit gzip entry wins over *, so
+    "gzip;q=0, *" is a refusal.
+    """
+    qualities = {}
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[name] = quality
+
+    for name in ("gzip", "x-gzip", "*"):
+        if name in qualities:
+            return qualities[name] > 0
+    return False
+
+
+def gzip_chunks(chunks):
+    """gzip a stream of byte chunks incrementally"""
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def parse_updated_since(value):
+    """
+    ISO date or datetime -> aware datetime; raises ValueError when invalid.
+    Naive values are taken to be in the project time zone.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"updated_since must be an ISO date or datetime, got {value!r}")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
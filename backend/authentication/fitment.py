@@ -0,0 +1,307 @@
+# authentication/fitment.py
+"""
+In-process vehicle fitment index.
+
+Answers the cascading dropdown questions without touching the database:
+
+    years()                              -> years that have any parts
+    makes(year)                          -> manufacturer ids with parts for that year
+    models(year, make)                   -> model ids of that make with parts
+    categories(year, make, model)        -> part category ids for that vehicle
+
+Built from the visible rows of PartInventory, PartImageGallery and
+ProductImage on first use in each worker process. Every level is a sorted
+array('l') of ids, and each (year, make, model, category) combination keeps
+a reference count. Saves and deletes in the current process are applied
+incrementally through signals.py once their transaction commits. Other
+workers notice the shared version bump (checked at most every
+FITMENT_VERSION_CHECK_INTERVAL seconds) and rebuild: a new index is built in
+a background thread while requests keep reading the old one, then swapped in.
+"""
+
+import logging
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+
+from .models import (
+    Manufacturer,
+    PartCategory,
+    PartImageGallery,
+    PartInventory,
+    ProductImage,
+    VehicleModel,
+)
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = "fitment:version"
+FITMENT_FIELDS = ("pk", "year", "manufacturer_id", "model_id", "part_category_id")
+
+# source name -> (model, filter for rows that are publicly visible)
+FITMENT_SOURCES = {
+    "parts": (PartInventory, {"is_published": True}),
+    "galleries": (PartImageGallery, {"is_published": True}),
+    "product_images": (ProductImage, {"is_active": True}),
+}
+
+
+def _insert_sorted(values, value):
+    i = bisect_left(values, value)
+    if i == len(values) or values[i] != value:
+        values.insert(i, value)
+
+
+def _remove_sorted(values, value):
+    i = bisect_left(values, value)
+    if i < len(values) and values[i] == value:
+        del values[i]
+
+
+class FitmentIndex:
+    """
+    year -> make -> model -> category, stored as sorted id arrays
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._clear()
+
+    def _clear(self):
+        self._rows = {}        # (source, pk) -> (year, make, model, category)
+        self._counts = {}      # key prefix tuple -> number of rows underneath
+        self._years = array("l")
+        self._children = {}    # key prefix tuple -> sorted array of next-level ids
+        self.names = {"make": {}, "model": {}, "category": {}}
+        self.version = None
+        self.built_at = None
+
+    # ------------------------------------------------------------------ build
+
+    def build(self):
+        """Load every visible row from the source tables"""
+        started = time.perf_counter()
+        with self._lock:
+            self._clear()
+            self.version = get_shared_version()
+            for source, (model, visible) in FITMENT_SOURCES.items():
+                rows = model.objects.filter(**visible).values_list(*FITMENT_FIELDS)
+                for pk, year, make, vehicle_model, category in rows.iterator(chunk_size=5000):
+                    self._add(source, pk, (year, make, vehicle_model, category))
+            self.load_names()
+            self.built_at = time.time()
+
+        logger.info(
+            f"Fitment index built: {len(self._rows)} rows, {len(self._years)} years "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    def load_names(self):
+        with self._lock:
+            self.names = {
+                "make": dict(Manufacturer.objects.values_list("id", "name")),
+                "model": dict(VehicleModel.objects.values_list("id", "name")),
+                "category": dict(PartCategory.objects.values_list("id", "name")),
+            }
+
+    # ---------------------------------------------------------- maintenance
+
+    def _add(self, source, pk, entry):
+        if None in entry:
+            return
+        self._rows[(source, pk)] = entry
+        for depth in range(1, 5):
+            key = entry[:depth]
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+            if count == 0:
+                parent = self._years if depth == 1 else self._children.setdefault(entry[:depth - 1], array("l"))
+                _insert_sorted(parent, entry[depth - 1])
+
+    def _remove(self, source, pk):
+        entry = self._rows.pop((source, pk), None)
+        if entry is None:
+            return
+        for depth in range(4, 0, -1):
+            key = entry[:depth]
+            count = self._counts[key] - 1
+            if count:
+                self._counts[key] = count
+                continue
+            del self._counts[key]
+            self._children.pop(key, None)
+            parent = self._years if depth == 1 else self._children.get(entry[:depth - 1])
+            if parent is not None:
+                _remove_sorted(parent, entry[depth - 1])
+
+    def update(self, source, pk, entry, visible):
+        """Apply one saved or deleted row (visible=False removes it)"""
+        with self._lock:
+            if self._rows.get((source, pk)) == entry and visible:
+                return
+            self._remove(source, pk)
+            if visible:
+                self._add(source, pk, entry)
+
+    # ---------------------------------------------------------------- reads
+
+    def years(self):
+        with self._lock:
+            return self._years.tolist()
+
+    def makes(self, year):
+        return self._lookup((year,))
+
+    def models(self, year, make):
+        return self._lookup((year, make))
+
+    def categories(self, year, make, model):
+        return self._lookup((year, make, model))
+
+    def _lookup(self, key):
+        with self._lock:
+            values = self._children.get(key)
+            return values.tolist() if values is not None else []
+
+    def named(self, kind, ids):
+        """[{id, name}] for ids, in name order"""
+        names = self.names[kind]
+        return sorted(
+            ({"id": pk, "name": names.get(pk, "")} for pk in ids),
+            key=lambda item: item["name"],
+        )
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "rows": len(self._rows),
+                "years": len(self._years),
+                "combinations": sum(1 for key in self._counts if len(key) == 4),
+                "version": self.version,
+                "built_at": self.built_at,
+                "pid": os.getpid(),
+            }
+
+
+# ============================================================================
+# PROCESS-WIDE INSTANCE
+# ============================================================================
+
+_index = None
+_index_pid = None
+_index_lock = threading.Lock()
+_last_version_check = 0.0
+_rebuilding = False
+
+
+def get_shared_version(key=VERSION_KEY):
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, 1, None)
+        version = cache.get(key, 1)
+    return version
+
+
+def bump_shared_version(key=VERSION_KEY):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = get_shared_version(key) + 1
+        cache.set(key, version, None)
+        return version
+
+
+def get_fitment_index():
+    """
+    Return this process's index, building it on first use (or after fork)
+    and rebuilding when another process has changed the data
+    """
+    global _index, _index_pid, _last_version_check, _rebuilding
+
+    pid = os.getpid()
+    if _index is None or _index_pid != pid:
+        with _index_lock:
+            if _index is None or _index_pid != pid:
+                index = FitmentIndex()
+                index.build()
+                _index, _index_pid = index, pid
+                _last_version_check = time.monotonic()
+                _rebuilding = False  # a rebuild thread doesn't survive fork
+        return _index
+
+    interval = getattr(settings, "FITMENT_VERSION_CHECK_INTERVAL", 5)
+    max_age = getattr(settings, "FITMENT_MAX_AGE", 600)
+    now = time.monotonic()
+    if now - _last_version_check >= interval:
+        _last_version_check = now
+        # QuerySet.update() skips signals, so also rebuild on age
+        stale = time.time() - (_index.built_at or 0) > max_age
+        if stale or get_shared_version() != _index.version:
+            _start_rebuild()
+    return _index
+
+
+def _start_rebuild():
+    global _rebuilding
+    with _index_lock:
+        if _rebuilding:
+            return
+        _rebuilding = True
+    threading.Thread(target=_rebuild, name="fitment-rebuild", daemon=True).start()
+
+
+def _rebuild():
+    """Build a fresh index off the request path and swap it in"""
+    global _index, _rebuilding
+    try:
+        index = FitmentIndex()
+        index.build()
+        # Changes committed while building bumped the version past index.version,
+        # so the next check rebuilds again instead of losing them
+        _index = index
+    except Exception as e:
+        logger.error(f"Fitment index rebuild failed: {e}", exc_info=True)
+    finally:
+        _rebuilding = False
+        connections.close_all()
+
+
+def _apply_locally(change):
+    """Bump the shared version and run change() on this process's index"""
+    version = bump_shared_version()
+    index = _index
+    if index is None or _index_pid != os.getpid():
+        return
+    with index._lock:
+        in_sync = index.version is not None and version == index.version + 1
+        change(index)
+        if in_sync:
+            # otherwise a change from another process was missed - leave
+            # the old version so the next read rebuilds
+            index.version = version
+
+
+def apply_fitment_change(source, instance, visible):
+    """Signal hook for saved/deleted parts, galleries and product images"""
+    pk = instance.pk
+    entry = (
+        instance.year,
+        instance.manufacturer_id,
+        instance.model_id,
+        instance.part_category_id,
+    )
+    # After commit, so a rolled-back save never reaches the index
+    transaction.on_commit(
+        lambda: _apply_locally(lambda index: index.update(source, pk, entry, visible))
+    )
+
+
+def refresh_fitment_names():
+    """Signal hook for Manufacturer / VehicleModel / PartCategory changes"""
+    transaction.on_commit(lambda: _apply_locally(lambda index: index.load_names()))
@@ -0,0 +1,70 @@
+# authentication/imaging.py
+"""
+Pillow work for image derivatives.
+
+Runs inside the process pool started by derivatives.py, so this module must
+stay importable without Django being set up: no Django or project imports.
+"""
+
+import io
+
+from PIL import Image, ImageOps
+
+try:
+    import pillow_avif  # noqa: F401  (registers the AVIF encoder)
+except ImportError:
+    pass
+
+# Pillow format name and MIME type per derivative format
+FORMATS = {
+    "webp": ("WEBP", "image/webp"),
+    "avif": ("AVIF", "image/avif"),
+    "jpeg": ("JPEG", "image/jpeg"),
+}
+
+
+def supported_formats(formats):
+    """The formats this Pillow build can encode"""
+    Image.init()
+    return [fmt for fmt in formats if fmt in FORMATS and FORMATS[fmt][0] in Image.SAVE]
+
+
+def target_widths(original_width, widths):
+    """Requested widths that don't upscale; at least one derivative per format"""
+    fitting = sorted({width for width in widths if width < original_width})
+    return fitting or [original_width]
+
+
+def render_derivatives(data, widths, formats, quality):
+    """
+    Decode an image and encode it at each width in each format.
+
+    Args:
+        data: original file bytes
+        widths: target widths in pixels (never upscaled)
+        formats: derivative formats (keys of FORMATS)
+        quality: encoder quality 1-100
+
+    Returns:
+        (width, height, [(format, width, encoded bytes), ...])
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    width, height = image.size
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+
+    outputs = []
+    for target in target_widths(width, widths):
+        resized = image
+        if target < width:
+            resized = image.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+        for fmt in formats:
+            pillow_format = FORMATS[fmt][0]
+            frame = resized.convert("RGB") if pillow_format == "JPEG" else resized
+            buffer = io.BytesIO()
+            frame.save(buffer, pillow_format, quality=quality, optimize=pillow_format == "JPEG")
+            outputs.append((fmt, target, buffer.getvalue()))
+    return width, height, outputs
@@ -0,0 +1,120 @@
+# authentication/management/commands/benchmark_autocomplete.py
+"""
+Measure the autocomplete index: build time, memory and suggest() latency.
+
+    python manage.py benchmark_autocomplete --galleries 100000
+    python manage.py benchmark_autocomplete --database
+
+By default the index is loaded from synthetic reference data and gallery
+rows (no database needed), so memory per 100k entries can be compared
+between changes; --database builds it from the real tables instead.
+Memory is what tracemalloc sees allocated by the build. Latency is timed
+over prefixes of real labels, once cold (hot-prefix results not yet
+cached) and once warm; the command fails when warm p99 exceeds --max-p99-ms.
+"""
+
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.autocomplete import AutocompleteIndex
+
+WORDS = (
+    "brake pad rotor caliper engine mount filter oil air fuel pump water radiator hose "
+    "headlight taillight mirror door handle window regulator sensor oxygen bumper cover "
+    "grille fender hood strut shock spring control arm axle hub bearing alternator starter "
+    "ignition coil spark plug belt tensioner thermostat gasket valve cover exhaust muffler"
+).split()
+POSITIONS = ["", "", "Front", "Rear", "Left", "Right", "Upper", "Lower"]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the autocomplete index (build time, memory per 100k entries, p50/p99 latency)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--galleries", type=int, default=100000, help="Synthetic gallery rows")
+        parser.add_argument("--database", action="store_true", help="Build from the database instead")
+        parser.add_argument("--queries", type=int, default=5000, help="suggest() calls to time")
+        parser.add_argument("--max-p99-ms", type=float, default=5.0, help="Fail above this warm p99")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        index = AutocompleteIndex()
+
+        if options["database"]:
+            tracemalloc.start()
+            started = time.perf_counter()
+            index.build()
+        else:
+            references, rows = self.synthetic(rng, options["galleries"])
+            tracemalloc.start()
+            started = time.perf_counter()
+            index.load(references, rows)
+        build_ms = (time.perf_counter() - started) * 1000
+        memory, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        stats = index.get_stats()
+        entries = stats["entries"]
+        self.stdout.write(
+            f"{entries} entries ({', '.join(f'{k} {v}' for k, v in stats['by_kind'].items())}), "
+            f"{stats['keys']} keys, {stats['galleries']} galleries"
+        )
+        self.stdout.write(f"build: {build_ms:.0f}ms")
+        self.stdout.write(
+            f"memory: {memory / 1024 / 1024:.1f}MB total, "
+            f"{memory / max(entries, 1) * 100000 / 1024 / 1024:.1f}MB per 100k entries"
+        )
+
+        labels = [label for label in index._labels if label]
+        if not labels:
+            raise CommandError("Index is empty")
+        queries = []
+        for _ in range(options["queries"]):
+            label = rng.choice(labels)
+            queries.append(label[: rng.randint(1, min(len(label), 8))])
+
+        cold = self.time_queries(index, queries)
+        warm = self.time_queries(index, queries)
+        for name, timings in (("cold", cold), ("warm", warm)):
+            self.stdout.write(
+                f"{name}: p50 {statistics.median(timings):.3f}ms  p95 {percentile(timings, 0.95):.3f}ms  "
+                f"p99 {percentile(timings, 0.99):.3f}ms  max {timings[-1]:.3f}ms"
+            )
+        self.stdout.write(f"hot prefixes cached: {index.get_stats()['hot_prefixes']}")
+
+        if percentile(warm, 0.99) > options["max_p99_ms"]:
+            raise CommandError(
+                f"warm p99 {percentile(warm, 0.99):.3f}ms exceeds {options['max_p99_ms']}ms"
+            )
+
+    def time_queries(self, index, queries):
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            index.suggest(query)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return timings
+
+    def synthetic(self, rng, galleries):
+        makes = [("manufacturer", pk, f"Make {pk}", None) for pk in range(1, 61)]
+        models = [("model", pk, f"Model {pk}", f"Make {pk % 60 + 1}") for pk in range(1, 1201)]
+        categories = [("category", pk, word.title(), None) for pk, word in enumerate(WORDS[:40], 1)]
+        rows = []
+        for pk in range(1, galleries + 1):
+            name = " ".join(filter(None, [rng.choice(POSITIONS), *rng.sample(WORDS, 2)])).title()
+            number = f"{rng.randint(10, 99)}-{rng.randint(100, 99999)}-{rng.choice('ABCDEFGH')}"
+            rows.append((
+                pk, name, number,
+                rng.randint(1, 60), rng.randint(1, 1200), rng.randint(1, len(categories)),
+            ))
+        return makes + models + categories, rows
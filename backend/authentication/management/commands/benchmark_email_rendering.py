@@ -0,0 +1,129 @@
+# authentication/management/commands/benchmark_email_rendering.py
+
+import time
+import tracemalloc
+import uuid
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from authentication import email_utils
+from authentication.email_templates import TEMPLATE_SOURCES, EmailFragment, render_email
+
+
+def fstring_render(name, context):
+    """
+    Baseline: the per-send f-string renderers the templates replaced, reduced
+    to what they cost - the whole document, CSS included, rebuilt for every
+    message, plus a separately assembled text part
+    """
+    source = TEMPLATE_SOURCES[name]
+    markup, text = {}, {}
+    for key, value in context.items():
+        if isinstance(value, EmailFragment):
+            markup[key], text[key] = value
+        else:
+            markup[key] = text[key] = "" if value is None else value
+    html_body = (
+        f"<!DOCTYPE html>\n<html>\n<head>\n<style>{source['css']}</style>\n</head>\n<body>\n"
+        f"<div class=\"{source.get('wrapper_class', 'container')}\">\n"
+        f"<div class=\"header\">{source['header']}</div>\n"
+        f"<div class=\"content\">{source['body'].format_map(markup)}</div>\n"
+        f"<div class=\"footer\">{source['footer'].format_map(markup)}</div>\n"
+        "</div>\n</body>\n</html>\n"
+    )
+    text_body = "\n".join(f"{key}: {value}" for key, value in text.items() if value)
+    return html_body, text_body
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark email rendering for the four notification types: "
+        "per-message time and allocations, the previous f-string renderers vs "
+        "the precompiled templates"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=2000,
+            help="Renders per email type and mode",
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(1, options["iterations"])
+
+        submission = SimpleNamespace(
+            id=uuid.uuid4(),
+            name="Jane Doe",
+            email="jane@example.com",
+            phone="555-0100",
+            subject="Question about a transmission",
+            message="Do you have a 6-speed manual for a 2012 Mustang GT?\nThanks!",
+            ip_address="203.0.113.9",
+            created_at=timezone.now(),
+        )
+        inquiry = SimpleNamespace(
+            id=uuid.uuid4(),
+            name="John Smith",
+            email="john@example.com",
+            phone="",
+            year=2015,
+            manufacturer="Ford",
+            model="F-150",
+            part_category="Engine",
+            parts_needed="Complete engine assembly, 5.0L V8 <low miles>",
+            created_at=timezone.now(),
+        )
+
+        cases = [
+            ("contact_notification", email_utils.contact_notification_context, submission),
+            ("contact_auto_reply", email_utils.contact_auto_reply_context, submission),
+            ("parts_inquiry_notification", email_utils.parts_inquiry_notification_context, inquiry),
+            ("parts_inquiry_auto_reply", email_utils.parts_inquiry_auto_reply_context, inquiry),
+        ]
+
+        self.stdout.write(
+            f"{'template':<28} {'mode':<12} {'us/msg':>9} {'bytes/msg':>10} {'max KB':>9}"
+        )
+        for name, build_context, obj in cases:
+            def fstring():
+                fstring_render(name, build_context(obj))
+
+            def precompiled():
+                render_email(name, build_context(obj))
+
+            precompiled()  # compile outside the measurement
+            for mode, fn in (("f-string", fstring), ("precompiled", precompiled)):
+                per_msg_us, per_msg_bytes, worst = self._measure(fn, iterations)
+                self.stdout.write(
+                    f"{name:<28} {mode:<12} {per_msg_us:>9.1f} {per_msg_bytes:>10.0f} {worst / 1024:>9.1f}"
+                )
+
+    @staticmethod
+    def _measure(fn, iterations):
+        """Return (microseconds per call, avg peak bytes per call, max peak bytes)"""
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+
+        # Allocation pass is separate so tracing overhead doesn't skew timings
+        samples = min(iterations, 200)
+        total = 0
+        worst = 0
+        tracemalloc.start()
+        try:
+            for _ in range(samples):
+                baseline = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                fn()
+                used = tracemalloc.get_traced_memory()[1] - baseline
+                total += used
+                worst = max(worst, used)
+        finally:
+            tracemalloc.stop()
+
+        return elapsed / iterations * 1e6, total / samples, worst
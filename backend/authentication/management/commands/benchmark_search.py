@@ -0,0 +1,144 @@
+# authentication/management/commands/benchmark_search.py
+
+import random
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework import filters
+from rest_framework.request import Request
+
+from authentication.models import Manufacturer, PartCategory, PartImageGallery, VehicleModel
+from authentication.search import FullTextSearchFilter, build_search_document, fulltext_available
+
+BENCH_SLUG_PREFIX = "bench-"
+
+PART_WORDS = [
+    "Engine", "Transmission", "Alternator", "Starter", "Radiator", "Headlight",
+    "Taillight", "Mirror", "Door", "Bumper", "Fender", "Hood", "ABS Module",
+    "Steering Column", "Speedometer", "Radio", "Display Unit", "Transfer Case",
+    "Axle", "Compressor", "Throttle Body", "Fuel Pump", "Control Arm", "Spindle",
+]
+QUALIFIERS = ["Assembly", "Front", "Rear", "Left", "Right", "OEM", "Used", "Complete", "Upper", "Lower"]
+
+DEFAULT_TERMS = ["engine", "transmission assembly", "headlight left", "abs module", "ford", "fuel pump oem"]
+
+SEARCH_FIELDS = [
+    "part_name",
+    "part_number",
+    "description",
+    "manufacturer__name",
+    "model__name",
+    "part_category__name",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare FULLTEXT search against DRF SearchFilter on PartImageGallery. "
+        "Use --generate to seed a synthetic catalog first (e.g. --generate 500000)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--generate", type=int, default=0, help="Synthetic galleries to create first")
+        parser.add_argument("--cleanup", action="store_true", help="Delete synthetic galleries and exit")
+        parser.add_argument("--repeat", type=int, default=5, help="Runs per term and backend")
+        parser.add_argument("--term", action="append", dest="terms", help="Search term (repeatable)")
+
+    def handle(self, *args, **options):
+        if options["cleanup"]:
+            deleted, _ = PartImageGallery.objects.filter(slug__startswith=BENCH_SLUG_PREFIX).delete()
+            self.stdout.write(f"Deleted {deleted} synthetic rows")
+            return
+
+        if options["generate"]:
+            self.generate(options["generate"])
+
+        if not fulltext_available():
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Database vendor is {connection.vendor}; FULLTEXT search is unavailable, "
+                    "both columns will measure the LIKE fallback"
+                )
+            )
+
+        total = PartImageGallery.objects.count()
+        self.stdout.write(f"Catalog size: {total} galleries, {options['repeat']} runs per term\n")
+        self.stdout.write(f"{'term':<24} {'backend':<10} {'matches':>8} {'median ms':>10} {'p95 ms':>8}")
+
+        factory = RequestFactory()
+        view = SimpleNamespace(search_fields=SEARCH_FIELDS)
+        backends = [("like", filters.SearchFilter()), ("fulltext", FullTextSearchFilter())]
+
+        for term in options["terms"] or DEFAULT_TERMS:
+            request = Request(factory.get("/", {"search": term}))
+            for label, backend in backends:
+                timings = []
+                matches = 0
+                for _ in range(max(1, options["repeat"])):
+                    queryset = PartImageGallery.objects.filter(is_published=True)
+                    start = time.perf_counter()
+                    results = backend.filter_queryset(request, queryset, view)
+                    matches = results.count()
+                    list(results.values_list("pk", flat=True)[:24])
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                self.stdout.write(
+                    f"{term:<24} {label:<10} {matches:>8} {statistics.median(timings):>10.1f} {p95:>8.1f}"
+                )
+
+    def generate(self, count):
+        """Bulk insert synthetic galleries (save() is bypassed, so fill slug/search_document here)"""
+        models = list(VehicleModel.objects.select_related("manufacturer"))
+        categories = list(PartCategory.objects.all())
+        if not models or not categories:
+            raise CommandError("Run populate_sample_data first - vehicle models and categories are required")
+
+        manufacturers = {m.id: m for m in Manufacturer.objects.all()}
+        rng = random.Random(42)
+        batch_size = 5000
+        created = 0
+        started = time.perf_counter()
+
+        while created < count:
+            batch = []
+            for _ in range(min(batch_size, count - created)):
+                vehicle_model = rng.choice(models)
+                category = rng.choice(categories)
+                year = rng.randint(1990, 2025)
+                part_name = f"{rng.choice(QUALIFIERS)} {rng.choice(PART_WORDS)}"
+                part_number = f"{rng.randint(10000, 99999)}-{uuid.uuid4().hex[:5].upper()}"
+                description = f"{part_name} for {year} {vehicle_model.manufacturer.name} {vehicle_model.name}"
+                batch.append(
+                    PartImageGallery(
+                        year=year,
+                        manufacturer=manufacturers[vehicle_model.manufacturer_id],
+                        model=vehicle_model,
+                        part_category=category,
+                        part_name=part_name,
+                        part_number=part_number,
+                        description=description,
+                        slug=f"{BENCH_SLUG_PREFIX}{uuid.uuid4().hex}",
+                        search_document=build_search_document(
+                            part_name,
+                            part_number,
+                            year,
+                            vehicle_model.manufacturer.name,
+                            vehicle_model.name,
+                            category.name,
+                            description,
+                        ),
+                    )
+                )
+            PartImageGallery.objects.bulk_create(batch, batch_size=batch_size)
+            created += len(batch)
+            self.stdout.write(f"  generated {created}/{count}")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {created} galleries in {time.perf_counter() - started:.1f}s")
+        )
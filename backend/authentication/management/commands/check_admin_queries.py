@@ -0,0 +1,64 @@
+# authentication/management/commands/check_admin_queries.py
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+PAGE_SIZES = (5, 100)
+
+
+class Command(BaseCommand):
+    help = (
+        "Render every authentication changelist at two page sizes and fail if the "
+        "query count grows with the page or exceeds --max-queries"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-queries", type=int, default=15, help="Ceiling per changelist page")
+        parser.add_argument("--model", action="append", dest="models", help="Only check these model names")
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        # Unsaved superuser: has every permission without touching the database
+        user = User(username="query-check", is_active=True, is_staff=True, is_superuser=True)
+        failures = []
+
+        self.stdout.write(f"{'model':<22} {'rows':>7} " + " ".join(f"{f'{n}/page':>9}" for n in PAGE_SIZES))
+        for model, model_admin in admin.site._registry.items():
+            meta = model._meta
+            if meta.app_label != "authentication":
+                continue
+            if options["models"] and meta.model_name not in options["models"]:
+                continue
+
+            url = reverse(f"admin:{meta.app_label}_{meta.model_name}_changelist")
+            original_per_page = model_admin.list_per_page
+            counts = []
+            try:
+                for per_page in PAGE_SIZES:
+                    model_admin.list_per_page = per_page
+                    request = factory.get(url)
+                    request.user = user
+                    with CaptureQueriesContext(connection) as queries:
+                        response = model_admin.changelist_view(request)
+                        response.render()
+                    counts.append(len(queries))
+            finally:
+                model_admin.list_per_page = original_per_page
+
+            rows = model._default_manager.count()
+            self.stdout.write(
+                f"{meta.model_name:<22} {rows:>7} " + " ".join(f"{count:>9}" for count in counts)
+            )
+            if rows > PAGE_SIZES[0] and counts[0] != counts[-1]:
+                failures.append(f"{meta.model_name}: queries grow with page size {counts}")
+            if max(counts) > options["max_queries"]:
+                failures.append(f"{meta.model_name}: {max(counts)} queries > {options['max_queries']}")
+
+        if failures:
+            raise CommandError("\n".join(failures))
+        self.stdout.write(self.style.SUCCESS("All changelists stay within the query ceiling"))
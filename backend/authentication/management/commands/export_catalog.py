@@ -0,0 +1,67 @@
+# authentication/management/commands/export_catalog.py
+
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from authentication import exports
+
+DEFAULT_BASE_URL = "https://nexxaauto.com"
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the published catalog as CSV, NDJSON or a Google Merchant XML feed. "
+        "Output ending in .gz is gzipped; --updated-since exports only changed rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="File to write (e.g. feeds/merchant.xml.gz)")
+        parser.add_argument("--format", choices=list(exports.CONTENT_TYPES), default="csv")
+        parser.add_argument("--source", choices=list(exports.EXPORT_SOURCES), default="galleries")
+        parser.add_argument("--updated-since", help="ISO date or datetime (incremental export)")
+        parser.add_argument("--gzip", action="store_true", help="Compress even without a .gz suffix")
+        parser.add_argument("--base-url", default=DEFAULT_BASE_URL, help="Site URL used for product links")
+
+    def handle(self, *args, **options):
+        updated_since = None
+        if options["updated_since"]:
+            try:
+                updated_since = exports.parse_updated_since(options["updated_since"])
+            except ValueError as e:
+                raise CommandError(str(e))
+
+        output = options["output"]
+        compress = options["gzip"] or output.endswith(".gz")
+        started_at = timezone.now()
+        started = time.perf_counter()
+
+        chunks = exports.encode_chunks(
+            exports.iter_export(
+                options["source"], options["format"], options["base_url"].rstrip("/"), updated_since
+            )
+        )
+        if compress:
+            chunks = exports.gzip_chunks(chunks)
+
+        # Write next to the target and rename, so a feed fetcher never sees a partial file
+        tmp_path = f"{output}.tmp"
+        written = 0
+        try:
+            with open(tmp_path, "wb") as handle:
+                for chunk in chunks:
+                    handle.write(chunk)
+                    written += len(chunk)
+            os.replace(tmp_path, output)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {written / 1024:.1f} KiB to {output} in {time.perf_counter() - started:.1f}s "
+                f"(next incremental run: --updated-since {started_at.isoformat()})"
+            )
+        )
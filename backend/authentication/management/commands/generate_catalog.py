@@ -0,0 +1,295 @@
+# authentication/management/commands/generate_catalog.py
+"""
+Synthetic catalog for benchmarks and load tests.
+
+    python manage.py generate_catalog --manufacturers 40 --galleries 200000
+    python manage.py generate_catalog --cleanup
+
+Popularity is skewed the way real traffic and stock are: manufacturers,
+models and categories are drawn from Zipf-like weights (a few makes hold
+most of the catalog), years cluster around the late 2000s/2010s, and image,
+price and stock counts are long-tailed. Everything is written with
+bulk_create, so slug/search_document/part_number_normalized are filled here
+and caches are invalidated once at the end. All rows hang off manufacturers
+and categories named "Synthetic ...", which --cleanup deletes (cascading).
+The same --seed always produces the same catalog.
+"""
+
+import random
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from authentication.autocomplete import bump_autocomplete_version
+from authentication.caching import bump_group_version
+from authentication.fitment import bump_shared_version
+from authentication.models import (
+    Manufacturer,
+    PartCategory,
+    PartImageGallery,
+    PartImageUpload,
+    PartInventory,
+    PartPrice,
+    VehicleModel,
+)
+from authentication.search import build_search_document, normalize_part_number
+from authentication.sitemaps import invalidate_sitemap_cache
+
+NAME_PREFIX = "Synthetic"
+CODE_PREFIX = "SYN"
+SLUG_PREFIX = "synthetic-"
+
+PART_WORDS = [
+    "Engine", "Transmission", "Alternator", "Starter", "Radiator", "Headlight",
+    "Taillight", "Mirror", "Door", "Bumper", "Fender", "Hood", "ABS Module",
+    "Steering Column", "Speedometer", "Radio", "Display Unit", "Transfer Case",
+    "Axle", "Compressor", "Throttle Body", "Fuel Pump", "Control Arm", "Spindle",
+]
+QUALIFIERS = ["Assembly", "Front", "Rear", "Left", "Right", "OEM", "Used", "Complete", "Upper", "Lower"]
+PRICE_CONDITIONS = ["used_good", "used_good", "used_excellent", "used_fair", "refurbished", "oem"]
+INVENTORY_CONDITIONS = ["used", "used", "used", "oem", "refurbished", "aftermarket", "new"]
+
+
+def zipf_weights(count, exponent=1.1):
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+class Command(BaseCommand):
+    help = "Bulk-create a skewed synthetic catalog (reference data, galleries, images, prices, inventory)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--manufacturers", type=int, default=30)
+        parser.add_argument("--models", type=int, default=12, help="Models per manufacturer (average)")
+        parser.add_argument("--categories", type=int, default=60)
+        parser.add_argument("--galleries", type=int, default=50000)
+        parser.add_argument(
+            "--inventory-ratio", type=float, default=0.6,
+            help="Share of galleries that also get a PartInventory row",
+        )
+        parser.add_argument("--batch-size", type=int, default=2000, help="Galleries per transaction")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--cleanup", action="store_true", help="Delete the synthetic catalog and exit")
+
+    def handle(self, *args, **options):
+        if options["cleanup"]:
+            self.cleanup()
+            return
+
+        self.rng = random.Random(options["seed"])
+        started = time.perf_counter()
+
+        models = self.create_models(options["manufacturers"], options["models"])
+        categories = self.create_categories(options["categories"])
+        if not models or not categories:
+            raise CommandError("Nothing to attach galleries to - increase --manufacturers/--categories")
+
+        models, model_weights = self.model_weights(models)
+        category_weights = zipf_weights(len(categories), exponent=0.9)
+        counts = {"galleries": 0, "images": 0, "prices": 0, "inventory": 0}
+        total = options["galleries"]
+        batch_size = max(1, options["batch_size"])
+
+        while counts["galleries"] < total:
+            size = min(batch_size, total - counts["galleries"])
+            vehicles = self.rng.choices(models, weights=model_weights, k=size)
+            part_categories = self.rng.choices(categories, weights=category_weights, k=size)
+            rows = self.build_batch(vehicles, part_categories, options["inventory_ratio"])
+            with transaction.atomic():
+                for model_class, objects in rows:
+                    model_class.objects.bulk_create(objects, batch_size=1000)
+            counts["galleries"] += size
+            counts["images"] += len(rows[1][1])
+            counts["prices"] += len(rows[2][1])
+            counts["inventory"] += len(rows[3][1])
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {counts['galleries']}/{total} galleries "
+                f"({counts['galleries'] / elapsed if elapsed else 0:.0f}/sec)"
+            )
+
+        # bulk_create skips post_save, so invalidate once for everything
+        for group in ("reference", "galleries", "parts"):
+            bump_group_version(group)
+        bump_shared_version()
+        bump_autocomplete_version()
+        invalidate_sitemap_cache()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(models)} models, {len(categories)} categories, {counts['galleries']} galleries, "
+                f"{counts['images']} images, {counts['prices']} prices, {counts['inventory']} inventory rows "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        )
+
+    def cleanup(self):
+        # Galleries, inventory, prices and models cascade from these
+        deleted = Manufacturer.objects.filter(name__startswith=f"{NAME_PREFIX} ").delete()[0]
+        deleted += PartCategory.objects.filter(name__startswith=f"{NAME_PREFIX} ").delete()[0]
+        for group in ("reference", "galleries", "parts"):
+            bump_group_version(group)
+        bump_shared_version()
+        bump_autocomplete_version()
+        invalidate_sitemap_cache()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} synthetic rows"))
+
+    # ------------------------------------------------------------------ reference
+
+    def create_models(self, manufacturer_count, models_per_manufacturer):
+        """Manufacturers plus a skewed number of models each (bulk_create gives no ids on MySQL, so re-read)"""
+        start = Manufacturer.objects.filter(name__startswith=f"{NAME_PREFIX} ").count()
+        Manufacturer.objects.bulk_create([
+            Manufacturer(name=f"{NAME_PREFIX} Make {index:03d}", code=f"{CODE_PREFIX}{index:03d}")
+            for index in range(start + 1, start + manufacturer_count + 1)
+        ])
+        manufacturers = list(Manufacturer.objects.filter(name__startswith=f"{NAME_PREFIX} ").order_by("name"))
+
+        pending = []
+        for manufacturer in manufacturers[start:]:
+            count = max(1, int(self.rng.expovariate(1 / models_per_manufacturer)))
+            pending.extend(
+                VehicleModel(manufacturer=manufacturer, name=f"Model {index:02d}", code=f"M{index:02d}")
+                for index in range(1, count + 1)
+            )
+        VehicleModel.objects.bulk_create(pending, batch_size=1000)
+        return list(
+            VehicleModel.objects.filter(manufacturer__name__startswith=f"{NAME_PREFIX} ")
+            .select_related("manufacturer")
+            .order_by("manufacturer__name", "name")
+        )
+
+    def create_categories(self, count):
+        start = PartCategory.objects.filter(name__startswith=f"{NAME_PREFIX} ").count()
+        PartCategory.objects.bulk_create([
+            PartCategory(
+                name=f"{NAME_PREFIX} {self.rng.choice(PART_WORDS)} {index:03d}",
+                description="Generated by generate_catalog",
+            )
+            for index in range(start + 1, start + count + 1)
+        ])
+        return list(PartCategory.objects.filter(name__startswith=f"{NAME_PREFIX} ").order_by("id"))
+
+    def model_weights(self, models):
+        """(models, weights): Zipf over manufacturers, then again over each manufacturer's models"""
+        by_manufacturer = {}
+        for vehicle in models:
+            by_manufacturer.setdefault(vehicle.manufacturer_id, []).append(vehicle)
+
+        ordered, weights = [], []
+        for make_weight, vehicles in zip(zipf_weights(len(by_manufacturer)), by_manufacturer.values()):
+            within = zipf_weights(len(vehicles), exponent=0.8)
+            total = sum(within)
+            ordered.extend(vehicles)
+            weights.extend(make_weight * weight / total for weight in within)
+        return ordered, weights
+
+    # ---------------------------------------------------------------- catalog
+
+    def build_batch(self, vehicles, categories, inventory_ratio):
+        rng = self.rng
+        today = timezone.now().date()
+        galleries, images, prices, inventory = [], [], [], []
+
+        for vehicle, category in zip(vehicles, categories):
+            manufacturer = vehicle.manufacturer
+            year = min(2025, max(1990, int(rng.gauss(2010, 6))))
+            part_name = f"{rng.choice(QUALIFIERS)} {rng.choice(PART_WORDS)}"
+            part_number = f"{rng.randint(10000, 99999)}-{uuid.UUID(int=rng.getrandbits(128)).hex[:5].upper()}"
+            description = f"{part_name} for {year} {manufacturer.name} {vehicle.name}"
+            document = build_search_document(
+                part_name, part_number, year, manufacturer.name, vehicle.name, category.name, description
+            )
+
+            gallery = PartImageGallery(
+                id=uuid.UUID(int=rng.getrandbits(128)),
+                year=year,
+                manufacturer=manufacturer,
+                model=vehicle,
+                part_category=category,
+                part_name=part_name,
+                part_number=part_number,
+                part_number_normalized=normalize_part_number(part_number),
+                description=description,
+                is_published=rng.random() > 0.05,
+                is_featured=rng.random() < 0.02,
+                slug=f"{SLUG_PREFIX}{uuid.UUID(int=rng.getrandbits(128)).hex}",
+                search_document=document,
+            )
+            galleries.append(gallery)
+
+            # Long tail: most galleries have a few photos, some have none, a few have many
+            for order in range(min(12, int(rng.paretovariate(1.2)) - 1 + rng.randint(0, 2))):
+                key = f"part_gallery_images/synthetic/{gallery.id.hex}-{order}.jpg"
+                images.append(PartImageUpload(
+                    id=uuid.UUID(int=rng.getrandbits(128)),
+                    gallery=gallery,
+                    image=key,
+                    image_url=f"https://images.example.com/{key}",
+                    r2_key=key,
+                    is_primary=order == 0,
+                    display_order=order,
+                    file_size=rng.randint(80_000, 900_000),
+                    width=1600,
+                    height=1200,
+                ))
+
+            base_price = Decimal(round(rng.lognormvariate(5, 0.9), 2)).quantize(Decimal("0.01"))
+            for price_type in ["retail"] + (["core_charge"] if rng.random() < 0.15 else []):
+                valid_from = today - timedelta(days=rng.randint(0, 365))
+                prices.append(PartPrice(
+                    id=uuid.UUID(int=rng.getrandbits(128)),
+                    year=year,
+                    manufacturer=manufacturer,
+                    model=vehicle,
+                    part_category=category,
+                    part_name=part_name,
+                    part_number=part_number,
+                    part_number_normalized=normalize_part_number(part_number),
+                    condition=rng.choice(PRICE_CONDITIONS),
+                    price_type=price_type,
+                    price=base_price if price_type == "retail" else (base_price * Decimal("0.2")).quantize(Decimal("0.01")),
+                    original_price=(base_price * Decimal("1.25")).quantize(Decimal("0.01")) if rng.random() < 0.3 else None,
+                    shipping_cost=Decimal(rng.choice([0, 0, 15, 25, 49, 99])),
+                    core_charge=Decimal(rng.choice([0, 0, 0, 50, 150])),
+                    in_stock=rng.random() > 0.1,
+                    quantity_available=max(0, int(rng.expovariate(0.5))),
+                    valid_from=valid_from,
+                    valid_until=valid_from + timedelta(days=rng.randint(30, 720)) if rng.random() < 0.4 else None,
+                    gallery_reference=gallery,
+                ))
+
+            if rng.random() < inventory_ratio:
+                stock = max(0, int(rng.expovariate(0.4)))
+                inventory.append(PartInventory(
+                    year=year,
+                    manufacturer=manufacturer,
+                    model=vehicle,
+                    part_category=category,
+                    part_name=part_name,
+                    part_number=part_number,
+                    part_number_normalized=normalize_part_number(part_number),
+                    description=description,
+                    price=base_price,
+                    compare_at_price=(base_price * Decimal("1.2")).quantize(Decimal("0.01")) if rng.random() < 0.25 else None,
+                    stock_quantity=stock,
+                    status="available" if stock else "out_of_stock",
+                    condition=rng.choice(INVENTORY_CONDITIONS),
+                    warranty_months=rng.choice([None, 1, 3, 6, 12]),
+                    gallery_reference=gallery,
+                    is_featured=rng.random() < 0.02,
+                    is_published=rng.random() > 0.05,
+                    slug=f"{SLUG_PREFIX}{uuid.UUID(int=rng.getrandbits(128)).hex}",
+                    search_document=document,
+                ))
+
+        return [
+            (PartImageGallery, galleries),
+            (PartImageUpload, images),
+            (PartPrice, prices),
+            (PartInventory, inventory),
+        ]
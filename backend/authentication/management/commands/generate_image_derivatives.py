@@ -0,0 +1,66 @@
+# authentication/management/commands/generate_image_derivatives.py
+
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from authentication.derivatives import derivative_formats, needs_derivatives, process_instance
+from authentication.models import PartImage, PartImageUpload, ProductImage
+
+TARGETS = {
+    "gallery": PartImageUpload,
+    "product": ProductImage,
+    "part": PartImage,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Create missing WebP/AVIF derivatives and fill width/height/file_size "
+        "for gallery uploads, product images and part images"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--model", choices=list(TARGETS), help="Only process one table")
+        parser.add_argument("--processes", type=int, default=4, help="Pillow worker processes")
+        parser.add_argument("--force", action="store_true", help="Rebuild derivatives that already exist")
+
+    def handle(self, *args, **options):
+        targets = TARGETS
+        if options["model"]:
+            targets = {options["model"]: TARGETS[options["model"]]}
+
+        self.stdout.write(f"Formats: {', '.join(derivative_formats()) or 'none available'}")
+        processes = max(1, options["processes"])
+
+        with ProcessPoolExecutor(max_workers=processes) as executor, \
+                ThreadPoolExecutor(max_workers=processes * 2) as io_pool:
+            for label, model in targets.items():
+                started = time.perf_counter()
+                rows = model.objects.exclude(image="").order_by("pk")
+                pending = [
+                    row for row in rows.iterator(chunk_size=500)
+                    if options["force"] or needs_derivatives(row)
+                ]
+                if options["force"]:
+                    for row in pending:
+                        row.derivatives = {}
+
+                # Storage reads/writes happen in threads, Pillow in the process pool
+                futures = [io_pool.submit(process_instance, row, executor) for row in pending]
+                done = failed = 0
+                for row, future in zip(pending, futures):
+                    try:
+                        future.result()
+                        done += 1
+                    except Exception as e:
+                        failed += 1
+                        self.stderr.write(f"  {label} {row.pk}: {e}")
+
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"{label}: {done} processed, {failed} failed "
+                        f"in {time.perf_counter() - started:.1f}s"
+                    )
+                )
@@ -0,0 +1,479 @@
+# authentication/management/commands/import_inventory.py
+"""
+Bulk import of yard inventory from CSV or JSONL (optionally gzipped).
+
+    python manage.py import_inventory feed.csv --batch-size 2000
+    python manage.py import_inventory feed.jsonl.gz --with-prices
+    python manage.py import_inventory feed.csv --dry-run
+
+Columns / keys (names are matched case-insensitively against existing rows):
+
+    year, manufacturer, model, category, part_name        required
+    part_number, description, price, compare_at_price,
+    stock_quantity, low_stock_threshold, status, condition,
+    weight, dimensions, warranty_months, is_published,
+    is_featured, slug                                     optional
+    price_type, core_charge, shipping_cost                optional (--with-prices)
+
+A row updates an existing part when its slug matches, or when year, make,
+model and normalized part number match; otherwise a new part is created.
+Rows are upserted per batch with bulk_create(update_conflicts=True), one
+transaction per batch, so save() and signals do not run - slug,
+search_document, part_number_normalized and status are filled in here and
+the shared cache versions are bumped once at the end.
+"""
+
+import csv
+import gzip
+import io
+import json
+import time
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from authentication.autocomplete import bump_autocomplete_version
+from authentication.caching import bump_group_version
+from authentication.fitment import bump_shared_version
+from authentication.models import (
+    Manufacturer,
+    PartCategory,
+    PartInventory,
+    PartPrice,
+    VehicleModel,
+)
+from authentication.search import normalize_part_number
+from authentication.slugs import assign_unique_slugs
+
+INVENTORY_UPDATE_FIELDS = [
+    "year",
+    "manufacturer",
+    "model",
+    "part_category",
+    "part_name",
+    "part_number",
+    "part_number_normalized",
+    "description",
+    "price",
+    "compare_at_price",
+    "stock_quantity",
+    "low_stock_threshold",
+    "status",
+    "condition",
+    "weight",
+    "dimensions",
+    "warranty_months",
+    "is_published",
+    "is_featured",
+    "search_document",
+    "updated_at",
+]
+
+PRICE_UPDATE_FIELDS = [
+    "year",
+    "manufacturer",
+    "model",
+    "part_category",
+    "part_name",
+    "part_number",
+    "part_number_normalized",
+    "condition",
+    "price",
+    "original_price",
+    "core_charge",
+    "shipping_cost",
+    "in_stock",
+    "quantity_available",
+    "warranty_months",
+    "updated_at",
+]
+
+# PartInventory.condition -> PartPrice.condition
+PRICE_CONDITIONS = {"used": "used_good"}
+
+TRUE_VALUES = {"1", "true", "yes", "y", "t"}
+FALSE_VALUES = {"0", "false", "no", "n", "f"}
+
+
+class RowError(ValueError):
+    pass
+
+
+# ============================================================================
+# INPUT
+# ============================================================================
+
+def open_text(path):
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8-sig", newline="")
+    return open(path, encoding="utf-8-sig", newline="")
+
+
+def iter_records(path, fmt):
+    """Yield (line_number, dict) without reading the whole file"""
+    with open_text(path) as handle:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, {
+                    (key or "").strip().lower(): value for key, value in record.items()
+                }
+        else:
+            for line_number, line in enumerate(handle, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, RowError(f"invalid JSON: {e}")
+                    continue
+                if not isinstance(record, dict):
+                    yield line_number, RowError("expected a JSON object")
+                    continue
+                yield line_number, {str(key).lower(): value for key, value in record.items()}
+
+
+def detect_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    raise CommandError(f"Cannot tell the format of {path}; pass --format")
+
+
+# ============================================================================
+# PARSING
+# ============================================================================
+
+def _text(record, key, required=False, max_length=None):
+    value = record.get(key)
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise RowError(f"{key} is required")
+    if max_length and len(value) > max_length:
+        raise RowError(f"{key} is longer than {max_length} characters")
+    return value
+
+
+def _int(record, key, default=None, minimum=None):
+    value = _text(record, key)
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise RowError(f"{key} must be an integer, got {value!r}")
+    if minimum is not None and number < minimum:
+        raise RowError(f"{key} must be at least {minimum}")
+    return number
+
+
+def _decimal(record, key, minimum=None):
+    value = _text(record, key).lstrip("$").replace(",", "")
+    if not value:
+        return None
+    try:
+        number = Decimal(value).quantize(Decimal("0.01"))
+    except InvalidOperation:
+        raise RowError(f"{key} must be a number, got {value!r}")
+    if minimum is not None and number < minimum:
+        raise RowError(f"{key} must be at least {minimum}")
+    return number
+
+
+def _bool(record, key, default):
+    value = record.get(key)
+    if isinstance(value, bool):
+        return value
+    value = "" if value is None else str(value).strip().lower()
+    if not value:
+        return default
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise RowError(f"{key} must be true or false, got {value!r}")
+
+
+def _choice(record, key, choices, default):
+    value = _text(record, key).lower().replace(" ", "_") or default
+    if value not in {choice for choice, _ in choices}:
+        raise RowError(f"{key} must be one of {', '.join(c for c, _ in choices)}")
+    return value
+
+
+class ReferenceLookup:
+    """
+    Manufacturer / model / category name -> instance, loaded once.
+
+    Only id and name are fetched, which is all that slug and search
+    document building need, so resolving a row never queries.
+    """
+
+    def __init__(self):
+        by_id = {m.id: m for m in Manufacturer.objects.only("id", "name")}
+        self.manufacturers = {m.name.lower(): m for m in by_id.values()}
+        self.models = {}
+        for vehicle_model in VehicleModel.objects.only("id", "name", "manufacturer_id"):
+            manufacturer = by_id.get(vehicle_model.manufacturer_id)
+            if manufacturer is not None:
+                vehicle_model.manufacturer = manufacturer
+                self.models[(manufacturer.id, vehicle_model.name.lower())] = vehicle_model
+        self.categories = {
+            c.name.lower(): c for c in PartCategory.objects.only("id", "name")
+        }
+
+    def resolve(self, make_name, model_name, category_name):
+        manufacturer = self.manufacturers.get(make_name.lower())
+        if manufacturer is None:
+            raise RowError(f"unknown manufacturer {make_name!r}")
+        vehicle_model = self.models.get((manufacturer.id, model_name.lower()))
+        if vehicle_model is None:
+            raise RowError(f"unknown model {model_name!r} for {manufacturer.name}")
+        category = self.categories.get(category_name.lower())
+        if category is None:
+            raise RowError(f"unknown part category {category_name!r}")
+        return manufacturer, vehicle_model, category
+
+
+def build_part(record, lookup):
+    """Validate one input record and return an unsaved PartInventory"""
+    year = _int(record, "year")
+    if year is None or not 1900 <= year <= timezone.now().year + 2:
+        raise RowError("year is missing or out of range")
+
+    manufacturer, vehicle_model, category = lookup.resolve(
+        _text(record, "manufacturer", required=True),
+        _text(record, "model", required=True),
+        _text(record, "category", required=True),
+    )
+
+    part = PartInventory(
+        year=year,
+        manufacturer=manufacturer,
+        model=vehicle_model,
+        part_category=category,
+        part_name=_text(record, "part_name", required=True, max_length=255),
+        part_number=_text(record, "part_number", max_length=100) or None,
+        description=_text(record, "description") or None,
+        price=_decimal(record, "price", minimum=Decimal("0.01")),
+        compare_at_price=_decimal(record, "compare_at_price"),
+        stock_quantity=_int(record, "stock_quantity", default=0, minimum=0),
+        low_stock_threshold=_int(record, "low_stock_threshold", default=5),
+        status=_choice(record, "status", PartInventory.STATUS_CHOICES, "available"),
+        condition=_choice(record, "condition", PartInventory.CONDITION_CHOICES, "used"),
+        weight=_decimal(record, "weight"),
+        dimensions=_text(record, "dimensions", max_length=100) or None,
+        warranty_months=_int(record, "warranty_months", minimum=0),
+        is_published=_bool(record, "is_published", True),
+        is_featured=_bool(record, "is_featured", False),
+        slug=_text(record, "slug", max_length=255),
+    )
+
+    # Same derived values as PartInventory.save()
+    if part.stock_quantity == 0:
+        part.status = "out_of_stock"
+    elif part.status == "out_of_stock":
+        part.status = "available"
+    part.part_number_normalized = normalize_part_number(part.part_number)
+    part.search_document = part.build_search_document()
+    return part
+
+
+def build_price(part, record):
+    """PartPrice for a part row, or None when the row has no price"""
+    if part.price is None:
+        return None
+    return PartPrice(
+        year=part.year,
+        manufacturer=part.manufacturer,
+        model=part.model,
+        part_category=part.part_category,
+        part_name=part.part_name,
+        part_number=part.part_number,
+        part_number_normalized=part.part_number_normalized,
+        condition=PRICE_CONDITIONS.get(part.condition, part.condition),
+        price_type=_choice(record, "price_type", PartPrice.PRICE_TYPE_CHOICES, "retail"),
+        price=part.price,
+        original_price=part.compare_at_price,
+        core_charge=_decimal(record, "core_charge", minimum=Decimal("0")) or 0,
+        shipping_cost=_decimal(record, "shipping_cost", minimum=Decimal("0")) or 0,
+        in_stock=part.stock_quantity > 0,
+        quantity_available=part.stock_quantity,
+        warranty_months=part.warranty_months,
+    )
+
+
+def unique_fields(fields):
+    # MySQL's ON DUPLICATE KEY UPDATE can't name the conflict target
+    if connection.features.supports_update_conflicts_with_target:
+        return {"unique_fields": fields}
+    return {}
+
+
+def natural_key(part):
+    if not part.part_number_normalized:
+        return None
+    return (part.year, part.manufacturer_id, part.model_id, part.part_number_normalized)
+
+
+# ============================================================================
+# COMMAND
+# ============================================================================
+
+class Command(BaseCommand):
+    help = "Stream CSV/JSONL inventory files into PartInventory (and PartPrice) in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="CSV or JSONL files (.gz allowed)")
+        parser.add_argument("--format", choices=["csv", "jsonl"], help="Override format detection")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per transaction")
+        parser.add_argument("--with-prices", action="store_true", help="Also upsert a PartPrice per priced row")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing")
+        parser.add_argument("--show-errors", type=int, default=20, help="Rejected rows to print")
+
+    def handle(self, *args, **options):
+        self.batch_size = max(1, options["batch_size"])
+        self.with_prices = options["with_prices"]
+        self.dry_run = options["dry_run"]
+        self.show_errors = options["show_errors"]
+        self.stats = {"rows": 0, "inserted": 0, "updated": 0, "prices": 0, "rejected": 0}
+
+        lookup = ReferenceLookup()
+        started = time.perf_counter()
+
+        for path in options["paths"]:
+            fmt = options["format"] or detect_format(path)
+            batch = []
+            for line_number, record in iter_records(path, fmt):
+                self.stats["rows"] += 1
+                try:
+                    if isinstance(record, RowError):
+                        raise record
+                    part = build_part(record, lookup)
+                    price = build_price(part, record) if self.with_prices else None
+                except RowError as e:
+                    self.reject(path, line_number, e)
+                    continue
+                batch.append((part, price))
+                if len(batch) >= self.batch_size:
+                    self.flush(batch, started)
+                    batch = []
+            if batch:
+                self.flush(batch, started)
+
+        if not self.dry_run and self.stats["inserted"] + self.stats["updated"]:
+            # bulk_create skips post_save, so invalidate once for the whole import
+            bump_group_version("parts")
+            bump_group_version("galleries")
+            bump_shared_version()
+            bump_autocomplete_version()
+
+        elapsed = time.perf_counter() - started
+        rate = self.stats["rows"] / elapsed if elapsed else 0
+        summary = (
+            f"{self.stats['rows']} rows in {elapsed:.1f}s ({rate:.0f} rows/sec): "
+            f"{self.stats['inserted']} inserted, {self.stats['updated']} updated, "
+            f"{self.stats['prices']} prices, {self.stats['rejected']} rejected"
+        )
+        if self.dry_run:
+            summary = f"[dry run] {summary}"
+        style = self.style.WARNING if self.stats["rejected"] else self.style.SUCCESS
+        self.stdout.write(style(summary))
+
+    def reject(self, path, line_number, error):
+        self.stats["rejected"] += 1
+        if self.stats["rejected"] <= self.show_errors:
+            self.stderr.write(f"  {path}:{line_number}: {error}")
+
+    def flush(self, batch, started):
+        # Later rows in the batch win over earlier ones with the same key
+        unique = {}
+        for part, price in batch:
+            key = part.slug or natural_key(part) or id(part)
+            unique[key] = (part, price)
+        batch = list(unique.values())
+
+        existing = self.match_existing([part for part, _ in batch])
+        updated = sum(1 for part, _ in batch if part.slug in existing)
+
+        if not self.dry_run:
+            try:
+                with transaction.atomic():
+                    self.write(batch)
+            except DatabaseError as e:
+                self.stats["rejected"] += len(batch)
+                self.stderr.write(self.style.ERROR(f"  batch of {len(batch)} rows failed: {e}"))
+                return
+
+        self.stats["updated"] += updated
+        self.stats["inserted"] += len(batch) - updated
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"  {self.stats['rows']} rows, {self.stats['rejected']} rejected, "
+            f"{self.stats['rows'] / elapsed if elapsed else 0:.0f} rows/sec"
+        )
+
+    def match_existing(self, parts):
+        """
+        Give parts that already exist their stored slug (the upsert key) and
+        return the set of slugs that exist
+        """
+        slugs = [part.slug for part in parts if part.slug]
+        existing = set(PartInventory.objects.filter(slug__in=slugs).values_list("slug", flat=True))
+
+        by_key = {natural_key(part): part for part in parts if not part.slug and natural_key(part)}
+        if by_key:
+            rows = PartInventory.objects.filter(
+                part_number_normalized__in={key[3] for key in by_key}
+            ).values_list("slug", "year", "manufacturer_id", "model_id", "part_number_normalized")
+            for slug, *key in rows:
+                part = by_key.get(tuple(key))
+                if part is not None:
+                    part.slug = slug
+                    existing.add(slug)
+        return existing
+
+    def write(self, batch):
+        parts = [part for part, _ in batch]
+        assign_unique_slugs(parts, lambda part: part.build_slug_base())
+        PartInventory.objects.bulk_create(
+            parts,
+            update_conflicts=True,
+            update_fields=INVENTORY_UPDATE_FIELDS,
+            **unique_fields(["slug"]),
+        )
+
+        priced = [(part, price) for part, price in batch if price is not None]
+        if not priced:
+            return
+
+        # Conflict updates don't return primary keys on every backend
+        ids = dict(
+            PartInventory.objects.filter(slug__in=[part.slug for part, _ in priced])
+            .values_list("slug", "id")
+        )
+        existing_prices = {
+            (inventory_id, price_type): price_id
+            for price_id, inventory_id, price_type in PartPrice.objects.filter(
+                inventory_item_id__in=ids.values()
+            ).values_list("id", "inventory_item_id", "price_type")
+        }
+        prices = []
+        for part, price in priced:
+            price.inventory_item_id = ids[part.slug]
+            price.id = existing_prices.get((price.inventory_item_id, price.price_type), uuid.uuid4())
+            prices.append(price)
+
+        PartPrice.objects.bulk_create(
+            prices,
+            update_conflicts=True,
+            update_fields=PRICE_UPDATE_FIELDS,
+            **unique_fields(["id"]),
+        )
+        self.stats["prices"] += len(prices)
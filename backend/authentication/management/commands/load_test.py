@@ -0,0 +1,154 @@
+# authentication/management/commands/load_test.py
+"""
+Concurrent HTTP load test against a running deployment.
+
+    python manage.py load_test --base-url http://localhost:8000 --concurrency 50 --duration 30
+
+Drives a weighted mix of catalog reads (galleries, search, by_vehicle,
+reference data, sitemap) from --concurrency coroutines over a shared
+httpx.AsyncClient and reports throughput and p50/p95/p99 latency per URL.
+Vehicle and search values are sampled from the local database so that
+by_vehicle requests hit real fitments. Run it once against the sync worker
+and once with DJANGO_ASGI=True to compare per-worker capacity.
+"""
+
+import asyncio
+import random
+import time
+from collections import defaultdict
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.models import Manufacturer, PartImageGallery
+
+SEARCH_TERMS = ["engine", "brake", "filter", "pump", "light", "mirror", "sensor", "bumper"]
+
+# (label, weight); paths are built per request by Command.next_request
+MIX = [
+    ("galleries", 30),
+    ("search", 20),
+    ("by_vehicle", 20),
+    ("parts search", 10),
+    ("models", 10),
+    ("manufacturers", 5),
+    ("sitemap", 5),
+]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class Command(BaseCommand):
+    help = "Load test catalog endpoints over HTTP and report p50/p95/p99 latency and throughput"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://localhost:8000", help="Deployment to test")
+        parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds to run")
+        parser.add_argument("--requests", type=int, help="Stop after this many requests instead")
+        parser.add_argument("--timeout", type=float, default=30, help="Per-request timeout (seconds)")
+        parser.add_argument("--seed", type=int, default=None, help="Random seed for the URL mix")
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options["seed"])
+        self.vehicles = list(
+            PartImageGallery.objects.values_list("year", "manufacturer_id", "model_id").distinct()[:500]
+        )
+        self.manufacturer_ids = list(Manufacturer.objects.filter(is_active=True).values_list("id", flat=True))
+        if not self.vehicles:
+            raise CommandError("No galleries in the database - run generate_catalog first")
+
+        self.stdout.write(
+            f"{options['base_url']}: concurrency {options['concurrency']}, "
+            + (f"{options['requests']} requests" if options["requests"] else f"{options['duration']:.0f}s")
+        )
+        timings, errors, elapsed = asyncio.run(self.run(options))
+        self.report(timings, errors, elapsed)
+
+    def next_request(self):
+        label = self.random.choices([m[0] for m in MIX], weights=[m[1] for m in MIX])[0]
+        if label == "galleries":
+            return label, "/api/part-galleries/", {"page": self.random.randint(1, 5)}
+        if label == "search":
+            return label, "/api/part-galleries/", {"search": self.random.choice(SEARCH_TERMS)}
+        if label == "parts search":
+            return label, "/api/parts/", {"search": self.random.choice(SEARCH_TERMS)}
+        if label == "by_vehicle":
+            year, manufacturer, model = self.random.choice(self.vehicles)
+            return label, "/api/part-galleries/by_vehicle/", {
+                "year": year, "manufacturer": manufacturer, "model": model,
+            }
+        if label == "models":
+            if self.manufacturer_ids and self.random.random() < 0.5:
+                return label, "/api/models/", {"manufacturer_id": self.random.choice(self.manufacturer_ids)}
+            return label, "/api/models/", {}
+        if label == "manufacturers":
+            return label, "/api/manufacturers/", {}
+        return label, "/sitemap.xml", {}
+
+    async def run(self, options):
+        timings = defaultdict(list)
+        errors = defaultdict(int)
+        deadline = time.perf_counter() + options["duration"]
+        remaining = [options["requests"]] if options["requests"] else None
+        limits = httpx.Limits(
+            max_connections=options["concurrency"], max_keepalive_connections=options["concurrency"]
+        )
+
+        async def worker(client):
+            while True:
+                if remaining is not None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                elif time.perf_counter() >= deadline:
+                    return
+                label, path, params = self.next_request()
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path, params=params)
+                except httpx.HTTPError as e:
+                    errors[f"{label}: {type(e).__name__}"] += 1
+                    continue
+                timings[label].append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    errors[f"{label}: HTTP {response.status_code}"] += 1
+
+        started = time.perf_counter()
+        async with httpx.AsyncClient(
+            base_url=options["base_url"], timeout=options["timeout"], limits=limits
+        ) as client:
+            await asyncio.gather(*(worker(client) for _ in range(max(1, options["concurrency"]))))
+        return timings, errors, time.perf_counter() - started
+
+    def report(self, timings, errors, elapsed):
+        self.stdout.write(
+            f"\n{'url':<15} {'requests':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+        everything = []
+        for label, _ in MIX:
+            values = sorted(timings.get(label, []))
+            if not values:
+                continue
+            everything.extend(values)
+            self.stdout.write(
+                f"{label:<15} {len(values):>9} {percentile(values, 0.5):>8.1f} "
+                f"{percentile(values, 0.95):>8.1f} {percentile(values, 0.99):>8.1f} {values[-1]:>8.1f}"
+            )
+        everything.sort()
+        if everything:
+            self.stdout.write(
+                f"{'all':<15} {len(everything):>9} {percentile(everything, 0.5):>8.1f} "
+                f"{percentile(everything, 0.95):>8.1f} {percentile(everything, 0.99):>8.1f} "
+                f"{everything[-1]:>8.1f}"
+            )
+
+        total_errors = sum(errors.values())
+        self.stdout.write(
+            f"\n{len(everything)} responses in {elapsed:.1f}s = {len(everything) / elapsed:.1f} req/s, "
+            f"{total_errors} errors"
+        )
+        for key, count in sorted(errors.items()):
+            self.stdout.write(self.style.WARNING(f"  {key}: {count}"))
@@ -0,0 +1,53 @@
+# authentication/management/commands/rebuild_catalog_cards.py
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from authentication.catalog_cards import CARD_SOURCES, REBUILD_CHUNK_SIZE, rebuild_cards
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the pre-serialized list rows (catalog cards) of parts and galleries "
+        "(backfill after migrating, bulk imports or serializer changes)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=list(CARD_SOURCES),
+            help="Only rebuild one table",
+        )
+        parser.add_argument(
+            "--stale",
+            action="store_true",
+            help="Only build cards that are missing or older than their row",
+        )
+
+    def handle(self, *args, **options):
+        targets = CARD_SOURCES
+        if options["model"]:
+            targets = {options["model"]: CARD_SOURCES[options["model"]]}
+
+        for label, (card_model, source_model, _, _) in targets.items():
+            started = time.perf_counter()
+            rows = source_model.objects.filter(is_published=True)
+            if options["stale"]:
+                rows = rows.filter(Q(card__isnull=True) | ~Q(card__source_updated_at=F("updated_at")))
+            pks = list(rows.order_by("pk").values_list("pk", flat=True))
+
+            built = 0
+            for start in range(0, len(pks), REBUILD_CHUNK_SIZE):
+                built += len(rebuild_cards(label, pks[start:start + REBUILD_CHUNK_SIZE]))
+
+            # Cards of rows that were unpublished without a save signal
+            published = source_model.objects.filter(is_published=True).values("pk")
+            orphans, _ = card_model.objects.exclude(pk__in=published).delete()
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{label}: {built} cards built, {orphans} orphaned cards deleted "
+                    f"in {time.perf_counter() - started:.1f}s"
+                )
+            )
@@ -0,0 +1,44 @@
+# authentication/management/commands/rebuild_search_documents.py
+
+from django.core.management.base import BaseCommand
+
+from authentication.models import PartImageGallery, PartInventory
+
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute search_document for parts and galleries "
+        "(run after renaming manufacturers, models or categories)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=["parts", "galleries"],
+            help="Only rebuild one table",
+        )
+
+    def handle(self, *args, **options):
+        targets = {"parts": PartInventory, "galleries": PartImageGallery}
+        if options["model"]:
+            targets = {options["model"]: targets[options["model"]]}
+
+        for label, model in targets.items():
+            rows = model.objects.select_related("manufacturer", "model", "part_category")
+            batch = []
+            updated = 0
+            for row in rows.iterator(chunk_size=BATCH_SIZE):
+                document = row.build_search_document()
+                if document != row.search_document:
+                    row.search_document = document
+                    batch.append(row)
+                if len(batch) >= BATCH_SIZE:
+                    model.objects.bulk_update(batch, ["search_document"])
+                    updated += len(batch)
+                    batch = []
+            if batch:
+                model.objects.bulk_update(batch, ["search_document"])
+                updated += len(batch)
+            self.stdout.write(self.style.SUCCESS(f"{label}: {updated} search documents updated"))
@@ -0,0 +1,77 @@
+# authentication/management/commands/run_email_worker.py
+
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from authentication.email_outbox import process_batch
+from authentication.email_transports import get_transport
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from the EmailJob outbox"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=getattr(settings, "EMAIL_WORKER_BATCH_SIZE", 20),
+            help="Jobs claimed per round",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=getattr(settings, "EMAIL_WORKER_CONCURRENCY", 4),
+            help="Maximum concurrent sends",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=getattr(settings, "EMAIL_WORKER_POLL_INTERVAL", 2.0),
+            help="Seconds to sleep when the outbox is empty",
+        )
+        parser.add_argument(
+            "--transport",
+            default=None,
+            help="Override settings.EMAIL_TRANSPORT (resend, cloudflare, console, file)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process a single batch and exit",
+        )
+
+    def handle(self, *args, **options):
+        transport = get_transport(options["transport"])
+        self.stdout.write(
+            f"Email worker started (transport={transport.name}, "
+            f"batch={options['batch_size']}, concurrency={options['concurrency']})"
+        )
+
+        self._running = True
+
+        def stop(signum, frame):
+            self._running = False
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        while self._running:
+            close_old_connections()
+            claimed, sent = process_batch(
+                batch_size=options["batch_size"],
+                concurrency=options["concurrency"],
+                transport=transport,
+            )
+            if claimed:
+                self.stdout.write(f"  Processed {claimed} job(s), {sent} sent")
+
+            if options["once"]:
+                break
+            if claimed < options["batch_size"]:
+                time.sleep(options["poll_interval"])
+
+        self.stdout.write(self.style.SUCCESS("Email worker stopped"))
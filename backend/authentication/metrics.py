@@ -0,0 +1,260 @@
+# authentication/metrics.py
+"""
+Per-request instrumentation, exported in Prometheus text format on /metrics.
+
+MetricsMiddleware times every request and labels it with the resolved URL
+name (get_manufacturers, parts-list, ...; "unmatched" for 404s so bots can't
+blow up the label set). While a request runs, a RequestStats object in a
+contextvar collects:
+
+- SQL: a wrapper installed on every database connection (connection_created,
+  see signals.py) counts queries and their time and keeps the statements
+- serializers: time spent building DRF serializer .data, outermost call only
+- outbound HTTP: GA and Resend calls wrapped in observe_outbound()
+
+Rate-limit rejections (ratelimit.py) are counted in nexxa_rate_limited_total.
+
+Requests slower than METRICS_SLOW_REQUEST_MS are logged with their SQL.
+
+With PROMETHEUS_MULTIPROC_DIR set (gunicorn.conf.py does this), each worker
+writes its samples to files there and /metrics aggregates all workers, so it
+does not matter which worker answers the scrape. nginx does not proxy
+/metrics; scrape the backend container directly.
+"""
+
+import contextvars
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+logger = logging.getLogger(__name__)
+
+SLOW_REQUEST_MS = getattr(settings, "METRICS_SLOW_REQUEST_MS", 1000)
+MAX_CAPTURED_QUERIES = 50
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_LATENCY = Histogram(
+    "nexxa_http_request_duration_seconds",
+    "Request latency by route",
+    ["route", "method", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUEST_QUERIES = Histogram(
+    "nexxa_http_request_db_queries",
+    "SQL queries per request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 250),
+)
+REQUEST_DB_TIME = Histogram(
+    "nexxa_http_request_db_seconds",
+    "Time spent in SQL per request",
+    ["route"],
+    buckets=LATENCY_BUCKETS,
+)
+SERIALIZER_TIME = Histogram(
+    "nexxa_serializer_seconds",
+    "Time spent building serializer .data",
+    ["route", "serializer"],
+    buckets=LATENCY_BUCKETS,
+)
+OUTBOUND_TIME = Histogram(
+    "nexxa_outbound_http_seconds",
+    "Outbound HTTP calls (GA, Resend)",
+    ["service", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+RATE_LIMITED = Counter(
+    "nexxa_rate_limited_total",
+    "Requests rejected by rate limits (stage: local pre-check or shared store)",
+    ["route", "scope", "key", "stage"],
+)
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "sql", "serializers", "serializing", "outbound_time")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.sql = []
+        self.serializers = []
+        self.serializing = False
+        self.outbound_time = 0.0
+
+
+_current = contextvars.ContextVar("request_stats", default=None)
+
+
+# ============================================================================
+# COLLECTORS
+# ============================================================================
+
+def record_queries(execute, sql, params, many, context):
+    """execute_wrapper for every connection; a no-op outside requests"""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        stats.queries += 1
+        stats.db_time += elapsed
+        if len(stats.sql) < MAX_CAPTURED_QUERIES:
+            stats.sql.append((elapsed, sql))
+
+
+def install_query_recorder(connection):
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+@contextmanager
+def observe_outbound(service):
+    """Time an outbound HTTP call (works in background threads too)"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        elapsed = time.perf_counter() - started
+        OUTBOUND_TIME.labels(service, outcome).observe(elapsed)
+        stats = _current.get()
+        if stats is not None:
+            stats.outbound_time += elapsed
+
+
+def _timed_data(original):
+    def data(self):
+        stats = _current.get()
+        if stats is None or stats.serializing:
+            return original.fget(self)
+        stats.serializing = True
+        started = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            stats.serializing = False
+            name = type(getattr(self, "child", self)).__name__
+            stats.serializers.append((name, time.perf_counter() - started))
+
+    return property(data)
+
+
+_serializers_patched = False
+
+
+def install_serializer_timing():
+    """Wrap DRF's Serializer.data / ListSerializer.data (once per process)"""
+    global _serializers_patched
+    if _serializers_patched:
+        return
+    from rest_framework import serializers
+
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        cls.data = _timed_data(cls.data)
+    _serializers_patched = True
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+def route_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.url_name or match.view_name or "unnamed"
+
+
+class MetricsMiddleware:
+    """Outermost middleware: latency, SQL, serializer and outbound timings per route"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        install_serializer_timing()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        response = None
+        try:
+            response = self.get_response(request)
+            return response
+        finally:
+            _current.reset(token)
+            self.record(request, response, stats, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await self.get_response(request)
+            return response
+        finally:
+            _current.reset(token)
+            self.record(request, response, stats, time.perf_counter() - started)
+
+    def record(self, request, response, stats, elapsed):
+        route = route_name(request)
+        status = str(response.status_code) if response is not None else "500"
+        REQUEST_LATENCY.labels(route, request.method, status).observe(elapsed)
+        REQUEST_QUERIES.labels(route).observe(stats.queries)
+        REQUEST_DB_TIME.labels(route).observe(stats.db_time)
+        for name, seconds in stats.serializers:
+            SERIALIZER_TIME.labels(route, name).observe(seconds)
+
+        if elapsed * 1000 >= SLOW_REQUEST_MS:
+            serializer_time = sum(seconds for _, seconds in stats.serializers)
+            statements = "\n".join(
+                f"  {seconds * 1000:7.1f}ms  {sql[:500]}"
+                for seconds, sql in sorted(stats.sql, key=lambda item: item[0], reverse=True)
+            )
+            logger.warning(
+                f"Slow request {request.method} {request.get_full_path()} ({route}) "
+                f"{elapsed * 1000:.0f}ms status={status}: "
+                f"{stats.queries} queries {stats.db_time * 1000:.0f}ms, "
+                f"serializers {serializer_time * 1000:.0f}ms, "
+                f"outbound {stats.outbound_time * 1000:.0f}ms\n{statements}"
+            )
+
+
+# ============================================================================
+# ENDPOINT
+# ============================================================================
+
+def metrics_view(request):
+    """GET /metrics - Prometheus text format, aggregated across workers"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
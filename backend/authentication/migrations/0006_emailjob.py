@@ -0,0 +1,51 @@
+# Generated by Django 4.2.11 on 2026-10-18 09:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0005_emaillinkclick_partprice_shippingaddress_trackedlink_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(blank=True, help_text='Notification type', max_length=50)),
+                ('to', models.JSONField(help_text='List of recipient addresses')),
+                ('subject', models.CharField(max_length=255)),
+                ('html_body', models.TextField()),
+                ('text_body', models.TextField(blank=True)),
+                ('reply_to', models.CharField(blank=True, max_length=255)),
+                ('from_email', models.CharField(choices=[('noreply', 'noreply@'), ('info', 'info@')], default='noreply', max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('max_attempts', models.PositiveIntegerField(default=6)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time the worker may try this job')),
+                ('locked_at', models.DateTimeField(blank=True, help_text='When a worker claimed this job', null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Email Job',
+                'verbose_name_plural': 'Email Jobs',
+                'db_table': 'email_jobs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='emailjob',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='email_jobs_status_4f48f0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailjob',
+            index=models.Index(fields=['-created_at'], name='email_jobs_created_e4771d_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.11 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+FULLTEXT_INDEXES = [
+    ("part_inventory", "part_inventory_search_ft"),
+    ("part_image_galleries", "part_image_galleries_search_ft"),
+]
+
+
+def document(*parts):
+    # mirrors authentication.search.build_search_document
+    return " ".join(str(part) for part in parts if part not in (None, "")).lower()
+
+
+def backfill_search_documents(apps, schema_editor):
+    for model_name in ("PartInventory", "PartImageGallery"):
+        model = apps.get_model("authentication", model_name)
+        rows = model.objects.select_related("manufacturer", "model", "part_category")
+        batch = []
+        for row in rows.iterator(chunk_size=2000):
+            row.search_document = document(
+                row.part_name,
+                row.part_number,
+                row.year,
+                row.manufacturer.name,
+                row.model.name,
+                row.part_category.name,
+                row.description,
+            )
+            batch.append(row)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ["search_document"])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ["search_document"])
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    for table, name in FULLTEXT_INDEXES:
+        schema_editor.execute(f"ALTER TABLE `{table}` ADD FULLTEXT INDEX `{name}` (`search_document`)")
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    for table, name in FULLTEXT_INDEXES:
+        schema_editor.execute(f"ALTER TABLE `{table}` DROP INDEX `{name}`")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_manufacturer_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partinventory',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='partimagegallery',
+            name='search_document',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        migrations.RunPython(add_fulltext_indexes, drop_fulltext_indexes),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.11 on 2026-10-18 12:10
+
+import re
+
+from django.db import migrations, models
+
+
+def normalize(value):
+    # mirrors authentication.search.normalize_part_number
+    return re.sub(r"[^A-Z0-9]", "", str(value).upper()) if value else ""
+
+
+def backfill_part_numbers(apps, schema_editor):
+    for model_name in ("PartInventory", "PartPrice", "PartImageGallery"):
+        model = apps.get_model("authentication", model_name)
+        batch = []
+        rows = model.objects.exclude(part_number__isnull=True).exclude(part_number="")
+        for row in rows.only("pk", "part_number").iterator(chunk_size=2000):
+            row.part_number_normalized = normalize(row.part_number)
+            batch.append(row)
+            if len(batch) >= 2000:
+                model.objects.bulk_update(batch, ["part_number_normalized"])
+                batch = []
+        if batch:
+            model.objects.bulk_update(batch, ["part_number_normalized"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0008_search_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='partinventory',
+            name='part_number_normalized',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='part_number upper-cased with separators removed (exact lookups)', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='partprice',
+            name='part_number_normalized',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='part_number upper-cased with separators removed (exact lookups)', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='partimagegallery',
+            name='part_number_normalized',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='part_number upper-cased with separators removed (exact lookups)', max_length=100),
+        ),
+        migrations.RunPython(backfill_part_numbers, migrations.RunPython.noop),
+    ]
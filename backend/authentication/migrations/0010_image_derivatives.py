@@ -0,0 +1,91 @@
+# Generated by Django 4.2.11 on 2026-10-18 14:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('authentication', '0009_part_number_normalized'),
+    ]
+
+    operations = [
+        # ProductImage predates this migration but no earlier one created it
+        migrations.CreateModel(
+            name='ProductImage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('year', models.IntegerField(help_text='Car year')),
+                ('image', models.ImageField(help_text='Product image', upload_to='product_images/%Y/%m/%d/')),
+                ('specification_number', models.IntegerField(default=0, help_text='Number of specifications (e.g., 10)')),
+                ('is_active', models.BooleanField(default=True, help_text='Whether to display this image')),
+                ('uploaded_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('manufacturer', models.ForeignKey(help_text='Car manufacturer', on_delete=django.db.models.deletion.CASCADE, related_name='product_images', to='authentication.manufacturer')),
+                ('model', models.ForeignKey(help_text='Car model', on_delete=django.db.models.deletion.CASCADE, related_name='product_images', to='authentication.vehiclemodel')),
+                ('part_category', models.ForeignKey(help_text='Category of the part', on_delete=django.db.models.deletion.CASCADE, related_name='product_images', to='authentication.partcategory')),
+                ('uploaded_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='uploaded_product_images', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Product Image',
+                'verbose_name_plural': 'Product Images',
+                'db_table': 'product_images',
+                'ordering': ['-uploaded_at'],
+                'indexes': [
+                    models.Index(fields=['manufacturer', 'model', 'year', 'part_category'], name='product_ima_manufac_c5339e_idx'),
+                    models.Index(fields=['is_active'], name='product_ima_is_acti_4b67ff_idx'),
+                    models.Index(fields=['-uploaded_at'], name='product_ima_uploade_8446eb_idx'),
+                ],
+                'unique_together': {('manufacturer', 'model', 'year', 'part_category')},
+            },
+        ),
+        migrations.AddField(
+            model_name='partimageupload',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies (see authentication/derivatives.py)'),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='file_size',
+            field=models.IntegerField(blank=True, help_text='File size in bytes', null=True),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='width',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='height',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='productimage',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies (see authentication/derivatives.py)'),
+        ),
+        migrations.AddField(
+            model_name='partimage',
+            name='file_size',
+            field=models.IntegerField(blank=True, help_text='File size in bytes', null=True),
+        ),
+        migrations.AddField(
+            model_name='partimage',
+            name='width',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='partimage',
+            name='height',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='partimage',
+            name='derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Resized WebP/AVIF copies (see authentication/derivatives.py)'),
+        ),
+    ]
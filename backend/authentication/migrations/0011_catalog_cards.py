@@ -0,0 +1,42 @@
+# Generated by Django 4.2.11 on 2026-10-18 16:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0010_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GalleryCard',
+            fields=[
+                ('payload', models.JSONField(help_text='List serializer output for the row')),
+                ('source_updated_at', models.DateTimeField(help_text='updated_at of the row when the card was built (stale if it differs)', null=True)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('gallery', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='authentication.partimagegallery')),
+            ],
+            options={
+                'verbose_name': 'Gallery Card',
+                'verbose_name_plural': 'Gallery Cards',
+                'db_table': 'part_image_gallery_cards',
+            },
+        ),
+        migrations.CreateModel(
+            name='PartCard',
+            fields=[
+                ('payload', models.JSONField(help_text='List serializer output for the row')),
+                ('source_updated_at', models.DateTimeField(help_text='updated_at of the row when the card was built (stale if it differs)', null=True)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+                ('part', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='authentication.partinventory')),
+            ],
+            options={
+                'verbose_name': 'Part Card',
+                'verbose_name_plural': 'Part Cards',
+                'db_table': 'part_inventory_cards',
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-18 17:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0011_catalog_cards'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='partprice',
+            index=models.Index(fields=['is_active', 'valid_from', 'valid_until'], name='part_prices_is_acti_bc204e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partprice',
+            index=models.Index(fields=['gallery_reference', 'is_active', 'valid_from', 'valid_until'], name='part_prices_gallery_ecc327_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partprice',
+            index=models.Index(fields=['inventory_item', 'is_active', 'valid_from', 'valid_until'], name='part_prices_invento_b87fd2_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:05
+
+from django.db import migrations
+
+# auth_user belongs to django.contrib.auth, so the index is plain SQL rather than AddIndex.
+# Logins look users up by email (authentication.backends.EmailBackend).
+INDEX_NAME = "auth_user_email_ece7f7_idx"
+
+
+def add_email_index(apps, schema_editor):
+    schema_editor.execute(f"CREATE INDEX {INDEX_NAME} ON auth_user (email)")
+
+
+def drop_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "mysql":
+        schema_editor.execute(f"DROP INDEX {INDEX_NAME} ON auth_user")
+    else:
+        schema_editor.execute(f"DROP INDEX {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0012_partprice_validity_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_index, drop_email_index),
+    ]
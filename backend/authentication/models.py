@@ -1,5 +1,7 @@
 # authentication/models.py
 from django.db import models
+from django.db.models import Case, ExpressionWrapper, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Cast, Ceil, Coalesce, Floor
 from django.contrib.auth.models import User
 from django.utils import timezone
 from django.utils.text import slugify
@@ -7,6 +9,10 @@ from django.core.validators import MinValueValidator
 import uuid
 from decimal import Decimal
 from django.core.validators import EmailValidator, RegexValidator
+from django.conf import settings
+from .derivatives import build_derivative_url, build_srcset
+from .search import build_search_document, normalize_part_number
+from .slugs import save_with_unique_slug, slug_base
 
 
 
@@ -28,6 +34,7 @@ class Manufacturer(models.Model):
         default=True, help_text="Whether this manufacturer is currently available"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "manufacturers"
@@ -368,6 +375,169 @@ class ContactSubmission(models.Model):
         return None
 
 
+# ============================================================================
+# EMAIL OUTBOX
+# ============================================================================
+
+class EmailJob(models.Model):
+    """
+    Persistent outbox entry for a transactional email.
+    The request path only inserts rows; the run_email_worker command claims
+    and delivers them with retry and exponential backoff.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_SENDING = "sending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_SENDING, "Sending"),
+        (STATUS_SENT, "Sent"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    FROM_CHOICES = [
+        ("noreply", "noreply@"),
+        ("info", "info@"),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    # What kind of notification this is (e.g. "contact_notification")
+    kind = models.CharField(max_length=50, blank=True, help_text="Notification type")
+
+    # Message
+    to = models.JSONField(help_text="List of recipient addresses")
+    subject = models.CharField(max_length=255)
+    html_body = models.TextField()
+    text_body = models.TextField(blank=True)
+    reply_to = models.CharField(max_length=255, blank=True)
+    from_email = models.CharField(max_length=20, choices=FROM_CHOICES, default="noreply")
+
+    # Delivery state
+    status = models.CharField(
+        max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=6)
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, help_text="Earliest time the worker may try this job"
+    )
+    locked_at = models.DateTimeField(
+        null=True, blank=True, help_text="When a worker claimed this job"
+    )
+    last_error = models.TextField(blank=True)
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "email_jobs"
+        verbose_name = "Email Job"
+        verbose_name_plural = "Email Jobs"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+            models.Index(fields=["-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind or 'email'} to {', '.join(self.to)} ({self.status})"
+
+
+# ============================================================================
+# PRICE QUERYSETS (PartPrice validity, totals and discounts in SQL)
+# ============================================================================
+
+def _price_valid_on(day):
+    return Q(valid_from__lte=day) & (Q(valid_until__isnull=True) | Q(valid_until__gte=day))
+
+
+def _price_total():
+    """price + core_charge + shipping_cost (PartPrice.total_price)"""
+    return ExpressionWrapper(
+        F('price') + Coalesce('core_charge', Value(Decimal('0'))) + Coalesce('shipping_cost', Value(Decimal('0'))),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def _price_discount():
+    """Whole percent off original_price, truncated like PartPrice.discount_percentage"""
+    ratio = ExpressionWrapper(
+        (F('original_price') - F('price')) * Value(100) / F('original_price'),
+        output_field=models.DecimalField(max_digits=20, decimal_places=6),
+    )
+    return Case(
+        When(Q(original_price__isnull=True) | Q(original_price=0) | Q(price=0), then=Value(0)),
+        When(original_price__gte=F('price'), then=Cast(Floor(ratio), models.IntegerField())),
+        default=Cast(Ceil(ratio), models.IntegerField()),
+        output_field=models.IntegerField(),
+    )
+
+
+def _best_current_total(link):
+    """Lowest total of the current prices linked through `link` to the outer row"""
+    prices = (
+        PartPrice.objects.current()
+        .filter(**{link: OuterRef('pk')})
+        .annotate(annotated_total=_price_total())
+        .order_by('annotated_total')
+        .values('annotated_total')[:1]
+    )
+    return Subquery(prices, output_field=models.DecimalField(max_digits=12, decimal_places=2))
+
+
+class PartPriceQuerySet(models.QuerySet):
+
+    def valid_on(self, day=None):
+        """Prices whose valid_from/valid_until range includes day (default today)"""
+        return self.filter(_price_valid_on(day or timezone.now().date()))
+
+    def current(self):
+        """Active prices that are valid today"""
+        return self.valid_on().filter(is_active=True)
+
+    def with_totals(self):
+        """
+        Annotate annotated_total, annotated_discount and annotated_valid, which
+        total_price, discount_percentage and is_valid return when present
+        """
+        return self.annotate(
+            annotated_total=_price_total(),
+            annotated_discount=_price_discount(),
+            annotated_valid=ExpressionWrapper(
+                _price_valid_on(timezone.now().date()), output_field=models.BooleanField()
+            ),
+        )
+
+
+class PartImageGalleryQuerySet(models.QuerySet):
+
+    def with_best_price(self):
+        """best_price: lowest total among the gallery's current prices (NULL without one)"""
+        return self.annotate(best_price=_best_current_total('gallery_reference'))
+
+
+class PartInventoryQuerySet(models.QuerySet):
+
+    def with_best_price(self):
+        """
+        best_price: lowest total among the part's current linked prices,
+        falling back to its own price
+        """
+        return self.annotate(
+            best_price=Coalesce(
+                _best_current_total('inventory_item'),
+                F('price'),
+                output_field=models.DecimalField(max_digits=12, decimal_places=2),
+            )
+        )
+
+
 # ============================================================================
 # INVENTORY MANAGEMENT MODELS (For Selling Parts)
 # ============================================================================
@@ -404,6 +574,10 @@ class PartInventory(models.Model):
     part_number = models.CharField(
         max_length=100, blank=True, null=True, help_text="OEM/Manufacturer part number"
     )
+    part_number_normalized = models.CharField(
+        max_length=100, blank=True, default="", db_index=True, editable=False,
+        help_text="part_number upper-cased with separators removed (exact lookups)"
+    )
     description = models.TextField(blank=True, null=True)
 
     # Images (multiple images support)
@@ -468,6 +642,9 @@ class PartInventory(models.Model):
     is_published = models.BooleanField(default=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
 
+    # Denormalized text for the FULLTEXT index (see search.py)
+    search_document = models.TextField(blank=True, default="", editable=False)
+
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -475,6 +652,8 @@ class PartInventory(models.Model):
         User, on_delete=models.SET_NULL, null=True, blank=True
     )
 
+    objects = PartInventoryQuerySet.as_manager()
+
     class Meta:
         db_table = "part_inventory"
         ordering = ["-created_at"]
@@ -492,25 +671,40 @@ class PartInventory(models.Model):
         )
 
     def save(self, *args, **kwargs):
-        # Auto-generate slug if not provided
-        if not self.slug:
-            base_slug = slugify(
-                f"{self.year}-{self.manufacturer.name}-{self.model.name}-{self.part_name}"
-            )
-            slug = base_slug
-            counter = 1
-            while PartInventory.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-
         # Auto-update status based on stock
         if self.stock_quantity == 0:
             self.status = "out_of_stock"
         elif self.stock_quantity > 0 and self.status == "out_of_stock":
             self.status = "available"
 
-        super().save(*args, **kwargs)
+        self.part_number_normalized = normalize_part_number(self.part_number)
+        self.search_document = self.build_search_document()
+
+        # Auto-generate slug if not provided
+        if not self.slug:
+            save_with_unique_slug(
+                self,
+                self.build_slug_base(),
+                lambda: super(PartInventory, self).save(*args, **kwargs),
+            )
+        else:
+            super().save(*args, **kwargs)
+
+    def build_slug_base(self):
+        return slug_base(
+            slugify(f"{self.year}-{self.manufacturer.name}-{self.model.name}-{self.part_name}")
+        )
+
+    def build_search_document(self):
+        return build_search_document(
+            self.part_name,
+            self.part_number,
+            self.year,
+            self.manufacturer.name,
+            self.model.name,
+            self.part_category.name,
+            self.description,
+        )
 
     @property
     def is_low_stock(self):
@@ -592,6 +786,14 @@ class PartPrice(models.Model):
         null=True,
         help_text="OEM or manufacturer part number (optional)"
     )
+    part_number_normalized = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        db_index=True,
+        editable=False,
+        help_text="part_number upper-cased with separators removed (exact lookups)"
+    )
     
     # Pricing Information
     condition = models.CharField(
@@ -713,6 +915,8 @@ class PartPrice(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = PartPriceQuerySet.as_manager()
+    
     class Meta:
         db_table = 'part_prices'
         verbose_name = 'Part Price'
@@ -723,6 +927,10 @@ class PartPrice(models.Model):
             models.Index(fields=['part_category']),
             models.Index(fields=['is_active', 'in_stock']),
             models.Index(fields=['condition', 'price_type']),
+            # current() and the with_best_price() subqueries
+            models.Index(fields=['is_active', 'valid_from', 'valid_until']),
+            models.Index(fields=['gallery_reference', 'is_active', 'valid_from', 'valid_until']),
+            models.Index(fields=['inventory_item', 'is_active', 'valid_from', 'valid_until']),
         ]
     
     def __str__(self):
@@ -750,6 +958,9 @@ class PartPrice(models.Model):
     @property
     def discount_percentage(self):
         """Calculate discount percentage if original price exists"""
+        annotated = getattr(self, 'annotated_discount', None)
+        if annotated is not None:
+            return annotated
         if self.original_price and self.price:
             return int(((self.original_price - self.price) / self.original_price) * 100)
         return 0
@@ -757,6 +968,9 @@ class PartPrice(models.Model):
     @property
     def total_price(self):
         """Calculate total price including core charge and shipping"""
+        annotated = getattr(self, 'annotated_total', None)
+        if annotated is not None:
+            return annotated
         total = self.price
         if self.core_charge:
             total += self.core_charge
@@ -767,6 +981,9 @@ class PartPrice(models.Model):
     @property
     def is_valid(self):
         """Check if price is currently valid based on date range"""
+        annotated = getattr(self, 'annotated_valid', None)
+        if annotated is not None:
+            return bool(annotated)
         today = timezone.now().date()
         if self.valid_until:
             return self.valid_from <= today <= self.valid_until
@@ -784,6 +1001,8 @@ class PartPrice(models.Model):
             self.part_category = self.gallery_reference.part_category
             self.part_name = self.gallery_reference.part_name
 
+        self.part_number_normalized = normalize_part_number(self.part_number)
+
         super().save(*args, **kwargs)
 
 
@@ -804,6 +1023,13 @@ class PartImage(models.Model):
     image = models.ImageField(upload_to="parts/images/%Y/%m/")
     caption = models.CharField(max_length=255, blank=True, null=True)
     order = models.IntegerField(default=0, help_text="Display order")
+    file_size = models.IntegerField(null=True, blank=True, help_text="File size in bytes")
+    width = models.IntegerField(null=True, blank=True)
+    height = models.IntegerField(null=True, blank=True)
+    derivatives = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text="Resized WebP/AVIF copies (see authentication/derivatives.py)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -815,6 +1041,14 @@ class PartImage(models.Model):
     def __str__(self):
         return f"Image for {self.part.part_name}"
 
+    @property
+    def thumbnail_url(self):
+        return build_derivative_url(self.derivatives, settings.THUMBNAIL_SIZE) or self.image.url
+
+    @property
+    def srcset(self):
+        return build_srcset(self.derivatives)
+
 
 # ============================================================================
 # PART IMAGE GALLERY MODELS (For Reference/Catalog with R2 Storage)
@@ -862,6 +1096,14 @@ class PartImageGallery(models.Model):
         null=True,
         help_text="OEM or manufacturer part number (optional)"
     )
+    part_number_normalized = models.CharField(
+        max_length=100,
+        blank=True,
+        default='',
+        db_index=True,
+        editable=False,
+        help_text="part_number upper-cased with separators removed (exact lookups)"
+    )
     description = models.TextField(
         blank=True,
         null=True,
@@ -893,6 +1135,11 @@ class PartImageGallery(models.Model):
     # Auto-generated slug for URLs
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     
+    # Denormalized text for the FULLTEXT index (see search.py)
+    search_document = models.TextField(blank=True, default='', editable=False)
+    
+    objects = PartImageGalleryQuerySet.as_manager()
+    
     class Meta:
         db_table = 'part_image_galleries'
         verbose_name = 'Part Image Gallery'
@@ -908,19 +1155,34 @@ class PartImageGallery(models.Model):
         return f"{self.year} {self.manufacturer.name} {self.model.name} - {self.part_name}"
     
     def save(self, *args, **kwargs):
+        self.part_number_normalized = normalize_part_number(self.part_number)
+        self.search_document = self.build_search_document()
+        
         # Auto-generate slug
         if not self.slug:
-            base_slug = slugify(
-                f"{self.year}-{self.manufacturer.name}-{self.model.name}-{self.part_name}"
+            save_with_unique_slug(
+                self,
+                self.build_slug_base(),
+                lambda: super(PartImageGallery, self).save(*args, **kwargs),
             )
-            slug = base_slug
-            counter = 1
-            while PartImageGallery.objects.filter(slug=slug).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        
-        super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+    
+    def build_slug_base(self):
+        return slug_base(
+            slugify(f"{self.year}-{self.manufacturer.name}-{self.model.name}-{self.part_name}")
+        )
+    
+    def build_search_document(self):
+        return build_search_document(
+            self.part_name,
+            self.part_number,
+            self.year,
+            self.manufacturer.name,
+            self.model.name,
+            self.part_category.name,
+            self.description,
+        )
     
     @property
     def r2_folder_path(self):
@@ -929,7 +1191,10 @@ class PartImageGallery(models.Model):
     
     @property
     def image_count(self):
-        """Count of images in this gallery"""
+        """Count of images in this gallery (uses the list annotation when present)"""
+        annotated = getattr(self, 'images_count', None)
+        if annotated is not None:
+            return annotated
         return self.images.count()
 
 
@@ -993,6 +1258,10 @@ class PartImageUpload(models.Model):
     )
     width = models.IntegerField(null=True, blank=True)
     height = models.IntegerField(null=True, blank=True)
+    derivatives = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text="Resized WebP/AVIF copies (see authentication/derivatives.py)"
+    )
     
     # Tracking
     uploaded_by = models.ForeignKey(
@@ -1017,13 +1286,27 @@ class PartImageUpload(models.Model):
     def __str__(self):
         return f"Image for {self.gallery.part_name} - {self.caption or 'No caption'}"
     
+    @staticmethod
+    def build_thumbnail_url(image_url, derivatives=None):
+        """
+        Stored thumbnail derivative if there is one, otherwise the R2 URL
+        with Cloudflare Image Resizing parameters
+        """
+        thumbnail = build_derivative_url(derivatives, settings.THUMBNAIL_SIZE)
+        if thumbnail:
+            return thumbnail
+        if image_url:
+            return f"{image_url}?width=300&height=300&fit=cover"
+        return None
+
     @property
     def thumbnail_url(self):
-        """Return R2 URL with thumbnail transformation (if available)"""
-        if self.image_url:
-            # Cloudflare Image Resizing parameters
-            return f"{self.image_url}?width=300&height=300&fit=cover"
-        return None
+        """Return thumbnail derivative or R2 URL with thumbnail transformation (if available)"""
+        return self.build_thumbnail_url(self.image_url, self.derivatives)
+
+    @property
+    def srcset(self):
+        return build_srcset(self.derivatives)
     
     @property
     def full_url(self):
@@ -1061,6 +1344,55 @@ class PartImageTag(models.Model):
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
+
+# ============================================================================
+# CATALOG CARDS (pre-serialized list rows, see catalog_cards.py)
+# ============================================================================
+
+class CatalogCard(models.Model):
+    """
+    The exact list-view payload of one catalog row, rebuilt when the row or
+    anything it displays changes
+    """
+    
+    payload = models.JSONField(help_text="List serializer output for the row")
+    source_updated_at = models.DateTimeField(
+        null=True,
+        help_text="updated_at of the row when the card was built (stale if it differs)"
+    )
+    built_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+
+
+class GalleryCard(CatalogCard):
+    gallery = models.OneToOneField(
+        PartImageGallery,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='card'
+    )
+    
+    class Meta:
+        db_table = 'part_image_gallery_cards'
+        verbose_name = 'Gallery Card'
+        verbose_name_plural = 'Gallery Cards'
+
+
+class PartCard(CatalogCard):
+    part = models.OneToOneField(
+        PartInventory,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='card'
+    )
+    
+    class Meta:
+        db_table = 'part_inventory_cards'
+        verbose_name = 'Part Card'
+        verbose_name_plural = 'Part Cards'
+
 # =================================================================================
 # registration models
 # =================================================================================
@@ -1164,6 +1496,19 @@ class ProductImage(models.Model):
         help_text="Product image"
     )
     
+    # Image properties (auto-filled)
+    file_size = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text="File size in bytes"
+    )
+    width = models.IntegerField(null=True, blank=True)
+    height = models.IntegerField(null=True, blank=True)
+    derivatives = models.JSONField(
+        default=dict, blank=True, editable=False,
+        help_text="Resized WebP/AVIF copies (see authentication/derivatives.py)"
+    )
+    
     # Specification as a number (e.g., 10 specifications)
     specification_number = models.IntegerField(
         default=0,
@@ -1199,4 +1544,14 @@ class ProductImage(models.Model):
         unique_together = [['manufacturer', 'model', 'year', 'part_category']]
     
     def __str__(self):
-        return f"{self.manufacturer.name} {self.model.name} {self.year} - {self.part_category.name}"
\ No newline at end of file
+        return f"{self.manufacturer.name} {self.model.name} {self.year} - {self.part_category.name}"
+
+    @property
+    def thumbnail_url(self):
+        return build_derivative_url(self.derivatives, settings.THUMBNAIL_SIZE) or (
+            self.image.url if self.image else None
+        )
+
+    @property
+    def srcset(self):
+        return build_srcset(self.derivatives)
\ No newline at end of file
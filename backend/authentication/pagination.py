@@ -0,0 +1,67 @@
+# authentication/pagination.py
+"""
+Pagination classes for catalog list endpoints
+"""
+
+import json
+
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class GalleryCursorPagination(CursorPagination):
+    """
+    Keyset (cursor) pagination for the part gallery list.
+
+    Pages are located with a WHERE clause on the ordering column instead of
+    OFFSET, so deep pages cost the same as the first one.
+
+    Usage:
+        GET /api/part-galleries/                  - first page
+        GET /api/part-galleries/?page_size=50     - custom page size (capped)
+        GET /api/part-galleries/?cursor=<token>   - follow "next"/"previous"
+
+    The serialized page is also held to a byte budget: rows that would push
+    the payload past API_RESPONSE_BUDGET_BYTES are moved to the next page.
+    """
+
+    page_size = getattr(settings, 'GALLERY_PAGE_SIZE', 24)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'GALLERY_MAX_PAGE_SIZE', 100)
+    response_budget_bytes = getattr(settings, 'API_RESPONSE_BUDGET_BYTES', 512 * 1024)
+    ordering = '-created_at'
+
+    def get_paginated_response(self, data):
+        data = self.apply_response_budget(data)
+        return super().get_paginated_response(data)
+
+    def apply_response_budget(self, data):
+        """
+        Trim serialized rows that exceed the response budget.
+
+        The first row is always kept so a single oversized row can never
+        stall pagination. When rows are dropped, the next cursor is moved
+        to the first dropped row so nothing is skipped.
+        """
+        if not self.response_budget_bytes or not data:
+            return data
+
+        used = 0
+        keep = 0
+        for row in data:
+            size = len(json.dumps(row, cls=JSONEncoder))
+            if keep and used + size > self.response_budget_bytes:
+                break
+            used += size
+            keep += 1
+
+        if keep == len(data):
+            return data
+
+        self.next_position = self._get_position_from_instance(
+            self.page[keep], self.ordering
+        )
+        self.page = self.page[:keep]
+        self.has_next = True
+        return data[:keep]
@@ -0,0 +1,62 @@
+# authentication/pricing.py
+"""
+Best-price filtering and ordering for the catalog ViewSets.
+
+    GET /api/part-galleries/?max_price=150
+    GET /api/part-galleries/?ordering=best_price
+    GET /api/parts/?ordering=-best_price&max_price=80
+
+best_price is computed in SQL by the querysets' with_best_price() (lowest
+total of the row's current PartPrices; parts fall back to their own price),
+so neither filter loads PartPrice rows into Python. Rows without a best
+price are left out when either parameter is used: they have no price to
+compare, and cursor pagination cannot page over NULLs.
+
+Add "best_price" to the view's ordering_fields and list BestPriceFilter
+before the ordering filter.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+
+BEST_PRICE = "best_price"
+
+
+class BestPriceFilter(filters.BaseFilterBackend):
+    max_price_param = "max_price"
+    ordering_param = filters.OrderingFilter.ordering_param
+
+    @classmethod
+    def uses_current_prices(cls, request):
+        """
+        True when the request filters or orders on best_price, whose rows
+        change as prices become valid or expire with the date
+        """
+        return bool(cls._max_price(request) or cls._ordered(request))
+
+    @classmethod
+    def _max_price(cls, request):
+        return request.query_params.get(cls.max_price_param, "").strip()
+
+    @classmethod
+    def _ordered(cls, request):
+        ordering = request.query_params.get(cls.ordering_param, "")
+        return BEST_PRICE in (field.strip().lstrip("-") for field in ordering.split(","))
+
+    def filter_queryset(self, request, queryset, view):
+        max_price = self._max_price(request)
+        if not max_price and not self._ordered(request):
+            return queryset
+
+        queryset = queryset.with_best_price().filter(best_price__isnull=False)
+        if max_price:
+            try:
+                limit = Decimal(max_price)
+            except InvalidOperation:
+                raise ValidationError({self.max_price_param: "Must be a number."})
+            if not limit.is_finite():
+                raise ValidationError({self.max_price_param: "Must be a number."})
+            queryset = queryset.filter(best_price__lte=limit)
+        return queryset
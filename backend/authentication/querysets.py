@@ -0,0 +1,35 @@
+# authentication/querysets.py
+"""
+Correlated-subquery annotations shared by the API views and the admin, so
+list pages resolve per-row image data in the same query as the rows.
+"""
+
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import PartImageUpload
+
+
+def annotate_primary_image(galleries):
+    """Add primary_image_url / _file / _derivatives as correlated subqueries"""
+    primary_image = PartImageUpload.objects.filter(gallery=OuterRef("pk")).order_by(
+        "-is_primary", "display_order", "uploaded_at"
+    )
+    return galleries.annotate(
+        primary_image_url=Subquery(primary_image.values("image_url")[:1]),
+        primary_image_file=Subquery(primary_image.values("image")[:1]),
+        primary_image_derivatives=Subquery(primary_image.values("derivatives")[:1]),
+    )
+
+
+def annotate_image_count(galleries):
+    """Add images_count (read by PartImageGallery.image_count) without a GROUP BY on the outer query"""
+    image_count = (
+        PartImageUpload.objects.filter(gallery=OuterRef("pk"))
+        .order_by()
+        .values("gallery")
+        .annotate(total=Count("id"))
+        .values("total")
+    )
+    return galleries.annotate(images_count=Coalesce(Subquery(image_count[:1]), 0))
+
@@ -0,0 +1,348 @@
+# authentication/ratelimit.py
+"""
+Rate limits for the public (AllowAny) form, auth and analytics endpoints.
+
+    @api_view(["POST"])
+    @permission_classes([AllowAny])
+    @throttle_classes([FormRateThrottle])
+    def submit_contact_form(request): ...
+
+    @csrf_exempt
+    @require_http_methods(["POST"])
+    @rate_limited("tracking")
+    def track_analytics_event(request): ...
+
+Each scope in settings.RATE_LIMITS has up to three keys, each its own
+bucket per route:
+
+- ip: per client address
+- email: per "email" in the request body (DRF views only)
+- route: all clients together, a ceiling on the outbound mail/GA work a
+  route can be made to do
+
+Buckets use GCRA (a token bucket stored as one number, the theoretical
+arrival time of the next request): "10/hour" allows a burst of 10, then one
+request every 6 minutes. With Redis the read-compare-write is one Lua
+script, so all workers share each bucket atomically; with the local-memory
+cache (development) it runs under a process lock.
+
+Two in-process checks run before the shared store is touched: a bucket the
+store rejected stays rejected in this worker until its Retry-After has
+passed, and a per-worker copy of each bucket rejects requests this worker
+alone has already let through too many of (it can only under-count the
+shared one). A flood from one client costs one Redis call per worker and
+retry window. If Redis is unreachable the limits fall back to those local
+buckets rather than failing requests.
+
+Rejections answer 429 with Retry-After and are counted in
+nexxa_rate_limited_total (metrics.py).
+"""
+
+import asyncio
+import functools
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from django.http import JsonResponse
+from rest_framework.throttling import BaseThrottle
+
+from .analytics import get_client_ip
+from .metrics import RATE_LIMITED, route_name
+
+logger = logging.getLogger(__name__)
+
+KEY_KINDS = ("ip", "email", "route")
+LOCAL_MAX_BUCKETS = 20000
+
+_PERIODS = {
+    "s": 1, "sec": 1, "second": 1,
+    "m": 60, "min": 60, "minute": 60,
+    "h": 3600, "hour": 3600,
+    "d": 86400, "day": 86400,
+}
+
+
+def parse_rate(rate):
+    """"10/hour", "30/15min" -> (requests, period in seconds)"""
+    count, _, period = rate.partition("/")
+    match = re.fullmatch(r"(\d*)\s*([a-z]+?)s?", period.strip().lower())
+    if not match or match.group(2) not in _PERIODS:
+        raise ValueError(f"Invalid rate {rate!r}")
+    return int(count), int(match.group(1) or 1) * _PERIODS[match.group(2)]
+
+
+_parsed = {}
+
+
+def scope_limits(scope):
+    """{key kind: (requests, period)} for a scope; empty when disabled"""
+    if not getattr(settings, "RATE_LIMIT_ENABLED", True):
+        return {}
+    if scope not in _parsed:
+        configured = getattr(settings, "RATE_LIMITS", {}).get(scope, {})
+        _parsed[scope] = {
+            kind: parse_rate(configured[kind]) for kind in KEY_KINDS if configured.get(kind)
+        }
+    return _parsed[scope]
+
+
+def client_ip(request):
+    # nginx overwrites X-Real-IP with the peer address; the first
+    # X-Forwarded-For entry is whatever the client sent
+    return request.META.get("HTTP_X_REAL_IP") or get_client_ip(request)
+
+
+def _identity(kind, request):
+    if kind == "ip":
+        return client_ip(request)
+    if kind == "email":
+        # Parsed body of DRF requests; plain Django requests have none
+        data = getattr(request, "data", None)
+        email = data.get("email") if hasattr(data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:20]
+    return "all"
+
+
+# ============================================================================
+# GCRA
+# ============================================================================
+
+def gcra(tat, now, requests, period):
+    """(allowed, new tat, retry after) for one request against a bucket"""
+    interval = period / requests
+    tat = max(tat or now, now)
+    allow_at = tat + interval - period
+    if now < allow_at:
+        return False, tat, allow_at - now
+    return True, tat + interval, 0.0
+
+
+class LocalBuckets:
+    """Per-worker pre-check: known-rejected buckets and this worker's own counts"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tats = {}
+        self.blocked = {}
+
+    def check(self, bucket, requests, period, now):
+        """Seconds to wait if the bucket is known to be over its limit, else 0"""
+        with self.lock:
+            until = self.blocked.get(bucket)
+            if until is not None:
+                if now < until:
+                    return until - now
+                del self.blocked[bucket]
+            allowed, _, retry_after = gcra(self.tats.get(bucket), now, requests, period)
+            return 0.0 if allowed else retry_after
+
+    def commit(self, bucket, requests, period, now):
+        with self.lock:
+            _, self.tats[bucket], _ = gcra(self.tats.get(bucket), now, requests, period)
+            if len(self.tats) > LOCAL_MAX_BUCKETS:
+                self.prune(now)
+
+    def block(self, bucket, until):
+        with self.lock:
+            self.blocked[bucket] = until
+            if len(self.blocked) > LOCAL_MAX_BUCKETS:
+                self.prune(until)
+
+    def prune(self, now):
+        # A bucket whose tat has passed is full again, same as a missing one
+        self.tats = {bucket: tat for bucket, tat in self.tats.items() if tat > now}
+        self.blocked = {bucket: until for bucket, until in self.blocked.items() if until > now}
+        if len(self.tats) > LOCAL_MAX_BUCKETS:
+            self.tats.clear()
+
+
+# KEYS[1] bucket; ARGV now, interval, period (seconds). Returns {allowed, retry after}
+GCRA_SCRIPT = """
+local now = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local period = tonumber(ARGV[3])
+local tat = tonumber(redis.call('GET', KEYS[1]) or ARGV[1])
+if tat < now then tat = now end
+local allow_at = tat + interval - period
+if now < allow_at then
+    return {0, tostring(allow_at - now)}
+end
+local new_tat = tat + interval
+redis.call('SET', KEYS[1], tostring(new_tat), 'PX', math.ceil((new_tat - now) * 1000))
+return {1, '0'}
+"""
+
+
+class SharedBuckets:
+    """GCRA buckets in the default cache, shared by every worker"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.script = None
+
+    def hit(self, bucket, requests, period, now):
+        store = caches["default"]
+        name = f"ratelimit:{bucket}"
+        if isinstance(store, RedisCache):
+            key = store.make_key(name)
+            client = store._cache.get_client(key, write=True)
+            if self.script is None:
+                self.script = client.register_script(GCRA_SCRIPT)
+            allowed, retry_after = self.script(
+                keys=[key], args=[repr(now), repr(period / requests), period], client=client
+            )
+            return bool(int(allowed)), float(retry_after)
+
+        # Local-memory cache: the store is this process, so a process lock is atomic enough
+        with self.lock:
+            allowed, tat, retry_after = gcra(store.get(name), now, requests, period)
+            if allowed:
+                store.set(name, tat, math.ceil(tat - now))
+            return allowed, retry_after
+
+
+_local = LocalBuckets()
+_shared = SharedBuckets()
+
+
+# ============================================================================
+# CHECKS
+# ============================================================================
+
+def _reject(request, scope, kind, stage):
+    RATE_LIMITED.labels(route_name(request), scope, kind, stage).inc()
+
+
+def _local_check(scope, request, now):
+    """(retry after, buckets to check in the shared store)"""
+    route = route_name(request)
+    buckets = []
+    for kind, (requests, period) in scope_limits(scope).items():
+        identity = _identity(kind, request)
+        if identity is None:
+            continue
+        bucket = f"{scope}:{route}:{kind}:{identity}"
+        retry_after = _local.check(bucket, requests, period, now)
+        if retry_after:
+            _reject(request, scope, kind, "local")
+            return retry_after, []
+        buckets.append((kind, bucket, requests, period))
+    return 0.0, buckets
+
+
+def _shared_check(scope, request, buckets, now):
+    for kind, bucket, requests, period in buckets:
+        try:
+            allowed, retry_after = _shared.hit(bucket, requests, period, now)
+        except Exception as e:
+            logger.warning(f"Rate limit store unavailable, using local buckets only: {e}")
+            allowed, retry_after = True, 0.0
+        if not allowed:
+            _local.block(bucket, now + retry_after)
+            _reject(request, scope, kind, "shared")
+            return retry_after
+        _local.commit(bucket, requests, period, now)
+    return 0.0
+
+
+def check_rate_limits(scope, request):
+    """Seconds the client has to wait (0 when allowed); counts the request if allowed"""
+    now = time.time()
+    retry_after, buckets = _local_check(scope, request, now)
+    if retry_after or not buckets:
+        return retry_after
+    return _shared_check(scope, request, buckets, now)
+
+
+async def acheck_rate_limits(scope, request):
+    """check_rate_limits() for async views; only the shared-store call leaves the event loop"""
+    now = time.time()
+    retry_after, buckets = _local_check(scope, request, now)
+    if retry_after or not buckets:
+        return retry_after
+    return await sync_to_async(_shared_check, thread_sensitive=False)(scope, request, buckets, now)
+
+
+# ============================================================================
+# DRF THROTTLES
+# ============================================================================
+
+class SharedRateThrottle(BaseThrottle):
+    """Checks every key configured for the scope; DRF adds Retry-After from wait()"""
+
+    scope = None
+
+    def allow_request(self, request, view):
+        self.retry_after = check_rate_limits(self.scope, request)
+        return not self.retry_after
+
+    def wait(self):
+        return math.ceil(self.retry_after)
+
+
+class FormRateThrottle(SharedRateThrottle):
+    scope = "forms"
+
+
+class RegisterRateThrottle(SharedRateThrottle):
+    scope = "register"
+
+
+class LoginRateThrottle(SharedRateThrottle):
+    scope = "login"
+
+
+class TrackingRateThrottle(SharedRateThrottle):
+    scope = "tracking"
+
+
+class AnalyticsTestRateThrottle(SharedRateThrottle):
+    scope = "analytics_test"
+
+
+# ============================================================================
+# PLAIN DJANGO VIEWS
+# ============================================================================
+
+def _too_many_requests(retry_after):
+    response = JsonResponse(
+        {"success": False, "error": "Too many requests, please try again later"}, status=429
+    )
+    response["Retry-After"] = str(math.ceil(retry_after))
+    return response
+
+
+def rate_limited(scope):
+    """Rate limits (ip and route keys) for a plain sync or async function view"""
+
+    def decorator(view):
+        if asyncio.iscoroutinefunction(view):
+            @functools.wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                retry_after = await acheck_rate_limits(scope, request)
+                if retry_after:
+                    return _too_many_requests(retry_after)
+                return await view(request, *args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            retry_after = check_rate_limits(scope, request)
+            if retry_after:
+                return _too_many_requests(retry_after)
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
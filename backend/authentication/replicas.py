@@ -0,0 +1,180 @@
+# authentication/replicas.py
+"""
+Read-replica routing for catalog reads.
+
+Only code that opts in reads from a replica:
+
+    @use_replica                       # function views (outermost decorator)
+    @api_view(["GET"])
+    def get_manufacturers(request): ...
+
+    class PartInventoryViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet): ...
+
+and only for GET/HEAD/OPTIONS requests. Everything else (writes, admin, auth,
+background jobs) uses "default". A replica is picked once per request,
+weighted by settings.DATABASE_REPLICA_WEIGHTS.
+
+Read-your-writes: any write through the router marks the request, and
+ReplicaStickinessMiddleware then sets a short-lived cookie; while it is
+valid that client's reads stay on the primary, hiding replication lag.
+Results shared with every client are read inside primary_reads() instead:
+caching.py recomputes cached responses there, and reads ETag validators and
+bodies there for DATABASE_REPLICA_STICKY_SECONDS after a group is bumped.
+
+settings.py only installs ReplicaRouter and the middleware when replicas are
+configured (DB_REPLICAS), so a single-database deployment pays nothing.
+"""
+
+import asyncio
+import contextvars
+import functools
+import random
+import time
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+PIN_COOKIE = "db_pin"
+
+_read_alias = contextvars.ContextVar("replica_read_alias", default=None)
+_wrote = contextvars.ContextVar("replica_wrote", default=False)
+
+
+def replica_aliases():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+
+def choose_replica():
+    aliases = replica_aliases()
+    if not aliases:
+        return None
+    weights = getattr(settings, "DATABASE_REPLICA_WEIGHTS", {})
+    return random.choices(aliases, weights=[weights.get(alias, 1) for alias in aliases])[0]
+
+
+def is_pinned(request):
+    """True while the client is inside its post-write stickiness window"""
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+@contextmanager
+def replica_reads(request):
+    """Route reads inside the block to a replica when the request allows it"""
+    token = None
+    if replica_aliases() and request.method in SAFE_METHODS and not is_pinned(request):
+        token = _read_alias.set(choose_replica())
+    try:
+        yield
+    finally:
+        if token is not None:
+            _read_alias.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Route reads inside the block to default, even within a replica request"""
+    token = _read_alias.set(None)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def use_replica(view):
+    """Function-view decorator; put it above @api_view"""
+
+    if asyncio.iscoroutinefunction(view):
+        @functools.wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            # contextvars follow the ORM's sync_to_async hop into its thread
+            with replica_reads(request):
+                return await view(request, *args, **kwargs)
+
+        return async_wrapper
+
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads(request):
+            return view(request, *args, **kwargs)
+
+    return wrapper
+
+
+class ReplicaReadMixin:
+    """ViewSet mixin: safe-method requests read from a replica"""
+
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads(request):
+            return super().dispatch(request, *args, **kwargs)
+
+
+class ReplicaRouter:
+    """
+    DATABASE_ROUTERS entry: reads go to the replica chosen for the current
+    request (if any), writes and migrations always go to default
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # Inside a transaction, read what the transaction sees
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as default
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaStickinessMiddleware:
+    """Pin a client to the primary for DATABASE_REPLICA_STICKY_SECONDS after it writes"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.window = getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _wrote.set(False)
+        try:
+            return self.pin_after_write(request, self.get_response(request))
+        finally:
+            _wrote.reset(token)
+
+    async def __acall__(self, request):
+        token = _wrote.set(False)
+        try:
+            return self.pin_after_write(request, await self.get_response(request))
+        finally:
+            _wrote.reset(token)
+
+    def pin_after_write(self, request, response):
+        if _wrote.get() or request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE,
+                f"{time.time() + self.window:.3f}",
+                max_age=self.window,
+                httponly=True,
+                samesite="Lax",
+                secure=request.is_secure(),
+            )
+        return response
@@ -2,6 +2,7 @@
 import resend
 import os
 import logging
+from .metrics import observe_outbound
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +52,8 @@ def send_email_via_resend(to, subject, html_body, text_body, reply_to=None, from
             params["reply_to"] = reply_to
         
         # Send email
-        email = resend.Emails.send(params)
+        with observe_outbound('resend'):
+            email = resend.Emails.send(params)
         logger.info(f"Email sent successfully via Resend to {to} from {from_address}: {email}")
         return True
         
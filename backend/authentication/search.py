@@ -0,0 +1,94 @@
+# authentication/search.py
+"""
+Full-text search for the catalog ViewSets.
+
+PartInventory and PartImageGallery keep a denormalized search_document
+column (part name, number, description, year, make, model, category) with a
+MySQL FULLTEXT index. FullTextSearchFilter turns ?search= into a boolean
+MATCH ... AGAINST query and annotates search_rank for relevance ordering.
+
+On other databases, when SEARCH_FULLTEXT_ENABLED is False, or when a term
+is too short for the full-text index, it falls back to DRF's SearchFilter
+(LIKE over search_fields), so results stay correct everywhere.
+"""
+
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+SEARCH_DOCUMENT_FIELD = "search_document"
+RANK_ANNOTATION = "search_rank"
+
+# InnoDB default innodb_ft_min_token_size
+FULLTEXT_MIN_TOKEN = getattr(settings, "SEARCH_FULLTEXT_MIN_TOKEN", 3)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+_PART_NUMBER_STRIP_RE = re.compile(r"[^A-Z0-9]")
+
+
+def normalize_part_number(value):
+    """Canonical part number for exact lookups: uppercase alphanumerics only"""
+    if not value:
+        return ""
+    return _PART_NUMBER_STRIP_RE.sub("", str(value).upper())
+
+
+def build_search_document(*parts):
+    """Join the searchable values of a row into one lower-cased string"""
+    return " ".join(str(part) for part in parts if part not in (None, "")).lower()
+
+
+def fulltext_available():
+    return connection.vendor == "mysql" and getattr(settings, "SEARCH_FULLTEXT_ENABLED", True)
+
+
+def boolean_query(search_terms):
+    """
+    Build a MATCH ... AGAINST boolean-mode query: every token required,
+    prefix-matched. Returns None when some token is too short for the index.
+    """
+    tokens = []
+    for term in search_terms:
+        tokens.extend(_TOKEN_RE.findall(term))
+    if not tokens or any(len(token) < FULLTEXT_MIN_TOKEN for token in tokens):
+        return None
+    return " ".join(f"+{token}*" for token in tokens)
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter that uses the FULLTEXT index on search_document when it can
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or not fulltext_available():
+            return super().filter_queryset(request, queryset, view)
+
+        query = boolean_query(search_terms)
+        if query is None:
+            return super().filter_queryset(request, queryset, view)
+
+        table = queryset.model._meta.db_table
+        match = f"MATCH (`{table}`.`{SEARCH_DOCUMENT_FIELD}`) AGAINST (%s IN BOOLEAN MODE)"
+        return (
+            queryset.annotate(**{RANK_ANNOTATION: RawSQL(match, (query,))})
+            .filter(**{f"{RANK_ANNOTATION}__gt": 0})
+            .order_by(f"-{RANK_ANNOTATION}")
+        )
+
+
+class SearchAwareOrderingFilter(filters.OrderingFilter):
+    """
+    OrderingFilter that keeps relevance order for full-text searches unless
+    the client asked for an explicit ?ordering=
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        explicit = request.query_params.get(self.ordering_param)
+        if not explicit and RANK_ANNOTATION in queryset.query.annotations:
+            return queryset
+        return super().filter_queryset(request, queryset, view)
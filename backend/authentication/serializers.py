@@ -1,5 +1,9 @@
 # authentication/serializers.py
+import json
+
+from django.core.files.storage import default_storage
 from rest_framework import serializers
+from .derivatives import build_srcset
 from .models import (
     ContactSubmission,
     PartsInquiry,
@@ -157,9 +161,12 @@ class ContactSubmissionSerializer(serializers.ModelSerializer):
 class PartImageSerializer(serializers.ModelSerializer):
     """Serializer for part inventory images"""
     
+    thumbnail_url = serializers.ReadOnlyField()
+    srcset = serializers.ReadOnlyField()
+    
     class Meta:
         model = PartImage
-        fields = ["id", "image", "caption", "order"]
+        fields = ["id", "image", "thumbnail_url", "srcset", "width", "height", "caption", "order"]
 
 
 
@@ -340,6 +347,7 @@ class PartImageUploadSerializer(serializers.ModelSerializer):
     
     thumbnail_url = serializers.ReadOnlyField()
     full_url = serializers.ReadOnlyField()
+    srcset = serializers.ReadOnlyField()
     
     class Meta:
         model = PartImageUpload
@@ -349,6 +357,7 @@ class PartImageUploadSerializer(serializers.ModelSerializer):
             'image_url',
             'thumbnail_url',
             'full_url',
+            'srcset',
             'caption',
             'is_primary',
             'display_order',
@@ -357,7 +366,7 @@ class PartImageUploadSerializer(serializers.ModelSerializer):
             'height',
             'uploaded_at'
         ]
-        read_only_fields = ['id', 'thumbnail_url', 'full_url', 'uploaded_at']
+        read_only_fields = ['id', 'thumbnail_url', 'full_url', 'srcset', 'file_size', 'width', 'height', 'uploaded_at']
 
 
 class PartImageTagSerializer(serializers.ModelSerializer):
@@ -417,15 +426,18 @@ class PartImageGallerySerializer(serializers.ModelSerializer):
     
     def get_primary_image(self, obj):
         """Get primary image or first image with thumbnail"""
-        primary = obj.images.filter(is_primary=True).first()
-        if not primary:
-            primary = obj.images.first()
+        # From the prefetched images when the view loaded them
+        images = list(obj.images.all())
+        primary = next((image for image in images if image.is_primary), images[0] if images else None)
         
         if primary:
             return {
                 'id': str(primary.id),
                 'url': primary.full_url,
                 'thumbnail': primary.thumbnail_url,
+                'srcset': primary.srcset,
+                'width': primary.width,
+                'height': primary.height,
                 'caption': primary.caption
             }
         return None
@@ -467,6 +479,22 @@ class PartImageGalleryListSerializer(serializers.ModelSerializer):
     
     def get_primary_image(self, obj):
         """Get primary image thumbnail URL only (lightweight)"""
+        # Fast path: list queryset annotates the primary image columns
+        if hasattr(obj, 'primary_image_file'):
+            image_url = obj.primary_image_url
+            image_file = obj.primary_image_file
+            if not image_file:
+                return None
+            derivatives = getattr(obj, 'primary_image_derivatives', None)
+            if isinstance(derivatives, str):
+                # JSON from a subquery isn't decoded on every backend
+                derivatives = json.loads(derivatives)
+            return {
+                'thumbnail': PartImageUpload.build_thumbnail_url(image_url, derivatives),
+                'url': image_url or default_storage.url(image_file),
+                'srcset': build_srcset(derivatives),
+            }
+
         primary = obj.images.filter(is_primary=True).first()
         if not primary:
             primary = obj.images.first()
@@ -474,7 +502,8 @@ class PartImageGalleryListSerializer(serializers.ModelSerializer):
         if primary:
             return {
                 'thumbnail': primary.thumbnail_url,
-                'url': primary.full_url
+                'url': primary.full_url,
+                'srcset': primary.srcset,
             }
         return None
 
@@ -490,8 +519,8 @@ class UnifiedPartSearchSerializer(serializers.Serializer):
     Useful for implementing a global search feature
     """
     
-    id = serializers.UUIDField()
-    type = serializers.CharField(help_text="'inventory' or 'gallery'")
+    id = serializers.CharField(help_text="UUID for gallery/price rows, integer id for inventory")
+    type = serializers.CharField(help_text="'inventory', 'gallery' or 'price'")
     year = serializers.IntegerField()
     manufacturer = serializers.CharField()
     model = serializers.CharField()
@@ -578,21 +607,12 @@ class LoginSerializer(serializers.Serializer):
         if not email or not password:
             raise serializers.ValidationError("Email and password are required.")
         
-        # Try to get user by email
-        try:
-            user = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Invalid email or password.")
-        
-        # Authenticate using username (which is email)
-        user = authenticate(username=user.username, password=password)
+        # One query by email, profile included (authentication.backends.EmailBackend)
+        user = authenticate(self.context.get('request'), email=email, password=password)
         
         if not user:
             raise serializers.ValidationError("Invalid email or password.")
         
-        if not user.is_active:
-            raise serializers.ValidationError("User account is disabled.")
-        
         data['user'] = user
         return data
     
@@ -626,12 +646,21 @@ class ShippingAddressSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Enter a valid email address")
         return value.lower()
 
+
+def absolute_url(request, url):
+    if url and request and not url.startswith(('http://', 'https://')):
+        return request.build_absolute_uri(url)
+    return url
+
+
 # ==========================================================================================
 # enquiry form image uploading
 # ===========================================================================================
 class ProductImageSerializer(serializers.ModelSerializer):
     """Serializer for product images with full details"""
     image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     manufacturer_name = serializers.CharField(source='manufacturer.name', read_only=True)
     model_name = serializers.CharField(source='model.name', read_only=True)
     category_name = serializers.CharField(source='part_category.name', read_only=True)
@@ -649,6 +678,10 @@ class ProductImageSerializer(serializers.ModelSerializer):
             'category_name', 
             'image', 
             'image_url',
+            'thumbnail_url',
+            'srcset',
+            'width',
+            'height',
             'specification_number',
             'uploaded_at'
         ]
@@ -661,6 +694,13 @@ class ProductImageSerializer(serializers.ModelSerializer):
             return obj.image.url
         return None
 
+    def get_thumbnail_url(self, obj):
+        return absolute_url(self.context.get('request'), obj.thumbnail_url)
+
+    def get_srcset(self, obj):
+        request = self.context.get('request')
+        return build_srcset(obj.derivatives, lambda url: absolute_url(request, url))
+
 
 class ProductImageCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating product images"""
@@ -678,14 +718,17 @@ class ProductImageCreateSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            validated_data['uploaded_by'] = request.user
+        if request and request.user.is_authenticated:
+            # By id: request.user may be a TokenUser built from JWT claims
+            validated_data['uploaded_by_id'] = request.user.pk
         return super().create(validated_data)
 
 
 class ProductImageListSerializer(serializers.ModelSerializer):
     """Lightweight serializer for listing images"""
     image_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     manufacturer_name = serializers.CharField(source='manufacturer.name', read_only=True)
     model_name = serializers.CharField(source='model.name', read_only=True)
     category_name = serializers.CharField(source='part_category.name', read_only=True)
@@ -699,6 +742,8 @@ class ProductImageListSerializer(serializers.ModelSerializer):
             'year', 
             'category_name',
             'image_url', 
+            'thumbnail_url',
+            'srcset',
             'specification_number'
         ]
     
@@ -708,4 +753,11 @@ class ProductImageListSerializer(serializers.ModelSerializer):
             if request:
                 return request.build_absolute_uri(obj.image.url)
             return obj.image.url
-        return None
\ No newline at end of file
+        return None
+
+    def get_thumbnail_url(self, obj):
+        return absolute_url(self.context.get('request'), obj.thumbnail_url)
+
+    def get_srcset(self, obj):
+        request = self.context.get('request')
+        return build_srcset(obj.derivatives, lambda url: absolute_url(request, url))
\ No newline at end of file
@@ -0,0 +1,176 @@
+# authentication/signals.py
+"""
+Cache invalidation, fitment and autocomplete index, catalog card, image
+derivative, JWT revocation and SQL metrics receivers (connected in
+AuthenticationConfig.ready)
+"""
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .autocomplete import apply_gallery_change, apply_reference_change
+from .caching import bump_group_version
+from .catalog_cards import schedule_card_rebuild, schedule_reference_rebuild
+from .derivatives import schedule_derivatives
+from .fitment import apply_fitment_change, refresh_fitment_names
+from .models import (
+    Manufacturer,
+    PartCategory,
+    PartImage,
+    PartImageGallery,
+    PartImageUpload,
+    PartInventory,
+    PartPrice,
+    ProductImage,
+    VehicleModel,
+)
+from .metrics import install_query_recorder
+from .sitemaps import invalidate_sitemap_cache
+from .tokens import revoke_user_tokens
+
+# User fields baked into (or guarding) JWT claims; saves touching only others keep tokens valid
+TOKEN_USER_FIELDS = {"password", "is_active", "is_staff", "is_superuser", "username"}
+
+
+# Cache versions are bumped once the write commits: bumped earlier, a request
+# in between would cache the old rows under the new version
+@receiver(post_save, sender=PartImageGallery)
+@receiver(post_delete, sender=PartImageGallery)
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_delete, sender=Manufacturer)
+def invalidate_sitemap(sender, **kwargs):
+    transaction.on_commit(invalidate_sitemap_cache)
+
+
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_delete, sender=Manufacturer)
+@receiver(post_save, sender=VehicleModel)
+@receiver(post_delete, sender=VehicleModel)
+@receiver(post_save, sender=PartCategory)
+@receiver(post_delete, sender=PartCategory)
+def invalidate_reference_data(sender, **kwargs):
+    transaction.on_commit(lambda: bump_group_version("reference"))
+    refresh_fitment_names()
+
+
+@receiver(post_save, sender=PartImageGallery)
+@receiver(post_delete, sender=PartImageGallery)
+@receiver(post_save, sender=PartImageUpload)
+@receiver(post_delete, sender=PartImageUpload)
+@receiver(post_save, sender=PartPrice)
+@receiver(post_delete, sender=PartPrice)
+def invalidate_galleries(sender, **kwargs):
+    transaction.on_commit(lambda: bump_group_version("galleries"))
+
+
+@receiver(post_save, sender=PartInventory)
+@receiver(post_delete, sender=PartInventory)
+@receiver(post_save, sender=PartImage)
+@receiver(post_delete, sender=PartImage)
+def invalidate_parts(sender, **kwargs):
+    transaction.on_commit(lambda: bump_group_version("parts"))
+
+
+@receiver(post_save, sender=PartInventory)
+def fitment_part_saved(sender, instance, **kwargs):
+    apply_fitment_change("parts", instance, instance.is_published)
+
+
+@receiver(post_save, sender=PartImageGallery)
+def fitment_gallery_saved(sender, instance, **kwargs):
+    apply_fitment_change("galleries", instance, instance.is_published)
+
+
+@receiver(post_save, sender=ProductImage)
+def fitment_product_image_saved(sender, instance, **kwargs):
+    apply_fitment_change("product_images", instance, instance.is_active)
+
+
+@receiver(post_delete, sender=PartInventory)
+@receiver(post_delete, sender=PartImageGallery)
+@receiver(post_delete, sender=ProductImage)
+def fitment_row_deleted(sender, instance, **kwargs):
+    source = {
+        PartInventory: "parts",
+        PartImageGallery: "galleries",
+        ProductImage: "product_images",
+    }[sender]
+    apply_fitment_change(source, instance, False)
+
+
+@receiver(post_save, sender=PartImageGallery)
+def autocomplete_gallery_saved(sender, instance, **kwargs):
+    apply_gallery_change(instance, instance.is_published)
+
+
+@receiver(post_delete, sender=PartImageGallery)
+def autocomplete_gallery_deleted(sender, instance, **kwargs):
+    apply_gallery_change(instance, False)
+
+
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_save, sender=VehicleModel)
+@receiver(post_save, sender=PartCategory)
+@receiver(post_delete, sender=Manufacturer)
+@receiver(post_delete, sender=VehicleModel)
+@receiver(post_delete, sender=PartCategory)
+def autocomplete_reference_changed(sender, instance, **kwargs):
+    kind = {Manufacturer: "manufacturer", VehicleModel: "model", PartCategory: "category"}[sender]
+    visible = instance.is_active and kwargs.get("signal") is post_save
+    apply_reference_change(kind, instance, visible)
+
+
+@receiver(post_save, sender=PartImageGallery)
+@receiver(post_save, sender=PartInventory)
+def catalog_card_row_saved(sender, instance, **kwargs):
+    # Deleted rows lose their card through the one-to-one cascade
+    schedule_card_rebuild("galleries" if sender is PartImageGallery else "parts", [instance.pk])
+
+
+@receiver(post_save, sender=PartImageUpload)
+@receiver(post_delete, sender=PartImageUpload)
+def catalog_card_image_changed(sender, instance, **kwargs):
+    schedule_card_rebuild("galleries", [instance.gallery_id])
+
+
+@receiver(post_save, sender=PartPrice)
+@receiver(post_delete, sender=PartPrice)
+def catalog_card_price_changed(sender, instance, **kwargs):
+    schedule_card_rebuild("galleries", [instance.gallery_reference_id])
+
+
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_save, sender=VehicleModel)
+@receiver(post_save, sender=PartCategory)
+def catalog_card_reference_saved(sender, instance, created, **kwargs):
+    if not created:
+        field = {Manufacturer: "manufacturer", VehicleModel: "model", PartCategory: "part_category"}[sender]
+        schedule_reference_rebuild(field, instance.pk)
+
+
+@receiver(post_save, sender=PartImageUpload)
+@receiver(post_save, sender=ProductImage)
+@receiver(post_save, sender=PartImage)
+def image_saved(sender, instance, **kwargs):
+    schedule_derivatives(instance)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    if not created and (update_fields is None or TOKEN_USER_FIELDS & set(update_fields)):
+        revoke_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    revoke_user_tokens(instance.pk)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    if getattr(settings, "METRICS_ENABLED", True):
+        install_query_recorder(connection)
@@ -0,0 +1,218 @@
+# authentication/sitemaps.py
+"""
+Sitemap generation.
+
+/sitemap.xml is a sitemap index pointing at:
+    sitemap-pages.xml          static pages, brand pages and part pages
+    sitemap-products-<n>.xml   product pages, SITEMAP_MAX_URLS per shard
+
+Documents are streamed while they are generated and the finished XML is
+cached. Cache keys carry a version number that is bumped whenever a gallery
+or manufacturer is saved or deleted (see signals.py), so stale shards are
+simply never read again.
+"""
+
+import hashlib
+import logging
+import math
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils.text import slugify
+
+from .models import Manufacturer, PartImageGallery
+
+logger = logging.getLogger(__name__)
+
+SITEMAP_MAX_URLS = getattr(settings, "SITEMAP_MAX_URLS", 50000)
+SITEMAP_CACHE_TIMEOUT = getattr(settings, "SITEMAP_CACHE_TIMEOUT", 60 * 60 * 6)
+SITEMAP_ITERATOR_CHUNK_SIZE = 2000
+
+VERSION_KEY = "sitemap:version"
+
+XML_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+URLSET_CLOSE = "</urlset>\n"
+INDEX_OPEN = '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_CLOSE = "</sitemapindex>\n"
+
+# Static URLs: (path, changefreq, priority)
+STATIC_URLS = [
+    ("/", "monthly", "1.0"),
+    ("/about", "monthly", "0.8"),
+    ("/contact", "monthly", "0.8"),
+    ("/privacy-policy", "yearly", "0.5"),
+    ("/warranty", "yearly", "0.5"),
+    ("/terms-and-condition", "yearly", "0.5"),
+]
+
+# Part slugs - These match the "slug" property in partsData.js
+PART_SLUGS = [
+    "abs",
+    "display-unit",
+    "radio-controller",
+    "speedometer",
+    "steering-column",
+    "transfer-case",
+    "mechanical-parts",
+]
+
+
+# ============================================================================
+# CACHE VERSIONING
+# ============================================================================
+
+def get_sitemap_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def invalidate_sitemap_cache():
+    """Make every cached sitemap document stale"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # key missing/evicted - any new value works as long as it changes
+        cache.set(VERSION_KEY, get_sitemap_version() + 1, None)
+
+
+def cache_key(base_url, name):
+    host = hashlib.md5(base_url.encode("utf-8")).hexdigest()[:12]
+    return f"sitemap:{get_sitemap_version()}:{host}:{name}"
+
+
+def cached_document(key, chunks):
+    """
+    Return (cached_xml, None) on a hit, or (None, stream) on a miss.
+
+    The stream yields the generated chunks and stores the joined document
+    in the cache once it has been fully produced.
+    """
+    if not getattr(settings, "SITEMAP_CACHE_ENABLED", True):
+        return None, iter(chunks)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached, None
+
+    def stream():
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        cache.set(key, "".join(parts), SITEMAP_CACHE_TIMEOUT)
+
+    return None, stream()
+
+
+# ============================================================================
+# XML FRAGMENTS
+# ============================================================================
+
+def url_entry(loc, lastmod=None, changefreq=None, priority=None):
+    parts = [f"  <url>\n    <loc>{escape(loc)}</loc>\n"]
+    if lastmod:
+        parts.append(f"    <lastmod>{lastmod.date().isoformat()}</lastmod>\n")
+    if changefreq:
+        parts.append(f"    <changefreq>{changefreq}</changefreq>\n")
+    if priority:
+        parts.append(f"    <priority>{priority}</priority>\n")
+    parts.append("  </url>\n")
+    return "".join(parts)
+
+
+def sitemap_entry(loc, lastmod=None):
+    lastmod_xml = f"    <lastmod>{lastmod.date().isoformat()}</lastmod>\n" if lastmod else ""
+    return f"  <sitemap>\n    <loc>{escape(loc)}</loc>\n{lastmod_xml}  </sitemap>\n"
+
+
+# ============================================================================
+# DOCUMENTS
+# ============================================================================
+
+def published_products():
+    return PartImageGallery.objects.filter(is_published=True).exclude(slug="")
+
+
+def product_shard_count():
+    """
+    Number of product shards, cached under the current sitemap version like
+    the shards themselves so a cached shard is served without a COUNT
+    """
+    if not getattr(settings, "SITEMAP_CACHE_ENABLED", True):
+        return max(1, math.ceil(published_products().count() / SITEMAP_MAX_URLS))
+
+    key = f"sitemap:{get_sitemap_version()}:product-shards"
+    count = cache.get(key)
+    if count is None:
+        count = max(1, math.ceil(published_products().count() / SITEMAP_MAX_URLS))
+        cache.set(key, count, SITEMAP_CACHE_TIMEOUT)
+    return count
+
+
+def iter_index(base_url):
+    """Sitemap index listing the pages sitemap and every product shard"""
+    products_lastmod = published_products().aggregate(last=Max("updated_at"))["last"]
+    brands_lastmod = Manufacturer.objects.aggregate(last=Max("updated_at"))["last"]
+
+    yield XML_HEADER
+    yield INDEX_OPEN
+    yield sitemap_entry(f"{base_url}/sitemap-pages.xml", brands_lastmod)
+    for shard in range(1, product_shard_count() + 1):
+        yield sitemap_entry(f"{base_url}/sitemap-products-{shard}.xml", products_lastmod)
+    yield INDEX_CLOSE
+
+
+def iter_pages(base_url):
+    """Static pages, brand pages (BrandDetail.jsx) and part pages (/used/:partSlug)"""
+    yield XML_HEADER
+    yield URLSET_OPEN
+
+    for path, changefreq, priority in STATIC_URLS:
+        yield url_entry(f"{base_url}{path}", changefreq=changefreq, priority=priority)
+
+    try:
+        brands = Manufacturer.objects.only("name", "updated_at").order_by("name")
+        for brand in brands.iterator(chunk_size=SITEMAP_ITERATOR_CHUNK_SIZE):
+            brand_slug = slugify(brand.name).lower()
+            if not brand_slug:
+                continue
+            yield url_entry(
+                f"{base_url}/used/{brand_slug}/parts",
+                lastmod=brand.updated_at,
+                changefreq="weekly",
+                priority="0.8",
+            )
+    except Exception as e:
+        logger.error(f"Error adding brands to sitemap: {e}")
+
+    for part_slug in PART_SLUGS:
+        yield url_entry(f"{base_url}/used/{part_slug}", changefreq="weekly", priority="0.85")
+
+    yield URLSET_CLOSE
+
+
+def iter_products(base_url, shard):
+    """Product pages (ProductPage.jsx routes) for a 1-based shard number"""
+    start = (shard - 1) * SITEMAP_MAX_URLS
+    products = (
+        published_products()
+        .only("id", "slug", "updated_at")
+        .order_by("pk")[start:start + SITEMAP_MAX_URLS]
+    )
+
+    yield XML_HEADER
+    yield URLSET_OPEN
+    for product in products.iterator(chunk_size=SITEMAP_ITERATOR_CHUNK_SIZE):
+        yield url_entry(
+            f"{base_url}/product/{product.slug}/{product.id}",
+            lastmod=product.updated_at,
+            changefreq="weekly",
+            priority="0.9",
+        )
+    yield URLSET_CLOSE
@@ -0,0 +1,128 @@
+# authentication/slugs.py
+"""
+Unique slug allocation.
+
+Slugs follow the existing scheme: "<base>", then "<base>-1", "<base>-2", ...
+
+next_free_slug() finds the next free suffix with one query (the longest,
+then highest, matching slug). save_with_unique_slug() wraps the insert in a
+savepoint and allocates again if a concurrent writer took the slug first.
+assign_unique_slugs() does the same for many unsaved instances at once,
+for bulk_create.
+"""
+
+import re
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Length
+
+SLUG_MAX_RETRIES = 5
+SUFFIX_RESERVE = 8  # room for "-NNNNNNN"
+BULK_PREFIX_CHUNK = 200
+
+
+def slug_base(value, max_length=255):
+    """Trim a slugified base so a numeric suffix still fits in the column"""
+    return value[: max_length - SUFFIX_RESERVE].rstrip("-")
+
+
+def _suffix(slug, base):
+    """Numeric suffix of slug for base: 0 for the bare base, None if unrelated"""
+    if slug == base:
+        return 0
+    rest = slug[len(base) + 1:] if slug.startswith(base + "-") else ""
+    return int(rest) if rest.isdigit() else None
+
+
+def next_free_slug(model, base, field="slug"):
+    """
+    Next unused slug for base using a single query.
+
+    Longer slugs have larger suffixes, and equal lengths compare
+    lexicographically, so the first row ordered by (length, value) desc
+    carries the highest suffix in use. The prefix LIKE keeps the lookup on
+    the slug index; the regex only filters the rows in that range.
+    """
+    highest = (
+        model.objects.filter(
+            Q(**{field: base})
+            | Q(
+                **{
+                    f"{field}__istartswith": f"{base}-",
+                    f"{field}__regex": rf"^{re.escape(base)}-[0-9]+$",
+                }
+            )
+        )
+        .annotate(slug_length=Length(field))
+        .order_by("-slug_length", f"-{field}")
+        .values_list(field, flat=True)
+        .first()
+    )
+    if highest is None:
+        return base
+    return f"{base}-{(_suffix(highest, base) or 0) + 1}"
+
+
+def save_with_unique_slug(instance, base, save, field="slug"):
+    """
+    Allocate a slug for instance and run save(), retrying with a fresh slug
+    if the insert loses a race for it (IntegrityError on the slug column)
+    """
+    model = type(instance)
+    for attempt in range(SLUG_MAX_RETRIES):
+        setattr(instance, field, next_free_slug(model, base, field))
+        try:
+            with transaction.atomic():
+                save()
+            return
+        except IntegrityError:
+            taken = model.objects.filter(**{field: getattr(instance, field)})
+            if instance.pk is not None:
+                taken = taken.exclude(pk=instance.pk)
+            if attempt == SLUG_MAX_RETRIES - 1 or not taken.exists():
+                raise
+
+
+def assign_unique_slugs(instances, base_for, field="slug"):
+    """
+    Give every unsaved instance without a slug a unique one, for bulk_create.
+
+    Args:
+        instances: model instances (all of the same model)
+        base_for: callable returning the slug base for an instance
+
+    Existing slugs are read with one prefix query per BULK_PREFIX_CHUNK
+    distinct bases; suffixes within the batch are assigned in memory, so
+    bases that collide with each other ("x" and "x-1") are handled too.
+    """
+    pending = [obj for obj in instances if not getattr(obj, field)]
+    if not pending:
+        return instances
+
+    model = type(pending[0])
+    by_base = defaultdict(list)
+    for obj in pending:
+        by_base[base_for(obj)].append(obj)
+
+    bases = list(by_base)
+    taken = set()
+    for start in range(0, len(bases), BULK_PREFIX_CHUNK):
+        chunk = bases[start:start + BULK_PREFIX_CHUNK]
+        prefix_filter = Q()
+        for base in chunk:
+            prefix_filter |= Q(**{field: base}) | Q(**{f"{field}__istartswith": f"{base}-"})
+        taken.update(model.objects.filter(prefix_filter).values_list(field, flat=True).iterator())
+
+    for base, objs in by_base.items():
+        suffix = 0
+        for obj in objs:
+            candidate = base if suffix == 0 else f"{base}-{suffix}"
+            while candidate in taken:
+                suffix += 1
+                candidate = f"{base}-{suffix}"
+            taken.add(candidate)
+            setattr(obj, field, candidate)
+
+    return instances
@@ -1,3 +1,277 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.db import connection
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import replicas
+from .analytics import AnalyticsDispatcher, _build_registered_events
+from .caching import bump_group_version, fresh_reads, get_group_version
+from .email_outbox import claim_jobs, deliver_email, send_job
+from .exports import accepts_gzip
+from .models import (
+    EmailJob,
+    Manufacturer,
+    VehicleModel,
+    PartCategory,
+    PartsInquiry,
+    PartInventory,
+    PartImageGallery,
+    ProductImage,
+)
+
+PAGE_SIZES = (5, 100)
+MAX_QUERIES = 15
+ROWS = 12
+
+
+class AdminChangelistQueryTests(TestCase):
+    """Changelist query counts must not grow with the rows on the page"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        category = PartCategory.objects.create(name="Engine")
+        for index in range(ROWS):
+            manufacturer = Manufacturer.objects.create(name=f"Make {index}", code=f"MK{index}")
+            vehicle_model = VehicleModel.objects.create(
+                manufacturer=manufacturer, name=f"Model {index}", code=f"MD{index}"
+            )
+            vehicle = {"year": 2000 + index, "manufacturer": manufacturer, "model": vehicle_model}
+            ProductImage.objects.create(
+                **vehicle, part_category=category, image=f"product_images/{index}.jpg"
+            )
+            PartsInquiry.objects.create(
+                **vehicle,
+                part_category=category,
+                name="Customer",
+                email="customer@example.com",
+                parts_needed="Engine",
+            )
+            PartInventory.objects.create(
+                **vehicle, part_category=category, part_name=f"Engine {index}", price=100
+            )
+            PartImageGallery.objects.create(
+                **vehicle, part_category=category, part_name=f"Engine {index}"
+            )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def changelist_queries(self, model, per_page):
+        model_admin = admin.site._registry[model]
+        original_per_page = model_admin.list_per_page
+        model_admin.list_per_page = per_page
+        try:
+            url = reverse(f"admin:{model._meta.app_label}_{model._meta.model_name}_changelist")
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+        finally:
+            model_admin.list_per_page = original_per_page
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelists_do_not_grow_with_page_size(self):
+        for model in admin.site._registry:
+            if model._meta.app_label != "authentication":
+                continue
+            with self.subTest(model=model._meta.model_name):
+                counts = [self.changelist_queries(model, per_page) for per_page in PAGE_SIZES]
+                self.assertEqual(counts[0], counts[-1])
+                self.assertLessEqual(counts[-1], MAX_QUERIES)
+
+    def test_vehicle_model_filter_does_not_grow_with_models(self):
+        before = self.changelist_queries(ProductImage, PAGE_SIZES[0])
+        manufacturer = Manufacturer.objects.create(name="Extra", code="EXTRA")
+        VehicleModel.objects.bulk_create(
+            VehicleModel(manufacturer=manufacturer, name=f"Extra {index}", code=f"EX{index}")
+            for index in range(ROWS)
+        )
+        self.assertEqual(self.changelist_queries(ProductImage, PAGE_SIZES[0]), before)
+
+
+class CacheInvalidationTests(TestCase):
+    """Cache groups are bumped when a write commits, not when it is made"""
+
+    def test_group_version_bumped_on_commit(self):
+        before = get_group_version("reference")
+        with self.captureOnCommitCallbacks(execute=True):
+            Manufacturer.objects.create(name="Make", code="MK")
+            self.assertEqual(get_group_version("reference"), before)
+        self.assertGreater(get_group_version("reference"), before)
+
+
+@override_settings(API_CONDITIONAL_ENABLED=True)
+class PriceValidatorTests(TestCase):
+    """ETags of best_price queries change with the day prices are valid on"""
+
+    def etag(self, params, days=0):
+        now = timezone.now() + timedelta(days=days)
+        with mock.patch("django.utils.timezone.now", return_value=now):
+            response = self.client.get("/api/part-galleries/", params)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def test_best_price_etag_changes_with_date(self):
+        for params in ({"ordering": "best_price"}, {"max_price": "150"}):
+            with self.subTest(params=params):
+                self.assertNotEqual(self.etag(params), self.etag(params, days=1))
+
+    def test_plain_list_etag_ignores_date(self):
+        self.assertEqual(self.etag({}), self.etag({}, days=1))
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaLagWindowTests(SimpleTestCase):
+    """Cached views read the primary while a bumped group may still be lagging on replicas"""
+
+    def setUp(self):
+        cache.clear()
+        self.token = replicas._read_alias.set("replica1")
+        self.addCleanup(replicas._read_alias.reset, self.token)
+
+    def test_reads_replica_without_recent_bump(self):
+        with fresh_reads(["parts"]):
+            self.assertEqual(replicas.ReplicaRouter().db_for_read(PartInventory), "replica1")
+
+    def test_reads_primary_after_bump(self):
+        bump_group_version("parts")
+        with fresh_reads(["parts"]):
+            self.assertIsNone(replicas.ReplicaRouter().db_for_read(PartInventory))
+        self.assertEqual(replicas.ReplicaRouter().db_for_read(PartInventory), "replica1")
+
+
+class AnalyticsEventValidationTests(TestCase):
+    """Malformed event types are rejected as bad input, not server errors"""
+
+    def test_non_string_event_type_is_rejected(self):
+        for event_type in (["search"], {"name": "search"}):
+            with self.subTest(event_type=event_type):
+                response = self.client.post(
+                    reverse("authentication:track_analytics_event"),
+                    {"event_type": event_type, "event_data": {}},
+                    content_type="application/json",
+                )
+                self.assertEqual(response.status_code, 400)
+
+    def test_non_string_event_type_fails_in_batch(self):
+        results, items = _build_registered_events(None, [{"event_type": ["search"]}])
+        self.assertEqual(items, [])
+        self.assertFalse(results[0]["success"])
+        self.assertIn("error", results[0])
+
+
+@override_settings(GOOGLE_ANALYTICS_ID="", GOOGLE_ANALYTICS_API_SECRET="")
+class AnalyticsDispatcherTests(SimpleTestCase):
+    def test_nothing_queued_without_ga_config(self):
+        dispatcher = AnalyticsDispatcher(num_workers=1)
+        self.assertFalse(dispatcher.enqueue("client", "search"))
+        self.assertEqual(dispatcher.enqueue_many("client", [{"name": "search", "params": {}}]), [False])
+
+        stats = dispatcher.get_stats()
+        self.assertEqual((stats["queued"], stats["pending"], stats["workers"]), (0, 0, 0))
+
+
+class SitemapShardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_cached_shard_served_without_queries(self):
+        self.client.get("/sitemap-products-1.xml")
+        with self.assertNumQueries(0):
+            response = self.client.get("/sitemap-products-1.xml")
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_shard_is_404(self):
+        self.client.get("/sitemap-products-1.xml")
+        self.assertEqual(self.client.get("/sitemap-products-2.xml").status_code, 404)
+
+
+class AcceptEncodingTests(SimpleTestCase):
+    def test_gzip_negotiation(self):
+        cases = {
+            "": False,
+            "gzip": True,
+            "deflate, gzip;q=0.5": True,
+            "GZIP": True,
+            "x-gzip": True,
+            "*": True,
+            "gzip;q=0": False,
+            "gzip; q=0.0, deflate": False,
+            "gzip;q=0, *": False,
+            "br, *;q=0": False,
+            "identity": False,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertIs(accepts_gzip(header), expected)
+
+
+class StubTransport:
+    name = "stub"
+
+    def __init__(self, ok):
+        self.ok = ok
+        self.sent = []
+
+    def send(self, **message):
+        self.sent.append(message)
+        return self.ok
+
+
+@override_settings(EMAIL_OUTBOX_ENABLED=True, EMAIL_OUTBOX_BACKOFF_BASE=30, EMAIL_OUTBOX_LEASE_SECONDS=300)
+class EmailOutboxTests(TestCase):
+    def queue(self, **fields):
+        self.assertTrue(deliver_email("lead@example.com", "Subject", "<p>Hi</p>", "Hi", **fields))
+        return EmailJob.objects.latest("created_at")
+
+    def test_claimed_jobs_are_not_claimed_again(self):
+        job = self.queue()
+        self.assertEqual([claimed.pk for claimed in claim_jobs(10)], [job.pk])
+        self.assertEqual(claim_jobs(10), [])
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (EmailJob.STATUS_SENDING, 1))
+
+    def test_expired_lease_is_claimed_again(self):
+        job = self.queue()
+        claim_jobs(10)
+        EmailJob.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(seconds=301))
+        self.assertEqual([claimed.pk for claimed in claim_jobs(10)], [job.pk])
+
+    def test_failure_backs_off(self):
+        self.queue()
+        job = claim_jobs(10)[0]
+        before = timezone.now()
+        self.assertFalse(send_job(job, StubTransport(ok=False)))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, EmailJob.STATUS_PENDING)
+        self.assertGreaterEqual(job.next_attempt_at, before + timedelta(seconds=30))
+        self.assertEqual(claim_jobs(10), [])
+
+    def test_dead_lettered_after_max_attempts(self):
+        self.queue()
+        EmailJob.objects.update(max_attempts=2, attempts=1)
+        job = claim_jobs(10)[0]
+        self.assertFalse(send_job(job, StubTransport(ok=False)))
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (EmailJob.STATUS_FAILED, 2))
+        self.assertEqual(claim_jobs(10), [])
+
+    def test_sender_is_passed_to_transport(self):
+        self.queue(from_email="info")
+        transport = StubTransport(ok=True)
+        self.assertTrue(send_job(claim_jobs(10)[0], transport))
+        self.assertEqual(transport.sent[0]["from_email"], "info")
+
+    def test_unknown_sender_is_rejected(self):
+        self.assertFalse(deliver_email("lead@example.com", "Subject", "", "", from_email="sales"))
+        self.assertFalse(EmailJob.objects.exists())
@@ -0,0 +1,83 @@
+# authentication/tokens.py
+"""
+JWTs that carry enough claims to authenticate without a database read.
+
+simplejwt's JWTAuthentication loads the User row on every authenticated
+request. With JWT_CLAIMS_USER on, ClaimsJWTAuthentication is used instead:
+request.user is a TokenUser built from the signed claims (user_id,
+username, is_staff, is_superuser), which is all permission checks and
+request.user.id need. Views that need the row itself load it explicitly
+(the profile views, with select_related("profile")).
+
+A claims user is only as current as its token. With JWT_REVOCATION_CHECK
+on, each request also makes one cache read to reject:
+
+- access tokens logged out with logout_view (by jti)
+- every token issued to a user before they were deactivated, deleted or
+  had their password or staff flags changed (signals.py)
+
+Tokens issued before these claims existed still authenticate, without
+staff rights until the user logs in again.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+REVOKED_TOKEN_KEY = "jwt:revoked:{}"
+USER_NOT_BEFORE_KEY = "jwt:not-before:{}"
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """RefreshToken.for_user() plus the claims TokenUser reads (copied into access tokens)"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["username"] = user.get_username()
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        return token
+
+
+def _access_lifetime():
+    return int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds())
+
+
+def revoke_token(token):
+    """Reject this access token from now on (until it would have expired anyway)"""
+    remaining = int(token.get("exp", 0) - time.time())
+    if remaining > 0:
+        cache.set(REVOKED_TOKEN_KEY.format(token[api_settings.JTI_CLAIM]), 1, remaining)
+
+
+def revoke_user_tokens(user_id):
+    """Reject every access token issued to this user until now"""
+    cache.set(USER_NOT_BEFORE_KEY.format(user_id), int(time.time()), _access_lifetime())
+
+
+def is_revoked(token):
+    revoked_key = REVOKED_TOKEN_KEY.format(token.get(api_settings.JTI_CLAIM))
+    not_before_key = USER_NOT_BEFORE_KEY.format(token.get(api_settings.USER_ID_CLAIM))
+    found = cache.get_many([revoked_key, not_before_key])
+    if revoked_key in found:
+        return True
+    not_before = found.get(not_before_key)
+    if not_before is None:
+        return False
+    issued_at = token.get("iat", token.get("exp", 0) - _access_lifetime())
+    return issued_at < not_before
+
+
+class ClaimsJWTAuthentication(JWTStatelessUserAuthentication):
+    """JWTAuthentication without the per-request User query (request.user is a TokenUser)"""
+
+    def get_user(self, validated_token):
+        if getattr(settings, "JWT_REVOCATION_CHECK", False) and is_revoked(validated_token):
+            raise InvalidToken("Token has been revoked")
+        return super().get_user(validated_token)
@@ -1,4 +1,5 @@
 # authentication/urls.py
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import PartInventoryViewSet, PartImageGalleryViewSet,ProductImageViewSet
@@ -11,13 +12,18 @@ from .views import (
     create_shipping_address,
     analytics_status,
     analytics_test_connection,
-    track_analytics_event,
-    batch_track_events,       # Import from views
 )
-from .views import test_analytics, test_analytics_debug, analytics_config
+from .views import test_analytics_debug, analytics_config
 
 from . import views
 
+# Under ASGI the reference-data and outbound-analytics endpoints are served by
+# native async views (see async_views.py); everything else stays sync
+if settings.ASYNC_VIEWS_ENABLED:
+    from . import async_views as io_views
+else:
+    io_views = views
+
 # Create router for ViewSets
 router = DefaultRouter()
 router.register(r"parts", PartInventoryViewSet, basename="parts")
@@ -30,23 +36,33 @@ app_name = "authentication"
 urlpatterns = [
     # ============= HEALTH CHECK =============
     path("health/", views.health_check, name="health_check"),
+    path("cache/stats/", views.cache_stats, name="cache_stats"),
     
     # ============= PARTS INQUIRY ENDPOINTS =============
     path("parts-inquiry/", views.submit_parts_inquiry, name="submit_parts_inquiry"),
     
     # ============= MANUFACTURER ENDPOINTS =============
-    path("manufacturers/", views.get_manufacturers, name="get_manufacturers"),
+    path("manufacturers/", io_views.get_manufacturers, name="get_manufacturers"),
     path(
         "manufacturers/<int:manufacturer_id>/models/",
-        views.get_models_by_manufacturer,
+        io_views.get_models_by_manufacturer,
         name="get_models_by_manufacturer",
     ),
     
     # ============= VEHICLE MODEL ENDPOINTS =============
-    path("models/", views.get_all_models, name="get_all_models"),
+    path("models/", io_views.get_all_models, name="get_all_models"),
     
     # ============= PART CATEGORY ENDPOINTS =============
-    path("part-categories/", views.get_part_categories, name="get_part_categories"),
+    path("part-categories/", io_views.get_part_categories, name="get_part_categories"),
+    
+    # ============= FITMENT ENDPOINTS (cascading dropdowns) =============
+    path("fitment/years/", views.fitment_years, name="fitment_years"),
+    path("fitment/makes/", views.fitment_makes, name="fitment_makes"),
+    path("fitment/models/", views.fitment_models, name="fitment_models"),
+    path("fitment/categories/", views.fitment_categories, name="fitment_categories"),
+    
+    # ============= AUTOCOMPLETE ENDPOINT =============
+    path("autocomplete/", views.autocomplete, name="autocomplete"),
     
     # ============= CONTACT FORM ENDPOINTS =============
     path("contact/", views.submit_contact_form, name="submit_contact"),
@@ -60,11 +76,11 @@ urlpatterns = [
     
     # ============= SHIPPING ADDRESS ENDPOINT =============
     path('shipping-addresses/', views.create_shipping_address, name='create_shipping_address'),
-    path('test-analytics/', views.test_analytics, name='test-analytics'),
+    path('test-analytics/', io_views.test_analytics, name='test-analytics'),
     path('test-analytics-debug/', views.test_analytics_debug, name='test-analytics-debug'),
     path('analytics-config/', views.analytics_config, name='analytics-config'),
-    path('verify-ga4/', views.verify_ga4_connection, name='verify-ga4'),
-    path('track-product-view/', views.track_product_view_api, name='track-product-view'),
+    path('verify-ga4/', io_views.verify_ga4_connection, name='verify-ga4'),
+    path('track-product-view/', io_views.track_product_view_api, name='track-product-view'),
     path('track-wishlist/', views.track_wishlist_api, name='track-wishlist'),
     path('track-scroll/', views.track_scroll_api, name='track-scroll'),
     
@@ -75,10 +91,10 @@ urlpatterns = [
     path('analytics/test-connection/', analytics_test_connection, name='analytics_test_connection'),
     
     # Track single event
-    path('analytics/track/', track_analytics_event, name='track_analytics_event'),
+    path('analytics/track/', io_views.track_analytics_event, name='track_analytics_event'),
     
     # Batch track multiple events
-    path('analytics/batch-track/', batch_track_events, name='batch_track_events'),
+    path('analytics/batch-track/', io_views.batch_track_events, name='batch_track_events'),
     # ============= VIEWSET ROUTES (Parts Inventory & Part Galleries) =============
     path("", include(router.urls)),
 ]
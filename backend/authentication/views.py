@@ -1,14 +1,36 @@
 # authentication/views.py
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, throttle_classes, action
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
 from .analytics import track_event
 from rest_framework import status, viewsets, filters
 import json
 from django_filters.rest_framework import DjangoFilterBackend
+from .pagination import GalleryCursorPagination
+from .querysets import annotate_primary_image
+from .caching import cached_response, conditional_response, filtered_queryset_validator, get_cache_stats
+from .catalog_cards import CatalogCardListMixin, gallery_list_queryset
+from .autocomplete import (
+    KINDS as AUTOCOMPLETE_KINDS,
+    MAX_LIMIT as AUTOCOMPLETE_MAX_LIMIT,
+    get_autocomplete_index,
+)
+from .fitment import get_fitment_index
+from .replicas import ReplicaReadMixin, use_replica
+from .pricing import BestPriceFilter
+from .ratelimit import (
+    AnalyticsTestRateThrottle,
+    FormRateThrottle,
+    LoginRateThrottle,
+    RegisterRateThrottle,
+    TrackingRateThrottle,
+    rate_limited,
+)
+from .search import FullTextSearchFilter, SearchAwareOrderingFilter, normalize_part_number
+from django.core.files.storage import default_storage
 from .models import (
     ContactSubmission,
     PartsInquiry,
@@ -18,6 +40,7 @@ from .models import (
     PartInventory,
     PartImageGallery,
     PartImageUpload,
+    PartPrice,
 )
 from .serializers import (
     ContactSubmissionSerializer,
@@ -32,7 +55,8 @@ from .serializers import (
     PartImageUploadSerializer,
     ProductImageSerializer,
     ProductImageCreateSerializer,
-    ProductImageListSerializer
+    ProductImageListSerializer,
+    UnifiedPartSearchSerializer,
 )
 import logging
 from .analytics import (
@@ -53,7 +77,8 @@ from .analytics import (
     track_form_start,
     track_form_submit,
     track_filter_change,
-
+    track_registered_event,
+    track_events_batch,
 )
 
 logger = logging.getLogger(__name__)
@@ -73,6 +98,7 @@ def get_client_ip(request):
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([FormRateThrottle])
 def submit_parts_inquiry(request):
     """
     Handle parts inquiry form submission
@@ -194,8 +220,11 @@ def submit_parts_inquiry(request):
         {"success": False, "errors": serializer.errors},
         status=status.HTTP_400_BAD_REQUEST,
     )
+@use_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@conditional_response("reference")
+@cached_response("manufacturers", group="reference")
 def get_manufacturers(request):
     """
     Get list of all active manufacturers
@@ -207,8 +236,11 @@ def get_manufacturers(request):
     return Response({"success": True, "data": serializer.data})
 
 
+@use_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@conditional_response("reference")
+@cached_response("models_by_manufacturer", group="reference")
 def get_models_by_manufacturer(request, manufacturer_id):
     """
     Get all models for a specific manufacturer
@@ -237,8 +269,11 @@ def get_models_by_manufacturer(request, manufacturer_id):
         )
 
 
+@use_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@conditional_response("reference")
+@cached_response("models", group="reference")
 def get_all_models(request):
     """
     Get all active vehicle models (with manufacturer info)
@@ -261,8 +296,11 @@ def get_all_models(request):
     return Response({"success": True, "data": serializer.data})
 
 
+@use_replica
 @api_view(["GET"])
 @permission_classes([AllowAny])
+@conditional_response("reference")
+@cached_response("part_categories", group="reference")
 def get_part_categories(request):
     """
     Get list of all active part categories
@@ -274,11 +312,123 @@ def get_part_categories(request):
     return Response({"success": True, "data": serializer.data})
 
 
+# ============= FITMENT (CASCADING DROPDOWN) ENDPOINTS =============
+
+
+def _int_params(request, *names):
+    """Read required integer query params; returns (values, error_response)"""
+    values = []
+    for name in names:
+        try:
+            values.append(int(request.query_params.get(name, "")))
+        except ValueError:
+            return None, Response(
+                {"success": False, "error": f"{', '.join(names)} parameters are required integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    return values, None
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def fitment_years(request):
+    """
+    Years that have parts, galleries or product images
+
+    GET /api/fitment/years/
+    """
+    years = get_fitment_index().years()
+    return Response({"success": True, "data": sorted(years, reverse=True)})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def fitment_makes(request):
+    """
+    Manufacturers with parts for a year
+
+    GET /api/fitment/makes/?year=2004
+    """
+    values, error = _int_params(request, "year")
+    if error:
+        return error
+    index = get_fitment_index()
+    return Response({"success": True, "data": index.named("make", index.makes(*values))})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def fitment_models(request):
+    """
+    Models of a manufacturer with parts for a year
+
+    GET /api/fitment/models/?year=2004&manufacturer=5
+    """
+    values, error = _int_params(request, "year", "manufacturer")
+    if error:
+        return error
+    index = get_fitment_index()
+    return Response({"success": True, "data": index.named("model", index.models(*values))})
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def fitment_categories(request):
+    """
+    Part categories available for a year / manufacturer / model
+
+    GET /api/fitment/categories/?year=2004&manufacturer=5&model=9
+    """
+    values, error = _int_params(request, "year", "manufacturer", "model")
+    if error:
+        return error
+    index = get_fitment_index()
+    return Response({"success": True, "data": index.named("category", index.categories(*values))})
+
+
+# ============= AUTOCOMPLETE ENDPOINT =============
+
+
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def autocomplete(request):
+    """
+    Typed search-box suggestions (manufacturers, models, categories, part
+    names and part numbers), most popular first, served from memory
+
+    GET /api/autocomplete/?q=brak
+    Optional: limit (default 10, max 25), types=part,part_number,...
+    """
+    query = request.query_params.get("q", "").strip()
+    try:
+        limit = int(request.query_params.get("limit", 10))
+    except ValueError:
+        return Response(
+            {"success": False, "error": "limit must be an integer"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    kinds = [kind for kind in request.query_params.get("types", "").split(",") if kind]
+    unknown = set(kinds) - set(AUTOCOMPLETE_KINDS)
+    if unknown:
+        return Response(
+            {"success": False, "error": f"Unknown types: {', '.join(sorted(unknown))}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    suggestions = []
+    if query:
+        suggestions = get_autocomplete_index().suggest(
+            query, min(limit, AUTOCOMPLETE_MAX_LIMIT), kinds or None
+        )
+    return Response({"success": True, "query": query, "data": suggestions})
+
+
 # ============= CONTACT FORM ENDPOINTS =============
 
 
 @api_view(["POST"])
 @permission_classes([AllowAny])
+@throttle_classes([FormRateThrottle])
 def submit_contact_form(request):
     """
     Handle contact form submission and send email notifications
@@ -362,10 +512,21 @@ def health_check(request):
     )
 
 
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def cache_stats(request):
+    """
+    Per-namespace API cache hit/miss counters for this worker process
+
+    GET /api/cache/stats/
+    """
+    return Response({"success": True, "data": get_cache_stats()})
+
+
 # ============= PARTS INVENTORY VIEWSET =============
 
 
-class PartInventoryViewSet(viewsets.ReadOnlyModelViewSet):
+class PartInventoryViewSet(ReplicaReadMixin, CatalogCardListMixin, viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny]
                         
     """
@@ -374,9 +535,11 @@ class PartInventoryViewSet(viewsets.ReadOnlyModelViewSet):
     GET /api/parts/{id}/ - Get specific part
     GET /api/parts/?year=2020&manufacturer=1&model=5 - Filter parts
     GET /api/parts/?search=engine - Search parts
+    GET /api/parts/?max_price=80&ordering=best_price - Filter/sort by best current price
     GET /api/parts/featured/ - Get featured parts
     GET /api/parts/in_stock/ - Get in-stock parts
     GET /api/parts/by_vehicle/?year=2020&manufacturer=1&model=5 - Get parts by vehicle
+    GET /api/parts/lookup/?pn=12345-abc - Exact part number lookup (inventory, galleries, prices)
     """
 
     queryset = (
@@ -386,8 +549,9 @@ class PartInventoryViewSet(viewsets.ReadOnlyModelViewSet):
     )
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        FullTextSearchFilter,
+        BestPriceFilter,
+        SearchAwareOrderingFilter,
     ]
     filterset_fields = [
         "year",
@@ -404,8 +568,9 @@ class PartInventoryViewSet(viewsets.ReadOnlyModelViewSet):
         "manufacturer__name",
         "model__name",
     ]
-    ordering_fields = ["price", "created_at", "stock_quantity"]
+    ordering_fields = ["price", "created_at", "stock_quantity", "best_price"]
     ordering = ["-created_at"]
+    card_kind = "parts"  # list() reads pre-serialized rows (catalog_cards.py)
 
     def get_serializer_class(self):
         """Use list serializer for list view, detailed for retrieve"""
@@ -413,6 +578,14 @@ class PartInventoryViewSet(viewsets.ReadOnlyModelViewSet):
             return PartInventoryListSerializer
         return PartInventorySerializer
 
+    @conditional_response("parts", validator=filtered_queryset_validator)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_response("parts", validator=filtered_queryset_validator)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"])
     def featured(self, request):
         """Get featured parts"""
@@ -450,19 +623,107 @@ class PartInventoryViewSet(viewsets.ReadOnlyModelViewSet):
         serializer = self.get_serializer(parts, many=True)
         return Response(serializer.data)
 
+    @action(detail=False, methods=["get"])
+    def lookup(self, request):
+        """
+        Exact part number lookup across inventory, galleries and prices
+        Usage: /api/parts/lookup/?pn=12345-ABC (dashes, spaces and case are ignored)
+        """
+        pn = normalize_part_number(request.query_params.get("pn", ""))
+        if not pn:
+            return Response(
+                {"error": "pn parameter is required"},
+                status=400,
+            )
+
+        results = []
+
+        parts = (
+            PartInventory.objects.filter(part_number_normalized=pn, is_published=True)
+            .select_related("manufacturer", "model", "part_category")
+            .prefetch_related("images")
+        )
+        for part in parts:
+            first_image = next(iter(part.images.all()), None)
+            results.append({
+                "id": part.pk,
+                "type": "inventory",
+                "year": part.year,
+                "manufacturer": part.manufacturer.name,
+                "model": part.model.name,
+                "part_category": part.part_category.name,
+                "part_name": part.part_name,
+                "part_number": part.part_number,
+                "image": first_image.image.url if first_image else None,
+                "price": part.price,
+                "stock_available": part.is_in_stock,
+                "slug": part.slug,
+                "created_at": part.created_at,
+            })
+
+        galleries = annotate_primary_image(
+            PartImageGallery.objects.filter(part_number_normalized=pn, is_published=True)
+        ).select_related("manufacturer", "model", "part_category")
+        for gallery in galleries:
+            results.append({
+                "id": gallery.pk,
+                "type": "gallery",
+                "year": gallery.year,
+                "manufacturer": gallery.manufacturer.name,
+                "model": gallery.model.name,
+                "part_category": gallery.part_category.name,
+                "part_name": gallery.part_name,
+                "part_number": gallery.part_number,
+                "image": gallery.primary_image_url or (
+                    default_storage.url(gallery.primary_image_file) if gallery.primary_image_file else None
+                ),
+                "price": None,
+                "stock_available": False,
+                "slug": gallery.slug,
+                "created_at": gallery.created_at,
+            })
+
+        prices = (
+            PartPrice.objects.current()
+            .with_totals()
+            .filter(part_number_normalized=pn)
+            .select_related("manufacturer", "model", "part_category", "gallery_reference")
+            .order_by("annotated_total")
+        )
+        for price in prices:
+            results.append({
+                "id": price.pk,
+                "type": "price",
+                "year": price.year,
+                "manufacturer": price.manufacturer.name,
+                "model": price.model.name,
+                "part_category": price.part_category.name,
+                "part_name": price.part_name,
+                "part_number": price.part_number,
+                "image": None,
+                "price": price.price,
+                "stock_available": price.in_stock,
+                "slug": price.gallery_reference.slug if price.gallery_reference else "",
+                "created_at": price.created_at,
+            })
+
+        serializer = UnifiedPartSearchSerializer(results, many=True)
+        return Response({"success": True, "part_number": pn, "count": len(results), "data": serializer.data})
+
 
 # ============= PART IMAGE GALLERY VIEWSET =============
 
 
-class PartImageGalleryViewSet(viewsets.ReadOnlyModelViewSet):
+class PartImageGalleryViewSet(ReplicaReadMixin, CatalogCardListMixin, viewsets.ReadOnlyModelViewSet):
 
     permission_classes = [AllowAny]
     """
     API endpoint for browsing part image galleries
-    GET /api/part-galleries/ - List all galleries
+    GET /api/part-galleries/ - List galleries (cursor paginated, ?page_size= capped)
     GET /api/part-galleries/{id}/ - Get specific gallery with all images
     GET /api/part-galleries/?year=2020&manufacturer=1 - Filter galleries
     GET /api/part-galleries/?search=air+filter - Search galleries
+    GET /api/part-galleries/?max_price=150&ordering=best_price - Filter/sort by best current price
     GET /api/part-galleries/featured/ - Get featured galleries
     GET /api/part-galleries/by_vehicle/?year=2020&manufacturer=1&model=5 - Get galleries by vehicle
     """
@@ -474,11 +735,12 @@ class PartImageGalleryViewSet(viewsets.ReadOnlyModelViewSet):
     
     )
     serializer_class = PartImageGallerySerializer
-    pagination_class = None  # Disable pagination
+    pagination_class = GalleryCursorPagination  # Applies to list() only
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        FullTextSearchFilter,
+        BestPriceFilter,
+        SearchAwareOrderingFilter,
     ]
     filterset_fields = [
         "year",
@@ -495,8 +757,9 @@ class PartImageGalleryViewSet(viewsets.ReadOnlyModelViewSet):
         "model__name",
         "part_category__name",
     ]
-    ordering_fields = ["created_at", "year"]
+    ordering_fields = ["created_at", "year", "best_price"]
     ordering = ["-created_at"]
+    card_kind = "galleries"  # list() reads pre-serialized rows (catalog_cards.py)
 
     def get_serializer_class(self):
         """Use list serializer for list view, detailed for retrieve"""
@@ -504,10 +767,36 @@ class PartImageGalleryViewSet(viewsets.ReadOnlyModelViewSet):
             return PartImageGalleryListSerializer
         return PartImageGallerySerializer
 
+    def get_queryset(self):
+        """
+        List view resolves primary image, image count and prices for the
+        whole page in a constant number of queries:
+        - primary image and image count as correlated subqueries
+        - prices (with their FK names) through a single Prefetch
+        With catalog cards enabled this only runs to build cards.
+        The other multi-gallery actions add the images and tags the
+        detailed serializer nests.
+        """
+        if self.action == "list":
+            return gallery_list_queryset()
+        if self.action in ("featured", "by_vehicle", "by_part_category"):
+            return gallery_list_queryset().prefetch_related("images", "tags")
+        return super().get_queryset()
+
+    @conditional_response("galleries", validator=filtered_queryset_validator)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_response("galleries", validator=filtered_queryset_validator)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"])
+    @conditional_response("galleries")
+    @cached_response("featured_galleries", group="galleries")
     def featured(self, request):
         """Get featured galleries"""
-        featured_galleries = self.queryset.filter(is_featured=True)
+        featured_galleries = self.get_queryset().filter(is_featured=True)
         serializer = self.get_serializer(featured_galleries, many=True)
         return Response(serializer.data)
 
@@ -527,7 +816,7 @@ class PartImageGalleryViewSet(viewsets.ReadOnlyModelViewSet):
                 status=400,
             )
 
-        galleries = self.queryset.filter(
+        galleries = self.get_queryset().filter(
             year=year, manufacturer_id=manufacturer, model_id=model
         )
 
@@ -548,7 +837,7 @@ class PartImageGalleryViewSet(viewsets.ReadOnlyModelViewSet):
                 status=400,
             )
 
-        galleries = self.queryset.filter(part_category_id=part_category)
+        galleries = self.get_queryset().filter(part_category_id=part_category)
         serializer = self.get_serializer(galleries, many=True)
         return Response(serializer.data)
 
@@ -561,13 +850,15 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import User
 from .serializers import RegisterSerializer, LoginSerializer, UserSerializer
+from .tokens import ClaimsRefreshToken, revoke_token
 
 def get_tokens_for_user(user):
     """Generate JWT tokens for user"""
-    refresh = RefreshToken.for_user(user)
+    refresh = ClaimsRefreshToken.for_user(user)
     return {
         'refresh': str(refresh),
         'access': str(refresh.access_token),
@@ -575,6 +866,7 @@ def get_tokens_for_user(user):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterRateThrottle])
 def register_view(request):
     """
     Register a new user
@@ -609,6 +901,7 @@ def register_view(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginRateThrottle])
 def login_view(request):
     """
     Login user
@@ -618,7 +911,7 @@ def login_view(request):
         "password": "password123"
     }
     """
-    serializer = LoginSerializer(data=request.data)
+    serializer = LoginSerializer(data=request.data, context={'request': request})
     
     if serializer.is_valid():
         user = serializer.validated_data['user']
@@ -638,6 +931,16 @@ def login_view(request):
         'details': serializer.errors
     }, status=status.HTTP_400_BAD_REQUEST)
 
+def get_current_user(request):
+    """
+    The authenticated User row with its profile, in one query (request.user
+    is a TokenUser built from the JWT claims when JWT_CLAIMS_USER is on)
+    """
+    try:
+        return User.objects.select_related('profile').get(pk=request.user.pk, is_active=True)
+    except User.DoesNotExist:
+        raise AuthenticationFailed('User not found', code='user_not_found')
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_profile_view(request):
@@ -646,7 +949,7 @@ def user_profile_view(request):
     GET /api/auth/profile/
     Headers: Authorization: Bearer <token>
     """
-    user_data = UserSerializer(request.user).data
+    user_data = UserSerializer(get_current_user(request)).data
     return Response({
         'user': user_data
     }, status=status.HTTP_200_OK)
@@ -664,15 +967,15 @@ def update_profile_view(request):
         "phone_number": "1234567890"
     }
     """
-    user = request.user
+    user = get_current_user(request)
     
     # Update user fields
-    if 'first_name' in request.data:
-        user.first_name = request.data['first_name']
-    if 'last_name' in request.data:
-        user.last_name = request.data['last_name']
+    updated_fields = [field for field in ('first_name', 'last_name') if field in request.data]
+    for field in updated_fields:
+        setattr(user, field, request.data[field])
     
-    user.save()
+    if updated_fields:
+        user.save(update_fields=updated_fields)
     
     # Update profile fields
     if 'phone_number' in request.data:
@@ -703,6 +1006,10 @@ def logout_view(request):
             token = RefreshToken(refresh_token)
             token.blacklist()
         
+        # Checked when JWT_REVOCATION_CHECK is on
+        if request.auth is not None:
+            revoke_token(request.auth)
+        
         return Response({
             'message': 'Logout successful'
         }, status=status.HTTP_200_OK)
@@ -728,6 +1035,7 @@ from rest_framework.permissions import AllowAny
 
 @api_view(['POST'])
 @permission_classes([AllowAny]) 
+@throttle_classes([FormRateThrottle])
 def create_shipping_address(request):
     """
     Create a new shipping address
@@ -780,6 +1088,7 @@ def create_shipping_address(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([AnalyticsTestRateThrottle])
 def test_analytics(request):
     """
     Test endpoint to verify Google Analytics is working
@@ -794,14 +1103,23 @@ def test_analytics(request):
     success = ga.send_event(
         client_id=client_id,
         event_name='backend_test_event',
-        event_params={
-            'test_parameter': 'test_value',
-            'environment': 'backend',
-            'timestamp': str(request.META.get('HTTP_HOST', 'localhost'))
-        }
+        event_params=backend_test_event_params(request)
     )
     
-    return Response({
+    return Response(test_analytics_payload(ga, client_id, success))
+
+
+def backend_test_event_params(request):
+    return {
+        'test_parameter': 'test_value',
+        'environment': 'backend',
+        'timestamp': str(request.META.get('HTTP_HOST', 'localhost'))
+    }
+
+
+def test_analytics_payload(ga, client_id, success):
+    """Response body of test_analytics (shared with the async view)"""
+    return {
         'status': 'success' if success else 'failed',
         'measurement_id': ga.measurement_id,
         'client_id': client_id,
@@ -813,11 +1131,12 @@ def test_analytics(request):
             '3. Look for event named "backend_test_event"',
             '4. If not showing, check validation endpoint'
         ]
-    })
+    }
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([AnalyticsTestRateThrottle])
 def test_analytics_debug(request):
     """
     Test endpoint with full validation response from GA4
@@ -858,6 +1177,7 @@ def test_analytics_debug(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([TrackingRateThrottle])
 def analytics_config(request):
     """
     Check Analytics configuration
@@ -890,67 +1210,77 @@ def analytics_config(request):
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
+@throttle_classes([AnalyticsTestRateThrottle])
 def verify_ga4_connection(request):
     """
     Send multiple test events and verify GA4 configuration
     GET /api/verify-ga4/
     """
     from .analytics import GoogleAnalytics, get_client_id
-    import time
     
     ga = GoogleAnalytics()
     client_id = get_client_id(request)
     
-    results = []
-    
-    # Test 1: Send to debug endpoint
-    debug_result = ga.send_event(
-        client_id=client_id,
-        event_name='verification_test',
-        event_params={
-            'test_number': 1,
-            'test_type': 'debug_endpoint',
-            'timestamp': int(time.time())
+    outcomes = [ga.send_event(client_id=client_id, **test) for test in verification_tests()]
+    return Response(verify_ga4_payload(ga, client_id, outcomes))
+
+
+def verification_tests():
+    """
+    The three test sends of verify_ga4_connection, as send_event kwargs:
+    debug endpoint, production endpoint, standard page_view event
+    """
+    import time
+
+    return [
+        {
+            'event_name': 'verification_test',
+            'event_params': {
+                'test_number': 1,
+                'test_type': 'debug_endpoint',
+                'timestamp': int(time.time())
+            },
+            'debug': True,
         },
-        debug=True
-    )
-    results.append({
-        'test': 'Debug Endpoint',
-        'success': bool(debug_result),
-        'validation': debug_result if isinstance(debug_result, dict) else None
-    })
-    
-    # Test 2: Send to production endpoint
-    prod_result = ga.send_event(
-        client_id=client_id,
-        event_name='verification_test',
-        event_params={
-            'test_number': 2,
-            'test_type': 'production_endpoint',
-            'timestamp': int(time.time())
+        {
+            'event_name': 'verification_test',
+            'event_params': {
+                'test_number': 2,
+                'test_type': 'production_endpoint',
+                'timestamp': int(time.time())
+            },
+            'debug': False,
         },
-        debug=False
-    )
-    results.append({
-        'test': 'Production Endpoint',
-        'success': prod_result
-    })
-    
-    # Test 3: Send with different event name
-    test3_result = ga.send_event(
-        client_id=client_id,
-        event_name='page_view',  # Standard GA4 event
-        event_params={
-            'page_location': 'http://localhost:8080/test',
-            'page_title': 'Test Page'
-        }
-    )
-    results.append({
-        'test': 'Standard Event (page_view)',
-        'success': test3_result
-    })
+        {
+            'event_name': 'page_view',  # Standard GA4 event
+            'event_params': {
+                'page_location': 'http://localhost:8080/test',
+                'page_title': 'Test Page'
+            },
+        },
+    ]
+
+
+def verify_ga4_payload(ga, client_id, outcomes):
+    """Response body of verify_ga4_connection (shared with the async view)"""
+    debug_result, prod_result, test3_result = outcomes
+    results = [
+        {
+            'test': 'Debug Endpoint',
+            'success': bool(debug_result),
+            'validation': debug_result if isinstance(debug_result, dict) else None
+        },
+        {
+            'test': 'Production Endpoint',
+            'success': prod_result
+        },
+        {
+            'test': 'Standard Event (page_view)',
+            'success': test3_result
+        },
+    ]
     
-    return Response({
+    return {
         'status': 'verification_complete',
         'measurement_id': ga.measurement_id,
         'client_id': client_id,
@@ -973,7 +1303,7 @@ def verify_ga4_connection(request):
             'debugview_location': 'GA4 → Configure (left sidebar) → DebugView',
             'property_selector': 'Top-left of GA4 interface, shows current property name'
         }
-    })
+    }
 
 
 
@@ -990,7 +1320,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Q
 from .models import ProductImage
 
-class ProductImageViewSet(viewsets.ModelViewSet):
+class ProductImageViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for Product Images
     Supports filtering by manufacturer, model, year, and part category
@@ -1115,6 +1445,7 @@ class ProductImageViewSet(viewsets.ModelViewSet):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([TrackingRateThrottle])
 def track_product_view_api(request):
     """
     Track product page view
@@ -1166,6 +1497,7 @@ def track_product_view_api(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([TrackingRateThrottle])
 def track_wishlist_api(request):
     """
     Track add to wishlist
@@ -1209,6 +1541,7 @@ def track_wishlist_api(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([TrackingRateThrottle])
 def track_scroll_api(request):
     """
     Track scroll depth
@@ -1250,6 +1583,7 @@ def track_scroll_api(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([TrackingRateThrottle])
 def track_time_spent_api(request):
     """
     Track time spent on page
@@ -1295,6 +1629,7 @@ def track_time_spent_api(request):
 
 @csrf_exempt
 @require_http_methods(["GET"])
+@rate_limited("tracking")
 def analytics_status(request):
     """
     GET /api/analytics/status
@@ -1316,6 +1651,7 @@ def analytics_status(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limited("analytics_test")
 def analytics_test_connection(request):
     """
     POST /api/analytics/test-connection
@@ -1337,6 +1673,7 @@ def analytics_test_connection(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limited("tracking")
 def track_analytics_event(request):
     """
     POST /api/analytics/track
@@ -1359,95 +1696,13 @@ def track_analytics_event(request):
                 'error': 'event_type is required'
             }, status=400)
         
-        # Route to appropriate tracking function
-        result = False
-        
-        if event_type == 'button_click':
-            result = track_button_click(
-                request,
-                button_name=event_data.get('button_name', 'unknown'),
-                location=event_data.get('click_location', 'unknown'),
-                total_clicks=event_data.get('total_clicks')
-            )
-        
-        elif event_type == 'link_click':
-            result = track_link_click(
-                request,
-                link_text=event_data.get('link_text', ''),
-                link_url=event_data.get('link_url', '')
-            )
-        
-        elif event_type == 'search':
-            result = track_search(
-                request,
-                search_term=event_data.get('search_term', ''),
-                results_count=event_data.get('results_count', 0)
-            )
-        
-        elif event_type == 'page_view':
-            result = track_page_view(
-                request,
-                page_path=event_data.get('page_path', request.path),
-                page_title=event_data.get('page_title')
-            )
-        
-        elif event_type == 'carousel_interaction':
-            result = track_carousel_interaction(
-                request,
-                carousel_name=event_data.get('carousel_name', 'unknown'),
-                action=event_data.get('action', 'unknown'),
-                direction=event_data.get('direction')
-            )
-        
-        elif event_type == 'brand_click':
-            result = track_brand_click(
-                request,
-                brand_name=event_data.get('brand_name', 'unknown'),
-                brand_slug=event_data.get('brand_slug', 'unknown'),
-                location=event_data.get('click_location', 'unknown')
-            )
-        
-        elif event_type == 'cta_click':
-            result = track_cta_click(
-                request,
-                cta_name=event_data.get('cta_name', 'unknown'),
-                cta_location=event_data.get('cta_location', 'unknown'),
-                cta_type=event_data.get('cta_type', 'button')
-            )
-        
-        elif event_type == 'error':
-            result = track_error(
-                request,
-                error_type=event_data.get('error_type', 'unknown'),
-                error_message=event_data.get('error_message', ''),
-                error_location=event_data.get('error_location', 'unknown')
-            )
-        
-        elif event_type == 'form_start':
-            result = track_form_start(
-                request,
-                form_name=event_data.get('form_name', 'unknown')
-            )
-        
-        elif event_type == 'form_submit':
-            result = track_form_submit(
-                request,
-                form_name=event_data.get('form_name', 'unknown'),
-                success=event_data.get('success', True)
-            )
-        
-        elif event_type == 'search_filter_change':
-            result = track_filter_change(
-                request,
-                filter_type=event_data.get('filter_type', 'unknown'),
-                filter_value=event_data.get('filter_value', ''),
-                location=event_data.get('page_location', 'unknown')
-            )
-        
-        else:
+        # Route through the event registry
+        try:
+            result = track_registered_event(request, event_type, event_data)
+        except ValueError as e:
             return JsonResponse({
                 'success': False,
-                'error': f'Unknown event_type: {event_type}'
+                'error': str(e)
             }, status=400)
         
         return JsonResponse({
@@ -1472,11 +1727,17 @@ def track_analytics_event(request):
 
 @csrf_exempt
 @require_http_methods(["POST"])
+@rate_limited("tracking")
 def batch_track_events(request):
     """
     POST /api/analytics/batch-track
     Track multiple events in a single request
     
+    Events are normalized through the analytics event registry and sent as
+    multi-event Measurement Protocol payloads under the request's client id
+    (per-event client_id values are ignored). In async mode the per-event
+    results reflect queueing, not GA delivery.
+    
     Body format:
     {
         "events": [
@@ -1501,90 +1762,14 @@ def batch_track_events(request):
                 'error': 'events array is required'
             }, status=400)
         
-        results = []
-        for event in events:
-            event_type = event.get('event_type')
-            event_data = event.get('event_data', {})
-            
-            # Track each event individually
-            result = False
-            
-            if event_type == 'button_click':
-                result = track_button_click(
-                    request,
-                    button_name=event_data.get('button_name', 'unknown'),
-                    location=event_data.get('click_location', 'unknown'),
-                    total_clicks=event_data.get('total_clicks')
-                )
-            elif event_type == 'link_click':
-                result = track_link_click(
-                    request,
-                    link_text=event_data.get('link_text', ''),
-                    link_url=event_data.get('link_url', '')
-                )
-            elif event_type == 'search':
-                result = track_search(
-                    request,
-                    search_term=event_data.get('search_term', ''),
-                    results_count=event_data.get('results_count', 0)
-                )
-            elif event_type == 'page_view':
-                result = track_page_view(
-                    request,
-                    page_path=event_data.get('page_path', request.path),
-                    page_title=event_data.get('page_title')
-                )
-            elif event_type == 'carousel_interaction':
-                result = track_carousel_interaction(
-                    request,
-                    carousel_name=event_data.get('carousel_name', 'unknown'),
-                    action=event_data.get('action', 'unknown'),
-                    direction=event_data.get('direction')
-                )
-            elif event_type == 'brand_click':
-                result = track_brand_click(
-                    request,
-                    brand_name=event_data.get('brand_name', 'unknown'),
-                    brand_slug=event_data.get('brand_slug', 'unknown'),
-                    location=event_data.get('click_location', 'unknown')
-                )
-            elif event_type == 'cta_click':
-                result = track_cta_click(
-                    request,
-                    cta_name=event_data.get('cta_name', 'unknown'),
-                    cta_location=event_data.get('cta_location', 'unknown'),
-                    cta_type=event_data.get('cta_type', 'button')
-                )
-            elif event_type == 'error':
-                result = track_error(
-                    request,
-                    error_type=event_data.get('error_type', 'unknown'),
-                    error_message=event_data.get('error_message', ''),
-                    error_location=event_data.get('error_location', 'unknown')
-                )
-            elif event_type == 'form_start':
-                result = track_form_start(
-                    request,
-                    form_name=event_data.get('form_name', 'unknown')
-                )
-            elif event_type == 'form_submit':
-                result = track_form_submit(
-                    request,
-                    form_name=event_data.get('form_name', 'unknown'),
-                    success=event_data.get('success', True)
-                )
-            elif event_type == 'search_filter_change':
-                result = track_filter_change(
-                    request,
-                    filter_type=event_data.get('filter_type', 'unknown'),
-                    filter_value=event_data.get('filter_value', ''),
-                    location=event_data.get('page_location', 'unknown')
-                )
-            
-            results.append({
-                'event_type': event_type,
-                'success': result
-            })
+        if not isinstance(events, list):
+            return JsonResponse({
+                'success': False,
+                'error': 'events must be an array'
+            }, status=400)
+        
+        # Validate everything in one pass, then ship grouped multi-event payloads
+        results = track_events_batch(request, events)
         
         total_events = len(results)
         successful_events = sum(1 for r in results if r['success'])
@@ -0,0 +1,39 @@
+# benchmarks/conftest.py
+import os
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+
+from authentication.models import PartImageGallery
+
+# Galleries in the synthetic catalog the test database is filled with
+BENCHMARK_GALLERIES = int(os.getenv("BENCHMARK_GALLERIES", 5000))
+
+
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    """The test database, filled once per session by generate_catalog"""
+    with django_db_blocker.unblock():
+        call_command("generate_catalog", galleries=BENCHMARK_GALLERIES, verbosity=0)
+
+
+@pytest.fixture(scope="session")
+def vehicle(django_db_setup, django_db_blocker):
+    """The (year, manufacturer, model) with the most galleries - the worst by_vehicle case"""
+    with django_db_blocker.unblock():
+        row = (
+            PartImageGallery.objects.values("year", "manufacturer_id", "model_id")
+            .annotate(total=Count("pk"))
+            .order_by("-total")
+            .first()
+        )
+    return {"year": row["year"], "manufacturer": row["manufacturer_id"], "model": row["model_id"]}
+
+
+@pytest.fixture
+def cold(settings):
+    """API response, conditional and sitemap caches off: what a cache miss costs"""
+    settings.API_CACHE_ENABLED = False
+    settings.API_CONDITIONAL_ENABLED = False
+    settings.SITEMAP_CACHE_ENABLED = False
@@ -0,0 +1,71 @@
+# benchmarks/test_endpoints.py
+"""
+Hot catalog endpoints under pytest-benchmark.
+
+    pip install -r requirements-dev.txt
+    pytest benchmarks
+    BENCHMARK_GALLERIES=100000 pytest benchmarks --benchmark-columns=median,max,rounds
+
+Each endpoint is requested through the full middleware/URL stack against a
+generate_catalog test database, once with every cache off ("cold": what a
+cache miss costs) and once with them on ("warm"); both land in the same
+benchmark group. Cold requests also fail when their query count exceeds the
+endpoint's ceiling or varies between rounds.
+"""
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = pytest.mark.django_db
+
+# (label, path, query params, query ceiling on a cold request)
+ENDPOINTS = [
+    ("galleries", "/api/part-galleries/", {}, 6),
+    ("galleries search", "/api/part-galleries/", {"search": "engine"}, 6),
+    ("parts search", "/api/parts/", {"search": "engine"}, 6),
+    ("galleries by_vehicle", "/api/part-galleries/by_vehicle/", "vehicle", 6),
+    ("parts by_vehicle", "/api/parts/by_vehicle/", "vehicle", 6),
+    ("models", "/api/models/", {}, 2),
+    ("manufacturers", "/api/manufacturers/", {}, 2),
+    ("sitemap.xml", "/sitemap.xml", {}, 3),
+]
+
+endpoints = pytest.mark.parametrize(
+    "label, path, params, ceiling", ENDPOINTS, ids=[endpoint[0] for endpoint in ENDPOINTS]
+)
+
+
+def fetch(client, path, params):
+    response = client.get(path, params)
+    if getattr(response, "streaming", False):
+        b"".join(response.streaming_content)
+    return response
+
+
+@endpoints
+def test_cold(benchmark, client, cold, vehicle, label, path, params, ceiling):
+    params = vehicle if params == "vehicle" else params
+    query_counts = []
+
+    def request():
+        with CaptureQueriesContext(connection) as queries:
+            response = fetch(client, path, params)
+        query_counts.append(len(queries))
+        return response
+
+    benchmark.group = label
+    response = benchmark(request)
+
+    assert response.status_code == 200
+    assert max(query_counts) <= ceiling
+    assert len(set(query_counts)) == 1, f"query count varies between rounds {sorted(set(query_counts))}"
+
+
+@endpoints
+def test_warm(benchmark, client, vehicle, label, path, params, ceiling):
+    params = vehicle if params == "vehicle" else params
+    benchmark.group = label
+    response = benchmark(fetch, client, path, params)
+
+    assert response.status_code == 200
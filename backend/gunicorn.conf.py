@@ -0,0 +1,53 @@
+# gunicorn.conf.py
+#
+# gunicorn --config gunicorn.conf.py
+#
+# DJANGO_ASGI=True runs nexxa_backend.asgi under uvicorn workers, where the
+# analytics and reference-data endpoints are async views (ASYNC_VIEWS_ENABLED
+# reads the same variable) and one worker keeps many GA calls in flight.
+# Otherwise the classic sync workers serve nexxa_backend.wsgi.
+
+import os
+import shutil
+
+ASGI = os.getenv("DJANGO_ASGI", "False") == "True"
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", 3))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+keepalive = 5
+
+if ASGI:
+    wsgi_app = "nexxa_backend.asgi:application"
+    worker_class = "uvicorn.workers.UvicornWorker"
+else:
+    wsgi_app = "nexxa_backend.wsgi:application"
+
+# Prometheus multiprocess mode (authentication/metrics.py): workers write their
+# samples here and /metrics aggregates them. Set before any worker imports
+# prometheus_client, and emptied on start so old pids don't linger.
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/nexxa-prometheus")
+
+
+def on_starting(server):
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def post_worker_init(worker):
+    # Build the in-memory autocomplete index before the worker takes traffic
+    # instead of on the first keystroke (authentication/autocomplete.py)
+    if os.getenv("AUTOCOMPLETE_PRELOAD", "True") != "True":
+        return
+    try:
+        from authentication.autocomplete import get_autocomplete_index
+
+        get_autocomplete_index()
+    except Exception:
+        worker.log.exception("Autocomplete index preload failed; it will build on first use")
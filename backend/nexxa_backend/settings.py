@@ -1,6 +1,7 @@
 # nexxa_backend/settings.py
 
 from pathlib import Path
+import json
 import os
 from dotenv import load_dotenv
 from decouple import config
@@ -101,6 +102,72 @@ DATABASES = {
         },
     }
 }
+# Local testing without MySQL: DB_ENGINE=django.db.backends.sqlite3 DB_NAME=db.sqlite3
+if os.getenv("DB_ENGINE", "").endswith("sqlite3"):
+    DATABASES["default"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / os.getenv("DB_NAME", "db.sqlite3"),
+    }
+
+# Read replicas (authentication/replicas.py). JSON list of overrides on top of
+# the default connection, with an optional WEIGHT, e.g.
+#   DB_REPLICAS='[{"HOST": "db-replica-1", "WEIGHT": 3}, {"HOST": "db-replica-2"}]'
+#   DB_REPLICAS='[{"NAME": "replica.sqlite3"}]'   (SQLite, relative to BASE_DIR)
+# Catalog GET requests read from a weighted replica; writes, admin and anything
+# within DB_REPLICA_STICKY_SECONDS of a client's last write use default.
+DATABASE_REPLICAS = []
+DATABASE_REPLICA_WEIGHTS = {}
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", 5))
+for index, override in enumerate(json.loads(os.getenv("DB_REPLICAS", "") or "[]"), start=1):
+    alias = f"replica{index}"
+    DATABASE_REPLICA_WEIGHTS[alias] = int(override.pop("WEIGHT", 1))
+    replica = {**DATABASES["default"], **override, "TEST": {"MIRROR": "default"}}
+    if replica["ENGINE"].endswith("sqlite3"):
+        replica["NAME"] = BASE_DIR / replica["NAME"]
+    DATABASES[alias] = replica
+    DATABASE_REPLICAS.append(alias)
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ["authentication.replicas.ReplicaRouter"]
+    MIDDLEWARE.append("authentication.replicas.ReplicaStickinessMiddleware")
+
+# Request metrics (authentication/metrics.py): Prometheus text on /metrics and a
+# warning with the captured SQL for requests slower than METRICS_SLOW_REQUEST_MS
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
+METRICS_SLOW_REQUEST_MS = int(os.getenv("METRICS_SLOW_REQUEST_MS", 1000))
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, "authentication.metrics.MetricsMiddleware")
+
+# Cache: local memory by default, Redis when REDIS_URL is set (shared across workers)
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+            "KEY_PREFIX": "nexxa",
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "nexxa-default",
+            "TIMEOUT": 300,
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+
+# API response cache (authentication.caching.cached_response)
+API_CACHE_ENABLED = os.getenv("API_CACHE_ENABLED", "True") == "True"
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", 60 * 15))
+API_CACHE_STALE_GRACE = int(os.getenv("API_CACHE_STALE_GRACE", 60))  # serve stale while one worker refreshes
+API_CACHE_LOCK_TIMEOUT = int(os.getenv("API_CACHE_LOCK_TIMEOUT", 10))
+
+# Conditional GET on catalog endpoints (authentication.caching.conditional_response)
+API_CONDITIONAL_ENABLED = os.getenv("API_CONDITIONAL_ENABLED", "True") == "True"
+API_HTTP_MAX_AGE = int(os.getenv("API_HTTP_MAX_AGE", 60))
+API_HTTP_STALE_WHILE_REVALIDATE = int(os.getenv("API_HTTP_STALE_WHILE_REVALIDATE", 600))
 
 
 RESEND_API_KEY = config('RESEND_API_KEY',default='re_Cz9mVDNi_4Z4xA7KKJa7PuhxBMjmopPSpD')
@@ -207,6 +274,12 @@ ALLOWED_IMAGE_EXTENSIONS = os.getenv('ALLOWED_IMAGE_TYPES', 'jpg,jpeg,png,webp,g
 IMAGE_COMPRESSION_QUALITY = int(os.getenv('IMAGE_COMPRESSION_QUALITY', 85))
 THUMBNAIL_SIZE = int(os.getenv('THUMBNAIL_SIZE', 300))
 
+# Image derivatives (authentication/derivatives.py): widths besides THUMBNAIL_SIZE, formats, Pillow worker processes
+IMAGE_DERIVATIVES_ENABLED = os.getenv('IMAGE_DERIVATIVES_ENABLED', 'True') == 'True'
+IMAGE_DERIVATIVE_WIDTHS = [int(w) for w in os.getenv('IMAGE_DERIVATIVE_WIDTHS', '600,1200').split(',') if w.strip()]
+IMAGE_DERIVATIVE_FORMATS = [f.strip() for f in os.getenv('IMAGE_DERIVATIVE_FORMATS', 'webp,avif').split(',') if f.strip()]
+IMAGE_WORKER_PROCESSES = int(os.getenv('IMAGE_WORKER_PROCESSES', 2))
+
 # ============================================================================
 # REST FRAMEWORK CONFIGURATION (Enhanced)
 # ============================================================================
@@ -243,7 +316,14 @@ REST_FRAMEWORK = {
     # Pagination - REMOVED to allow per-view control
     # "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     # "PAGE_SIZE": 20,
-}# Default primary key field type
+}
+
+# Catalog list pagination (cursor based) and response size budget
+GALLERY_PAGE_SIZE = int(os.getenv('GALLERY_PAGE_SIZE', 24))
+GALLERY_MAX_PAGE_SIZE = int(os.getenv('GALLERY_MAX_PAGE_SIZE', 100))
+API_RESPONSE_BUDGET_BYTES = int(os.getenv('API_RESPONSE_BUDGET_BYTES', 524288))  # 512KB
+
+# Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # ============================================================================
@@ -281,10 +361,25 @@ DEFAULT_FROM_EMAIL = os.getenv("DEFAULT_FROM_EMAIL", "Nexxa Auto <info@nexxaauto
 EMAIL_TIMEOUT = int(os.getenv("EMAIL_TIMEOUT", 10))  # Add this
 
 # Contact form recipient(s) - handle comma-separated values
-CONTACT_EMAIL_RECIPIENTS = os.getenv(
-    "CONTACT_EMAIL_RECIPIENTS", 
-    "info@nexxaauto.com"
-).split(',')# ============================================================================
+CONTACT_EMAIL_RECIPIENTS = [
+    address.strip()
+    for address in os.getenv("CONTACT_EMAIL_RECIPIENTS", "info@nexxaauto.com").split(",")
+    if address.strip()
+]
+
+# Email outbox - request handlers queue EmailJob rows, run_email_worker sends them
+# (the email_worker service in docker-compose.yaml; turn the outbox off where no worker runs)
+EMAIL_OUTBOX_ENABLED = os.getenv("EMAIL_OUTBOX_ENABLED", "True") == "True"
+EMAIL_TRANSPORT = os.getenv("EMAIL_TRANSPORT", "resend")  # resend | cloudflare | console | file
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", 6))
+EMAIL_OUTBOX_BACKOFF_BASE = int(os.getenv("EMAIL_OUTBOX_BACKOFF_BASE", 30))  # seconds
+EMAIL_OUTBOX_BACKOFF_MAX = int(os.getenv("EMAIL_OUTBOX_BACKOFF_MAX", 3600))
+EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv("EMAIL_OUTBOX_LEASE_SECONDS", 300))
+EMAIL_WORKER_BATCH_SIZE = int(os.getenv("EMAIL_WORKER_BATCH_SIZE", 20))
+EMAIL_WORKER_CONCURRENCY = int(os.getenv("EMAIL_WORKER_CONCURRENCY", 4))
+EMAIL_WORKER_POLL_INTERVAL = float(os.getenv("EMAIL_WORKER_POLL_INTERVAL", 2))
+
+# ============================================================================
 # LOGGING CONFIGURATION
 # ============================================================================
 LOGGING = {
@@ -390,6 +485,23 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# JWT claims user (authentication/tokens.py): request.user is built from the signed token
+# instead of a User query per request; JWT_REVOCATION_CHECK adds one cache read per request
+# to reject logged-out tokens and those of deactivated, deleted or changed users
+JWT_CLAIMS_USER = os.getenv("JWT_CLAIMS_USER", "True") == "True"
+JWT_REVOCATION_CHECK = os.getenv("JWT_REVOCATION_CHECK", "False") == "True"
+if JWT_CLAIMS_USER:
+    REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"] = [
+        "authentication.tokens.ClaimsJWTAuthentication",
+    ]
+
+# Email + password login in one indexed query; ModelBackend keeps username login for the admin
+AUTHENTICATION_BACKENDS = [
+    "authentication.backends.EmailBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+import json
 import os
 
 SITE_URL = os.getenv('SITE_URL', 'http://localhost:8080')
@@ -408,3 +520,52 @@ GOOGLE_ANALYTICS_ID = os.environ.get('GOOGLE_ANALYTICS_ID', '')
 GOOGLE_ANALYTICS_API_SECRET = os.environ.get('GOOGLE_ANALYTICS_API_SECRET', '')
 SITE_DOMAIN = os.environ.get('SITE_DOMAIN', 'https://nexxaauto.com')
 
+
+# GA4 async dispatcher (track_event queues and returns immediately)
+GA_ASYNC_ENABLED = os.environ.get('GA_ASYNC_ENABLED', 'True') == 'True'
+GA_QUEUE_MAX_SIZE = int(os.environ.get('GA_QUEUE_MAX_SIZE', 10000))
+GA_DISPATCH_WORKERS = int(os.environ.get('GA_DISPATCH_WORKERS', 2))
+GA_DISPATCH_DRAIN_SIZE = int(os.environ.get('GA_DISPATCH_DRAIN_SIZE', 250))
+GA_BATCH_CONCURRENCY = int(os.environ.get('GA_BATCH_CONCURRENCY', 4))  # sync-mode batch sends
+
+# ASGI mode (gunicorn.conf.py): async views for analytics and reference data,
+# sharing one pooled httpx.AsyncClient per worker for GA calls
+ASYNC_VIEWS_ENABLED = os.environ.get('DJANGO_ASGI', 'False') == 'True'
+GA_HTTP_TIMEOUT = float(os.environ.get('GA_HTTP_TIMEOUT', 5))
+GA_HTTP_MAX_CONNECTIONS = int(os.environ.get('GA_HTTP_MAX_CONNECTIONS', 50))
+GA_HTTP_MAX_KEEPALIVE = int(os.environ.get('GA_HTTP_MAX_KEEPALIVE', 10))
+
+# Sitemap: URLs per shard (protocol limit is 50,000) and rendered-shard cache lifetime
+SITEMAP_MAX_URLS = int(os.environ.get('SITEMAP_MAX_URLS', 50000))
+SITEMAP_CACHE_TIMEOUT = int(os.environ.get('SITEMAP_CACHE_TIMEOUT', 60 * 60 * 6))
+# Off: every sitemap request is generated from the database (cold benchmarks)
+SITEMAP_CACHE_ENABLED = os.environ.get('SITEMAP_CACHE_ENABLED', 'True') == 'True'
+
+# Fitment index: how often workers check for changes made by other processes, and max age before a full rebuild
+FITMENT_VERSION_CHECK_INTERVAL = float(os.environ.get('FITMENT_VERSION_CHECK_INTERVAL', 5))
+FITMENT_MAX_AGE = int(os.environ.get('FITMENT_MAX_AGE', 600))
+
+# Autocomplete index (authentication/autocomplete.py): same refresh policy as the fitment index
+AUTOCOMPLETE_VERSION_CHECK_INTERVAL = float(os.environ.get('AUTOCOMPLETE_VERSION_CHECK_INTERVAL', 5))
+AUTOCOMPLETE_MAX_AGE = int(os.environ.get('AUTOCOMPLETE_MAX_AGE', 600))
+
+# Catalog cards (authentication/catalog_cards.py): gallery and parts lists served from pre-serialized rows
+CATALOG_CARDS_ENABLED = os.environ.get('CATALOG_CARDS_ENABLED', 'True') == 'True'
+
+# Catalog search: MATCH ... AGAINST on MySQL, LIKE fallback elsewhere (authentication/search.py)
+SEARCH_FULLTEXT_ENABLED = os.environ.get('SEARCH_FULLTEXT_ENABLED', 'True') == 'True'
+SEARCH_FULLTEXT_MIN_TOKEN = int(os.environ.get('SEARCH_FULLTEXT_MIN_TOKEN', 3))  # innodb_ft_min_token_size
+
+# Rate limits on public endpoints (authentication/ratelimit.py): GCRA buckets in the shared cache,
+# "<requests>/<period>" per key: ip, email (request body) and route (all clients together).
+# RATE_LIMITS_JSON overrides single entries, e.g. '{"login": {"ip": "60/minute"}}'
+RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'True') == 'True'
+RATE_LIMITS = {
+    'forms': {'ip': '10/hour', 'email': '5/hour', 'route': '500/hour'},  # inquiries, contact, shipping addresses
+    'register': {'ip': '10/hour', 'email': '3/hour'},
+    'login': {'ip': '30/minute', 'email': '10/15min'},
+    'tracking': {'ip': '120/minute'},  # track-*, analytics/track, analytics/batch-track
+    'analytics_test': {'ip': '10/hour', 'route': '60/hour'},  # endpoints that send test events to GA
+}
+for _scope, _limits in json.loads(os.environ.get('RATE_LIMITS_JSON', '{}')).items():
+    RATE_LIMITS.setdefault(_scope, {}).update(_limits)
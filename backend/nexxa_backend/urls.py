@@ -19,16 +19,21 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from authentication.metrics import metrics_view
 from authentication.views import health_check
-from .views import sitemap_xml
+from .views import sitemap_xml, sitemap_pages_xml, sitemap_products_xml, catalog_export
 
 
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/health/", health_check, name="health-check"),
+    path("api/catalog/export/<str:export_format>/", catalog_export, name="catalog-export"),
     path("api/", include("authentication.urls")),
     path("sitemap.xml", sitemap_xml, name="sitemap"),
+    path("sitemap-pages.xml", sitemap_pages_xml, name="sitemap-pages"),
+    path("sitemap-products-<int:shard>.xml", sitemap_products_xml, name="sitemap-products"),
+    path("metrics", metrics_view, name="metrics"),
 
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
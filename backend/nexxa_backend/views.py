@@ -88,102 +88,92 @@
 
 #     return HttpResponse(xml, content_type="application/xml")
 
-from django.http import HttpResponse
-from django.utils.timezone import now
 from django.conf import settings
-from django.utils.text import slugify
-from authentication.models import PartImageGallery, Manufacturer  
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from authentication import exports, sitemaps
 
+XML_CONTENT_TYPE = "application/xml"
 
-def sitemap_xml(request):
+
+def get_base_url(request):
     # Use production domain or fallback to request domain
     if settings.DEBUG:
-        base_url = request.build_absolute_uri('/').rstrip('/')
-    else:
-        base_url = "https://nexxaauto.com"
-
-    # Static URLs
-    static_urls = [
-        ("/", "monthly", "1.0"),
-        ("/about", "monthly", "0.8"),
-        ("/contact", "monthly", "0.8"),
-        ("/privacy-policy", "yearly", "0.5"),
-        ("/warranty", "yearly", "0.5"),
-        ("/terms-and-condition", "yearly", "0.5"),
-    ]
-
-    # Part slugs - These match the "slug" property in partsData.js
-    part_slugs = [
-        "abs",  
-        "display-unit",
-        "radio-controller",
-        "speedometer",
-        "steering-column",
-        "transfer-case",
-        "mechanical-parts",
-    ]
-
-    xml = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml += '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-
-    # Add static URLs
-    for path, changefreq, priority in static_urls:
-        xml += f"""  <url>
-    <loc>{base_url}{path}</loc>
-    <lastmod>{now().date()}</lastmod>
-    <changefreq>{changefreq}</changefreq>
-    <priority>{priority}</priority>
-  </url>"""
-
-    # Add Product Pages (ProductPage.jsx routes)
-    try:
-        products = PartImageGallery.objects.all()
-        for product in products:
-            if product.slug and product.id:
-                product_url = f"/product/{product.slug}/{product.id}"
-                xml += f"""
-  <url>
-    <loc>{base_url}{product_url}</loc>
-    <lastmod>{now().date()}</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>0.9</priority>
-  </url>"""
-    except Exception as e:
-        print(f"Error adding products to sitemap: {e}")
-
-    # Add Brand Pages (BrandDetail.jsx routes)
-    try:
-        brands = Manufacturer.objects.all()
-        for brand in brands:
-            if hasattr(brand, 'slug') and brand.slug:
-                brand_slug = brand.slug.lower()
-            elif hasattr(brand, 'name') and brand.name:
-                brand_slug = slugify(brand.name).lower()
-            else:
-                continue
-            
-            brand_url = f"/used/{brand_slug}/parts"
-            xml += f"""
-  <url>
-    <loc>{base_url}{brand_url}</loc>
-    <lastmod>{now().date()}</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>0.8</priority>
-  </url>"""
-    except Exception as e:
-        print(f"Error adding brands to sitemap: {e}")
-
-    # ✅ ADD: Part Detail Pages (/used/:partSlug)
-    for part_slug in part_slugs:
-        part_url = f"/used/{part_slug}"
-        xml += f"""
-  <url>
-    <loc>{base_url}{part_url}</loc>
-    <lastmod>{now().date()}</lastmod>
-    <changefreq>weekly</changefreq>
-    <priority>0.85</priority>
-  </url>"""
-
-    xml += "\n</urlset>"
-
-    return HttpResponse(xml, content_type="application/xml")
\ No newline at end of file
+        return request.build_absolute_uri('/').rstrip('/')
+    return "https://nexxaauto.com"
+
+
+def sitemap_response(base_url, name, chunks):
+    """Serve a cached sitemap document, or stream it and cache the result"""
+    key = sitemaps.cache_key(base_url, name)
+    cached, stream = sitemaps.cached_document(key, chunks)
+    if cached is not None:
+        return HttpResponse(cached, content_type=XML_CONTENT_TYPE)
+    return StreamingHttpResponse(stream, content_type=XML_CONTENT_TYPE)
+
+
+def sitemap_xml(request):
+    """Sitemap index: pages sitemap + product shards"""
+    base_url = get_base_url(request)
+    return sitemap_response(base_url, "index", sitemaps.iter_index(base_url))
+
+
+def sitemap_pages_xml(request):
+    base_url = get_base_url(request)
+    return sitemap_response(base_url, "pages", sitemaps.iter_pages(base_url))
+
+
+def sitemap_products_xml(request, shard):
+    if shard < 1 or shard > sitemaps.product_shard_count():
+        raise Http404("Sitemap shard not found")
+    base_url = get_base_url(request)
+    return sitemap_response(base_url, f"products-{shard}", sitemaps.iter_products(base_url, shard))
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminUser])
+def catalog_export(request, export_format):
+    """
+    Stream the published catalog for marketplace feeds (staff only: anyone
+    can register, and the feed is the whole catalog)
+
+    GET /api/catalog/export/<csv|ndjson|merchant>/?source=galleries|parts&updated_since=2026-10-01
+
+    Compressed on the fly when the client accepts gzip. X-Export-Started-At
+    can be passed back as updated_since for the next incremental export.
+    """
+    if export_format not in exports.CONTENT_TYPES:
+        raise Http404("Unknown export format")
+
+    source = request.query_params.get("source", "galleries")
+    if source not in exports.EXPORT_SOURCES:
+        return Response(
+            {"error": f"source must be one of {', '.join(exports.EXPORT_SOURCES)}"}, status=400
+        )
+
+    updated_since = request.query_params.get("updated_since")
+    if updated_since:
+        try:
+            updated_since = exports.parse_updated_since(updated_since)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+    started_at = timezone.now()
+    chunks = exports.encode_chunks(
+        exports.iter_export(source, export_format, get_base_url(request), updated_since)
+    )
+    use_gzip = exports.accepts_gzip(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    if use_gzip:
+        chunks = exports.gzip_chunks(chunks)
+
+    response = StreamingHttpResponse(chunks, content_type=exports.CONTENT_TYPES[export_format])
+    filename = f"catalog-{source}.{exports.FILE_EXTENSIONS[export_format]}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["X-Export-Started-At"] = started_at.isoformat()
+    response["Vary"] = "Accept-Encoding"
+    if use_gzip:
+        response["Content-Encoding"] = "gzip"
+    return response